@@ -40,6 +40,8 @@ class PerformanceConfig:
     parallel: bool = True
     # 最大工作线程数（0 表示自动：min(32, cpu_count * 2)）
     max_workers: int = 0
+    # 并行时使用进程池代替线程池（规则检查为纯 CPU 计算，多核下更快）
+    use_processes: bool = False
     # 文件缓存最大容量（MB）
     file_cache_size_mb: int = 100
     # 是否启用规则结果缓存（持久化到磁盘，跨进程复用）
@@ -161,6 +163,7 @@ class ConfigLoader:
         "performance": {
             "parallel": True,
             "max_workers": 0,
+            "use_processes": False,
             "file_cache_size_mb": 100
         }
     }
@@ -237,6 +240,7 @@ class ConfigLoader:
         performance = PerformanceConfig(
             parallel=performance_cfg.get("parallel", True),
             max_workers=performance_cfg.get("max_workers", 0),
+            use_processes=performance_cfg.get("use_processes", False),
             file_cache_size_mb=performance_cfg.get("file_cache_size_mb", 100),
             result_cache_enabled=performance_cfg.get("result_cache_enabled", True)
         )
@@ -4,6 +4,7 @@ File Content Cache - 文件内容缓存层
 基于 mtime 的缓存失效策略，避免重复读取文件。
 线程安全设计，支持并行检查。
 """
+import hashlib
 import os
 from dataclasses import dataclass
 from typing import Dict, Optional, Tuple, List
@@ -19,6 +20,12 @@ class CachedFile:
     lines: List[str]
     mtime: float
     size: int
+    content_hash: str  # 原始字节的内容摘要，供结果缓存校验
+
+
+def compute_content_digest(data: bytes) -> str:
+    """文件内容摘要（blake2b/128bit）"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 class FileContentCache:
@@ -51,6 +58,24 @@ class FileContentCache:
         Returns:
             (content, lines) 或 None（文件不存在或读取失败）
         """
+        cached = self.get_entry(file_path)
+        if cached is None:
+            return None
+        return cached.content, cached.lines
+
+    def get_entry(self, file_path: str) -> Optional[CachedFile]:
+        """
+        获取文件缓存条目（带缓存）
+
+        条目中的 mtime / content_hash 与 content 来自同一次读取，
+        结果缓存据此保存，避免规则执行后重新读取文件时配上新内容的摘要。
+
+        Args:
+            file_path: 文件绝对路径
+
+        Returns:
+            CachedFile 或 None（文件不存在或读取失败）
+        """
         with self._lock:
             # 检查缓存是否存在且有效
             if file_path in self._cache:
@@ -59,7 +84,7 @@ class FileContentCache:
                     current_mtime = os.path.getmtime(file_path)
                     if cached.mtime == current_mtime:
                         self._hit_count += 1
-                        return cached.content, cached.lines
+                        return cached
                     # mtime 变化，需要重新读取
                 except OSError:
                     pass
@@ -68,15 +93,22 @@ class FileContentCache:
             self._miss_count += 1
             return self._read_and_cache(file_path)
 
-    def _read_and_cache(self, file_path: str) -> Optional[Tuple[str, List[str]]]:
+    def _read_and_cache(self, file_path: str) -> Optional[CachedFile]:
         """读取文件并缓存"""
         try:
             stat = os.stat(file_path)
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            # 以 bytes 读取后一次性解码：缓存容量直接按原始字节数计算，
+            # 不必再把整份内容重新编码一遍
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+
+            content = raw.decode('utf-8', errors='ignore')
+            # 与文本模式的通用换行一致：\r\n 与 \r 统一为 \n
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
 
             lines = content.split('\n')
-            size = len(content.encode('utf-8'))
+            size = len(raw)
 
             # 检查是否需要淘汰旧缓存
             self._evict_if_needed(size)
@@ -85,15 +117,17 @@ class FileContentCache:
             if file_path in self._cache:
                 self._current_size -= self._cache[file_path].size
 
-            self._cache[file_path] = CachedFile(
+            cached = CachedFile(
                 content=content,
                 lines=lines,
                 mtime=stat.st_mtime,
-                size=size
+                size=size,
+                content_hash=compute_content_digest(raw)
             )
+            self._cache[file_path] = cached
             self._current_size += size
 
-            return content, lines
+            return cached
         except Exception as e:
             self.logger.debug(f"Failed to read file {file_path}: {e}")
             return None
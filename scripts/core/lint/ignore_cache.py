@@ -274,7 +274,26 @@ class IgnoreCache:
         Returns:
             过滤后的违规列表
         """
-        return [v for v in violations if not self.is_ignored(v)]
+        # 只加载一次并建立索引，所有违规共用，避免逐条 is_ignored 重复扫描整个忽略列表
+        ignores = self.load()
+        if not ignores:
+            return list(violations)
+
+        ignored_keys = {
+            (ignore.get("file_path"), ignore.get("rule_id"), ignore.get("code_hash"))
+            for ignore in ignores
+        }
+        rel_paths: Dict[str, str] = {}
+        result = []
+        for v in violations:
+            if v.code_hash:
+                rel_path = rel_paths.get(v.file_path)
+                if rel_path is None:
+                    rel_path = rel_paths[v.file_path] = self._get_relative_path(v.file_path)
+                if (rel_path, v.rule_id, v.code_hash) in ignored_keys:
+                    continue
+            result.append(v)
+        return result
 
     def cleanup_stale_files(self):
         """
@@ -4,14 +4,40 @@ Local Pods Module - 本地 Pod 依赖检测
 import os
 import re
 import subprocess
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Set, List, Optional
 
 from .logger import get_logger
 
 
+# Xcode Build Phase 运行期间环境变量不会变化，导入时读取一次
+_ENV_KEYS = (
+    "BILIOBJCLINT_PROJECT_ROOT",
+    "PODS_PODFILE_DIR_PATH",
+    "PODFILE_DIR_PATH",
+    "SRCROOT",
+    "WORKSPACE_PATH",
+    "PROJECT_FILE_PATH",
+)
+_ENV: Dict[str, str] = {}
+
+
+def refresh_env() -> None:
+    """重新读取环境变量快照（测试修改 os.environ 后调用）"""
+    _ENV.clear()
+    _ENV.update({key: os.environ.get(key, "") for key in _ENV_KEYS})
+
+
+refresh_env()
+
+
 class LocalPodsAnalyzer:
-    """分析本地 Pod 依赖并检测变更"""
+    """分析本地 Pod 依赖并检测变更
+
+    环境变量（SRCROOT、WORKSPACE_PATH 等）取自模块导入时的快照，之后对 os.environ 的
+    修改需调用 refresh_env() 才会生效。
+    """
 
     SEARCH_MAX_DEPTH = 4
     SEARCH_EXCLUDED_DIRS = {
@@ -77,12 +103,12 @@ class LocalPodsAnalyzer:
     def _get_podfile_lock_candidates(self) -> List[Path]:
         """按优先级查找 Podfile.lock。"""
         candidates = []
-        for search_dir in self._get_search_dirs():
+        for search_dir in self._search_dirs:
             candidate = search_dir / "Podfile.lock"
             if candidate.exists():
                 candidates.append(candidate.resolve())
 
-        for search_dir in self._get_descendant_search_roots():
+        for search_dir in self._descendant_search_roots:
             candidates.extend(self._find_descendant_files(search_dir, "Podfile.lock"))
 
         return self._deduplicate_paths(candidates)
@@ -90,18 +116,19 @@ class LocalPodsAnalyzer:
     def _get_podfile_candidates(self) -> List[Path]:
         """按优先级查找 Podfile，作为 Podfile.lock 缺失时的回退。"""
         candidates = []
-        for search_dir in self._get_search_dirs():
+        for search_dir in self._search_dirs:
             candidate = search_dir / "Podfile"
             if candidate.exists():
                 candidates.append(candidate.resolve())
 
-        for search_dir in self._get_descendant_search_roots():
+        for search_dir in self._descendant_search_roots:
             candidates.extend(self._find_descendant_files(search_dir, "Podfile"))
 
         return self._deduplicate_paths(candidates)
 
-    def _get_search_dirs(self) -> List[Path]:
-        """获取向上查找 Podfile/Podfile.lock 的候选目录。"""
+    @cached_property
+    def _search_dirs(self) -> List[Path]:
+        """向上查找 Podfile/Podfile.lock 的候选目录（每个实例只解析一次）。"""
         candidates = []
 
         for env_name in (
@@ -110,15 +137,15 @@ class LocalPodsAnalyzer:
             "PODFILE_DIR_PATH",
             "SRCROOT",
         ):
-            value = os.environ.get(env_name)
+            value = _ENV[env_name]
             if value:
                 candidates.append(Path(value).expanduser())
 
-        workspace_path = os.environ.get("WORKSPACE_PATH")
+        workspace_path = _ENV["WORKSPACE_PATH"]
         if workspace_path:
             candidates.append(Path(workspace_path).expanduser().parent)
 
-        project_file_path = os.environ.get("PROJECT_FILE_PATH")
+        project_file_path = _ENV["PROJECT_FILE_PATH"]
         if project_file_path:
             candidates.append(Path(project_file_path).expanduser().parent)
 
@@ -132,15 +159,16 @@ class LocalPodsAnalyzer:
         existing = [path.resolve() for path in candidates if path.exists()]
         return self._deduplicate_paths(existing)
 
-    def _get_descendant_search_roots(self) -> List[Path]:
-        """获取需要有限向下查找的根目录。"""
+    @cached_property
+    def _descendant_search_roots(self) -> List[Path]:
+        """需要有限向下查找的根目录（每个实例只解析一次）。"""
         candidates = [self.project_root]
 
-        project_root = os.environ.get("BILIOBJCLINT_PROJECT_ROOT")
+        project_root = _ENV["BILIOBJCLINT_PROJECT_ROOT"]
         if project_root:
             candidates.append(Path(project_root).expanduser())
 
-        workspace_path = os.environ.get("WORKSPACE_PATH")
+        workspace_path = _ENV["WORKSPACE_PATH"]
         if workspace_path:
             candidates.append(Path(workspace_path).expanduser().parent)
 
@@ -16,12 +16,17 @@ Usage:
     with LogContext(logger, "config_loading"):
         logger.debug("Loading config from path")
 """
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from contextlib import contextmanager
 from functools import wraps
 import traceback
@@ -44,6 +49,109 @@ LOG_FORMAT = "%(asctime)s [%(levelname)s] [%(name)s] %(message)s"
 LOG_FORMAT_DETAILED = "%(asctime)s [%(levelname)s] [%(name)s:%(funcName)s:%(lineno)d] %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# 所有 logger 共用的格式化器（Formatter 无状态，可在多个 handler 间共享）
+_DETAILED_FORMATTER = logging.Formatter(LOG_FORMAT_DETAILED, DATE_FORMAT)
+_SIMPLE_FORMATTER = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+
+# 控制台输出开关，进程内不变，导入时读取一次
+_VERBOSE = bool(os.environ.get('BILIOBJCLINT_VERBOSE'))
+
+# log_dict/log_list 的 level 参数 -> logging 级别（未知值按 debug 处理，与 getattr 回退一致）
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+
+# 文件日志缓冲：攒够 LOG_BATCH_BYTES 字节或遇到 ERROR 及以上时才写盘，
+# 后台线程每 LOG_FLUSH_INTERVAL 秒兜底刷新一次；进程退出时由 logging.shutdown 刷新
+LOG_BATCH_BYTES = 64 * 1024
+LOG_FLUSH_INTERVAL = 30.0
+
+_buffered_handlers: List["BatchedFileHandler"] = []
+_flush_thread: Optional[threading.Thread] = None
+_flush_lock = threading.Lock()
+
+
+def _periodic_flush():
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        with _flush_lock:
+            handlers = list(_buffered_handlers)
+        for handler in handlers:
+            handler.flush()
+
+
+class BatchedFileHandler(logging.Handler):
+    """追加写文件的 handler：格式化后的记录先攒在内存，整批一次 os.write 写入"""
+
+    def __init__(self, filename: str, max_batch: int = LOG_BATCH_BYTES,
+                 flush_level: int = logging.ERROR, encoding: str = "utf-8"):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.max_batch = max_batch
+        self.flush_level = flush_level
+        self.encoding = encoding
+        self._fd: Optional[int] = os.open(
+            self.baseFilename, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        self._buffer: List[bytes] = []
+        self._buffered_bytes = 0
+        self._register()
+
+    def _register(self):
+        global _flush_thread
+        with _flush_lock:
+            _buffered_handlers.append(self)
+            if _flush_thread is None:
+                _flush_thread = threading.Thread(
+                    target=_periodic_flush, name="biliobjclint-log-flush", daemon=True
+                )
+                _flush_thread.start()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            data = (self.format(record) + "\n").encode(self.encoding, "replace")
+        except Exception:
+            self.handleError(record)
+            return
+        self._buffer.append(data)
+        self._buffered_bytes += len(data)
+        if self._buffered_bytes >= self.max_batch or record.levelno >= self.flush_level:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self._buffer or self._fd is None:
+                return
+            payload = memoryview(b"".join(self._buffer))
+            self._buffer.clear()
+            self._buffered_bytes = 0
+            try:
+                while payload:
+                    written = os.write(self._fd, payload)
+                    payload = payload[written:]
+            except OSError:
+                # 与 logging 一致：写日志失败不影响调用方
+                if logging.raiseExceptions:
+                    traceback.print_exc(file=sys.stderr)
+
+    def close(self):
+        with self.lock:
+            try:
+                self.flush()
+            finally:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+        with _flush_lock:
+            if self in _buffered_handlers:
+                _buffered_handlers.remove(self)
+        super().close()
+
 
 class BiliObjCLintLogger:
     """BiliObjCLint 日志记录器"""
@@ -60,23 +168,41 @@ class BiliObjCLintLogger:
         if not self.logger.handlers:
             self._setup_handlers(log_file)
 
+        # 级别名 -> 底层 logging.Logger 方法，批量输出时跳过本类的转发层
+        self._level_funcs = {
+            "debug": self.logger.debug,
+            "info": self.logger.info,
+            "warning": self.logger.warning,
+            "error": self.logger.error,
+            "critical": self.logger.critical,
+        }
+
     def _setup_handlers(self, log_file: Optional[str] = None):
         """设置日志处理器"""
         # 文件处理器
         if log_file is None:
             log_file = self._get_default_log_file()
 
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = BatchedFileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(logging.Formatter(LOG_FORMAT_DETAILED, DATE_FORMAT))
-        self.logger.addHandler(file_handler)
+        file_handler.setFormatter(_DETAILED_FORMATTER)
+        handlers = [file_handler]
 
         # 控制台处理器（仅 WARNING 及以上）- 可通过环境变量控制
-        if os.environ.get('BILIOBJCLINT_VERBOSE'):
+        if _VERBOSE:
             console_handler = logging.StreamHandler(sys.stderr)
             console_handler.setLevel(logging.INFO)
-            console_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
-            self.logger.addHandler(console_handler)
+            console_handler.setFormatter(_SIMPLE_FORMATTER)
+            handlers.append(console_handler)
+
+        # QueueHandler.prepare 在调用线程上合并 %-参数与异常信息后入队，
+        # 按 handler 格式输出并写入文件由后台 QueueListener 完成；
+        # 退出时先 stop listener 排空队列，再由 logging.shutdown 刷新文件缓冲
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
         self.log_file = log_file
 
@@ -119,47 +245,56 @@ class BiliObjCLintLogger:
     def log_separator(self, title: str = ""):
         """记录分隔线"""
         if title:
-            self.info(f"{'=' * 20} {title} {'=' * 20}")
+            self.info("%s %s %s", "=" * 20, title, "=" * 20)
         else:
             self.info("=" * 60)
 
     def log_dict(self, title: str, data: dict, level: str = "debug"):
         """记录字典数据"""
-        log_func = getattr(self, level, self.debug)
-        log_func(f"{title}:")
+        if not self.logger.isEnabledFor(_LEVELS.get(level, logging.DEBUG)):
+            return
+        log_func = self._level_funcs.get(level, self.logger.debug)
+        log_func("%s:", title)
         for key, value in data.items():
-            log_func(f"  {key}: {value}")
+            log_func("  %s: %s", key, value)
 
     def log_list(self, title: str, items: list, level: str = "debug", max_items: int = 20):
         """记录列表数据"""
-        log_func = getattr(self, level, self.debug)
-        log_func(f"{title} ({len(items)} items):")
+        if not self.logger.isEnabledFor(_LEVELS.get(level, logging.DEBUG)):
+            return
+        log_func = self._level_funcs.get(level, self.logger.debug)
+        log_func("%s (%d items):", title, len(items))
         for i, item in enumerate(items[:max_items]):
-            log_func(f"  [{i}] {item}")
+            log_func("  [%d] %s", i, item)
         if len(items) > max_items:
-            log_func(f"  ... and {len(items) - max_items} more")
+            log_func("  ... and %d more", len(items) - max_items)
 
 
 class LogContext:
     """日志上下文管理器"""
 
+    __slots__ = ("logger", "context_name", "start_ns")
+
     def __init__(self, logger: BiliObjCLintLogger, context_name: str):
         self.logger = logger
         self.context_name = context_name
-        self.start_time = None
+        self.start_ns = None
 
     def __enter__(self):
-        self.start_time = datetime.now()
-        self.logger.debug(f"[{self.context_name}] Started")
+        # 单调时钟计时：不分配 datetime 对象，也不受系统时间调整影响
+        self.start_ns = time.monotonic_ns()
+        self.logger.debug("[%s] Started", self.context_name)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        elapsed = (datetime.now() - self.start_time).total_seconds()
+        elapsed = (time.monotonic_ns() - self.start_ns) / 1e9
         if exc_type:
-            self.logger.error(f"[{self.context_name}] Failed after {elapsed:.2f}s: {exc_val}")
-            self.logger.debug(f"[{self.context_name}] Traceback: {traceback.format_exc()}")
+            self.logger.error("[%s] Failed after %.2fs: %s", self.context_name, elapsed, exc_val)
+            # 仅在 DEBUG 可输出时才格式化 traceback
+            if self.logger.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("[%s] Traceback: %s", self.context_name, traceback.format_exc())
         else:
-            self.logger.debug(f"[{self.context_name}] Completed in {elapsed:.2f}s")
+            self.logger.debug("[%s] Completed in %.2fs", self.context_name, elapsed)
         return False  # 不抑制异常
 
 
@@ -174,9 +309,11 @@ def get_logger(name: str, log_file: Optional[str] = None) -> BiliObjCLintLogger:
     Returns:
         BiliObjCLintLogger 实例
     """
-    if name not in BiliObjCLintLogger._instances:
-        BiliObjCLintLogger._instances[name] = BiliObjCLintLogger(name, log_file)
-    return BiliObjCLintLogger._instances[name]
+    # 命中时只做一次字典查找；reset_session 会清空实例表，因此不在调用方缓存实例
+    logger = BiliObjCLintLogger._instances.get(name)
+    if logger is None:
+        logger = BiliObjCLintLogger._instances[name] = BiliObjCLintLogger(name, log_file)
+    return logger
 
 
 def reset_session():
@@ -188,18 +325,27 @@ def reset_session():
 def log_function(logger_name: str = "biliobjclint"):
     """函数装饰器，自动记录函数调用"""
     def decorator(func):
+        func_name = func.__name__
+        # 底层 logging.Logger 按名称全局唯一，reset_session 后依然有效；
+        # 首次调用时才创建（避免装饰时即初始化日志文件），之后直接复用
+        resolved = []
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            logger = get_logger(logger_name)
-            func_name = func.__name__
-            logger.debug(f"Calling {func_name}()")
+            if not resolved:
+                resolved.append(get_logger(logger_name).logger)
+            logger = resolved[0]
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                logger.debug("Calling %s()", func_name)
             try:
                 result = func(*args, **kwargs)
-                logger.debug(f"{func_name}() completed successfully")
-                return result
             except Exception as e:
-                logger.error(f"{func_name}() failed: {e}")
+                logger.error("%s() failed: %s", func_name, e)
                 raise
+            if debug_enabled:
+                logger.debug("%s() completed successfully", func_name)
+            return result
         return wrapper
     return decorator
 
@@ -212,23 +358,20 @@ def get_current_log_file(name: str = "biliobjclint") -> Optional[str]:
 
 
 def cleanup_old_logs(max_days: int = 7):
-    """清理旧日志文件"""
+    """清理旧日志文件（按文件修改时间判断，不依赖文件名格式）"""
     logs_dir = get_logs_dir()
-    now = datetime.now()
+    cutoff = time.time() - max_days * 86400
 
-    for log_file in logs_dir.glob("*.log"):
-        try:
-            # 从文件名解析日期
-            # 格式: name_YYYYMMDD_HHMMSS.log
-            parts = log_file.stem.split('_')
-            if len(parts) >= 2:
-                date_str = parts[-2]  # YYYYMMDD
-                file_date = datetime.strptime(date_str, "%Y%m%d")
-                age_days = (now - file_date).days
-                if age_days > max_days:
-                    log_file.unlink()
-        except (ValueError, IndexError):
-            continue
+    # scandir 的 DirEntry 复用目录读取得到的信息，避免逐个构造 Path
+    with os.scandir(logs_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".log"):
+                continue
+            try:
+                if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError:
+                continue
 
 
 # 便捷函数
@@ -236,16 +379,16 @@ def log_lint_start(project_root: str, files_count: int, incremental: bool = Fals
     """记录 lint 开始"""
     logger = get_logger("biliobjclint")
     logger.log_separator("BiliObjCLint Session Start")
-    logger.info(f"Project root: {project_root}")
-    logger.info(f"Files to check: {files_count}")
-    logger.info(f"Incremental mode: {incremental}")
+    logger.info("Project root: %s", project_root)
+    logger.info("Files to check: %d", files_count)
+    logger.info("Incremental mode: %s", incremental)
 
 
 def log_lint_end(violations_count: int, errors_count: int, warnings_count: int, elapsed: float):
     """记录 lint 结束"""
     logger = get_logger("biliobjclint")
-    logger.info(f"Lint completed in {elapsed:.2f}s")
-    logger.info(f"Total violations: {violations_count} (errors: {errors_count}, warnings: {warnings_count})")
+    logger.info("Lint completed in %.2fs", elapsed)
+    logger.info("Total violations: %d (errors: %d, warnings: %d)", violations_count, errors_count, warnings_count)
     logger.log_separator("BiliObjCLint Session End")
 
 
@@ -253,14 +396,14 @@ def log_auto_fix_start(violations_count: int, project_root: str):
     """记录自动修复开始"""
     logger = get_logger("auto_fix")
     logger.log_separator("Auto Fix Session Start")
-    logger.info(f"Project root: {project_root}")
-    logger.info(f"Violations to fix: {violations_count}")
+    logger.info("Project root: %s", project_root)
+    logger.info("Violations to fix: %d", violations_count)
 
 
 def log_auto_fix_end(success: bool, message: str, elapsed: float):
     """记录自动修复结束"""
     logger = get_logger("auto_fix")
     status = "SUCCESS" if success else "FAILED"
-    logger.info(f"Auto fix {status}: {message}")
-    logger.info(f"Elapsed time: {elapsed:.2f}s")
+    logger.info("Auto fix %s: %s", status, message)
+    logger.info("Elapsed time: %.2fs", elapsed)
     logger.log_separator("Auto Fix Session End")
@@ -4,6 +4,7 @@ Reporter Module - 输出格式化 (Xcode 兼容)
 import hashlib
 import json
 import sys
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Optional, Set, Tuple, NamedTuple
@@ -19,6 +20,10 @@ class Severity(Enum):
     NOTE = "note"
 
 
+# value -> Severity；from_dict 在缓存命中时按行调用，字典查找比 Severity(value) 的枚举查找更轻
+_SEVERITY_BY_VALUE = {member.value: member for member in Severity}
+
+
 class ViolationType(NamedTuple):
     """
     违规类型定义（sub_type + message + severity 绑定）
@@ -137,7 +142,7 @@ class Violation:
             file_path=d.get("file_path") or d.get("file", ""),
             line=d.get("line", 0),
             column=d.get("column", 0),
-            severity=Severity(d.get("severity", "warning")),
+            severity=_SEVERITY_BY_VALUE.get(d.get("severity", "warning")) or Severity(d["severity"]),
             message=d.get("message", ""),
             rule_id=d.get("rule_id") or d.get("rule", ""),
             source=d.get("source", "biliobjclint"),
@@ -180,6 +185,9 @@ class Reporter:
 
         before_count = len(self.violations)
         filtered = []
+        # file_path -> 升序变更行号：关联行范围与变更行是否有交集只需一次二分，
+        # 不再逐行查询集合（方法级范围可能有数百行）
+        sorted_changed_map = {}
         for v in self.violations:
             if v.file_path in changed_lines_map:
                 changed_lines = changed_lines_map[v.file_path]
@@ -191,7 +199,11 @@ class Reporter:
                 elif v.related_lines:
                     # 检查关联行范围是否与变更行有交集
                     start, end = v.related_lines
-                    if any(line in changed_lines for line in range(start, end + 1)):
+                    sorted_changed = sorted_changed_map.get(v.file_path)
+                    if sorted_changed is None:
+                        sorted_changed = sorted_changed_map[v.file_path] = sorted(changed_lines)
+                    index = bisect_left(sorted_changed, start)
+                    if index < len(sorted_changed) and sorted_changed[index] <= end:
                         filtered.append(v)
             # 如果文件不在变更列表中，丢弃
 
@@ -7,28 +7,182 @@ Result Cache Module - 规则检查结果缓存
 缓存隔离策略：
 - 缓存 key 为文件绝对路径的 MD5，不同项目天然隔离
 
-缓存失效策略：
-- 文件 mtime 变化
-- 规则配置变化（通过 config_hash 判断）
+缓存失效策略（两级校验）：
+- 快路径：文件 mtime 未变化直接命中
+- 慢路径：mtime 变化时比较文件内容摘要，内容未变（如 git checkout、touch）仍命中并刷新 mtime
+- 规则配置或工具版本变化（通过 config_hash 判断）
 """
+import mmap
 import os
+import sys
 import json
 import hashlib
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-from threading import RLock
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, fields, replace
+from functools import cached_property, lru_cache
+from threading import Lock, RLock
 
+from .file_cache import compute_content_digest
 from .logger import get_logger
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
 
-@dataclass
+try:
+    import msgspec
+except ImportError:  # msgspec 为可选依赖，仅在缺少 orjson 时用于解析
+    msgspec = None
+
+_msgspec_decoder = msgspec.json.Decoder() if msgspec is not None else None
+
+
+def _json_loads(data: bytes) -> Any:
+    """解析 JSON（优先 orjson，其次 msgspec，最后标准库 json）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if _msgspec_decoder is not None:
+        try:
+            return _msgspec_decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # 与 json/orjson 保持一致，解析失败统一表现为 ValueError
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 JSON 字节串（优先 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+@lru_cache(maxsize=8192)
+def _cache_key_for(file_path: str) -> str:
+    """文件路径 -> 缓存键（路径的 MD5，避免路径过长）
+
+    每个文件在 get/put 中都会计算，路径集合在进程内固定，结果可直接记忆。
+    """
+    return hashlib.md5(file_path.encode()).hexdigest()
+
+
+def _file_digest(file_path: str) -> Optional[str]:
+    """文件内容摘要（blake2b/128bit），读取失败返回 None"""
+    try:
+        with open(file_path, "rb") as f:
+            return compute_content_digest(f.read())
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _tool_version() -> str:
+    """BiliObjCLint 版本号；规则实现随版本变化，纳入 config_hash 使升级后旧结果失效"""
+    version_file = Path(__file__).resolve().parents[3] / "VERSION"
+    try:
+        return version_file.read_text().strip()
+    except OSError:
+        return "unknown"
+
+
+# 进程内已解析的缓存文件: path -> (st_mtime_ns, st_size, data)
+# 同一进程内多个 ResultCache 实例读取同一文件时只解析一次
+_parsed_files: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+_parsed_files_lock = Lock()
+
+
+def _read_json_file(path: Path) -> Any:
+    """解析 JSON 文件；orjson 可用时通过只读 mmap 直接解析，共享页缓存、省去一次整文件拷贝"""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # mmap 不可用（特殊文件系统、空文件等）时回退到普通读取
+                return orjson.loads(f.read())
+            with mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    return _json_loads(path.read_bytes())
+
+
+def _load_json_file(path: Path) -> Dict[str, Any]:
+    """读取并解析 JSON 文件，文件 (mtime, size) 未变化时复用上次解析结果"""
+    st = path.stat()
+    key = str(path)
+    with _parsed_files_lock:
+        cached = _parsed_files.get(key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+    if st.st_size == 0:
+        return {}
+    data = _read_json_file(path)
+    if not isinstance(data, dict):
+        raise ValueError(f"unexpected cache file structure: {type(data).__name__}")
+    with _parsed_files_lock:
+        _parsed_files[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """原子写入：整块写入同目录临时文件后 os.replace 覆盖目标文件
+
+    临时文件名带 pid，避免多个 lint 进程并发保存时互相覆盖。
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _remember_json_file(path: Path, data: Dict[str, Any]) -> None:
+    """写入文件后同步更新进程内解析缓存"""
+    try:
+        st = path.stat()
+    except OSError:
+        return
+    with _parsed_files_lock:
+        _parsed_files[str(path)] = (st.st_mtime_ns, st.st_size, data)
+
+
+# Python 3.10+ 才支持 dataclass(slots=True)，低版本退化为普通 frozen dataclass
+_VALUE_DATACLASS_OPTS = {"frozen": True}
+if sys.version_info >= (3, 10):
+    _VALUE_DATACLASS_OPTS["slots"] = True
+
+
+@dataclass(**_VALUE_DATACLASS_OPTS)
 class CachedResult:
-    """缓存的检查结果"""
+    """缓存的检查结果（不可变值对象）"""
     file_path: str
     mtime: float
     config_hash: str
     violations: List[Dict[str, Any]]  # 序列化的 Violation 列表
+    content_hash: str  # 文件内容摘要，mtime 变化时用于二次校验
+
+
+# 字段名元组；save 时按字段浅拷贝，避免 asdict 对 violations 的递归深拷贝
+_CACHED_RESULT_FIELDS = tuple(f.name for f in fields(CachedResult))
+
+
+def _cached_result_to_dict(result: CachedResult) -> Dict[str, Any]:
+    return {name: getattr(result, name) for name in _CACHED_RESULT_FIELDS}
+
+
+def _cached_result_from_dict(raw: Dict[str, Any]) -> Optional[CachedResult]:
+    """磁盘条目 -> CachedResult，按字段顺序位置传参；字段缺失或格式不符时返回 None"""
+    try:
+        return CachedResult(*[raw[name] for name in _CACHED_RESULT_FIELDS])
+    except (KeyError, TypeError):
+        return None
 
 
 class ResultCache:
@@ -45,6 +199,8 @@ class ResultCache:
         self.logger = get_logger("biliobjclint")
         self._lock = RLock()
         self._memory_cache: Dict[str, CachedResult] = {}
+        # 已从磁盘解析、但尚未访问的原始条目；首次访问时才构造 CachedResult
+        self._raw_entries: Dict[str, Dict[str, Any]] = {}
         self._hits = 0
         self._misses = 0
 
@@ -60,25 +216,38 @@ class ResultCache:
             self.logger.warning(f"Failed to create cache dir: {e}")
             self.enabled = False
 
-    def _get_cache_file(self) -> Path:
-        """获取缓存文件路径"""
+    @cached_property
+    def _cache_file(self) -> Path:
+        """缓存文件路径"""
         return self.cache_dir / "result_cache.json"
 
     def _load_cache(self):
         """从磁盘加载缓存"""
-        cache_file = self._get_cache_file()
+        cache_file = self._cache_file
         if not cache_file.exists():
             return
 
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for key, value in data.items():
-                    self._memory_cache[key] = CachedResult(**value)
-            self.logger.debug(f"Loaded {len(self._memory_cache)} cached results from disk")
-        except Exception as e:
+            data = _load_json_file(cache_file)
+            self._raw_entries = dict(data)
+            self.logger.debug(f"Loaded {len(self._raw_entries)} cached results from disk")
+        except (OSError, ValueError) as e:
+            # ValueError 覆盖 json/orjson 的 JSONDecodeError 及结构不符
             self.logger.warning(f"Failed to load result cache: {e}")
-            self._memory_cache = {}
+            self._raw_entries = {}
+
+    def _lookup(self, key: str) -> Optional[CachedResult]:
+        """按 key 查找缓存条目，原始条目在首次访问时才构造（调用方需持有锁）"""
+        cached = self._memory_cache.get(key)
+        if cached is None:
+            raw = self._raw_entries.pop(key, None)
+            if raw is None:
+                return None
+            cached = _cached_result_from_dict(raw)
+            if cached is None:
+                return None
+            self._memory_cache[key] = cached
+        return cached
 
     def save(self):
         """保存缓存到磁盘"""
@@ -86,26 +255,28 @@ class ResultCache:
             return
 
         with self._lock:
-            cache_file = self._get_cache_file()
+            cache_file = self._cache_file
             try:
-                data = {k: asdict(v) for k, v in self._memory_cache.items()}
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False)
-                self.logger.debug(f"Saved {len(self._memory_cache)} cached results to disk")
-            except Exception as e:
+                data = dict(self._raw_entries)
+                data.update((k, _cached_result_to_dict(v)) for k, v in self._memory_cache.items())
+                _atomic_write_bytes(cache_file, _json_dumps(data))
+                _remember_json_file(cache_file, data)
+                self.logger.debug(f"Saved {len(data)} cached results to disk")
+            except (OSError, TypeError, ValueError) as e:
+                # TypeError 覆盖 json/orjson 无法序列化的值
                 self.logger.warning(f"Failed to save result cache: {e}")
 
     @staticmethod
     def compute_config_hash(rules_config: Dict[str, Any]) -> str:
-        """计算规则配置的 hash 值"""
+        """计算规则配置的 hash 值（包含工具版本）"""
         # 序列化配置并计算 MD5
-        config_str = json.dumps(rules_config, sort_keys=True, default=str)
+        config_str = json.dumps({"version": _tool_version(), "rules": rules_config},
+                                sort_keys=True, default=str)
         return hashlib.md5(config_str.encode()).hexdigest()[:16]
 
     def _get_cache_key(self, file_path: str) -> str:
         """生成缓存键"""
-        # 使用文件路径的 hash 作为键，避免路径过长
-        return hashlib.md5(file_path.encode()).hexdigest()
+        return _cache_key_for(file_path)
 
     def get(self, file_path: str, config_hash: str) -> Optional[List[Dict[str, Any]]]:
         """
@@ -123,7 +294,7 @@ class ResultCache:
 
         with self._lock:
             key = self._get_cache_key(file_path)
-            cached = self._memory_cache.get(key)
+            cached = self._lookup(key)
 
             if cached is None:
                 self._misses += 1
@@ -136,58 +307,67 @@ class ResultCache:
                 self._misses += 1
                 return None
 
-            if cached.mtime != current_mtime:
-                self._misses += 1
-                self.logger.debug(f"Cache miss (mtime changed): {file_path}")
-                return None
-
             # 检查配置 hash 是否变化
             if cached.config_hash != config_hash:
                 self._misses += 1
                 self.logger.debug(f"Cache miss (config changed): {file_path}")
                 return None
 
+            if cached.mtime != current_mtime:
+                # mtime 变化但内容可能未变，比较内容摘要
+                if _file_digest(file_path) != cached.content_hash:
+                    self._misses += 1
+                    self.logger.debug(f"Cache miss (content changed): {file_path}")
+                    return None
+                self._memory_cache[key] = replace(cached, mtime=current_mtime)
+
             self._hits += 1
             self.logger.debug(f"Cache hit: {file_path}")
             return cached.violations
 
-    def put(self, file_path: str, config_hash: str, violations: List[Dict[str, Any]]):
+    def put(self, file_path: str, config_hash: str, violations: List[Dict[str, Any]],
+            mtime: float, content_hash: str):
         """
         存储检查结果到缓存
 
+        mtime 与 content_hash 须取自规则检查所用的那次文件读取（FileContentCache 条目），
+        不在检查后重新读取文件：期间文件被保存时，旧结果不会配上新内容的摘要。
+
         Args:
             file_path: 文件路径
             config_hash: 规则配置 hash
             violations: violations 列表（已序列化为 dict）
+            mtime: 读取文件时的 mtime
+            content_hash: 读取到的文件内容摘要
         """
         if not self.enabled:
             return
 
-        try:
-            mtime = os.path.getmtime(file_path)
-        except OSError:
-            return
-
         with self._lock:
             key = self._get_cache_key(file_path)
+            self._raw_entries.pop(key, None)
             self._memory_cache[key] = CachedResult(
                 file_path=file_path,
                 mtime=mtime,
                 config_hash=config_hash,
-                violations=violations
+                violations=violations,
+                content_hash=content_hash
             )
 
     def clear(self):
         """清空缓存"""
         with self._lock:
             self._memory_cache.clear()
+            self._raw_entries.clear()
             self._hits = 0
             self._misses = 0
-            cache_file = self._get_cache_file()
+            cache_file = self._cache_file
+            with _parsed_files_lock:
+                _parsed_files.pop(str(cache_file), None)
             if cache_file.exists():
                 try:
                     cache_file.unlink()
-                except Exception:
+                except OSError:
                     pass
 
     def get_stats(self) -> Dict[str, Any]:
@@ -197,7 +377,7 @@ class ResultCache:
             hit_rate = self._hits / total if total > 0 else 0
             return {
                 "enabled": self.enabled,
-                "entries": len(self._memory_cache),
+                "entries": len(self._memory_cache) + len(self._raw_entries),
                 "hits": self._hits,
                 "misses": self._misses,
                 "hit_rate": f"{hit_rate:.1%}"
@@ -206,21 +386,25 @@ class ResultCache:
 
 # 全局缓存实例
 _result_cache: Optional[ResultCache] = None
+_result_cache_lock = Lock()
 
 
 def get_result_cache(cache_dir: str = None, enabled: bool = True) -> ResultCache:
     """获取全局结果缓存实例"""
     global _result_cache
     if _result_cache is None:
-        if cache_dir is None:
-            # 默认缓存目录：全局 ~/.biliobjclint/（按文件绝对路径隔离）
-            from pathlib import Path
-            cache_dir = str(Path.home() / ".biliobjclint")
-        _result_cache = ResultCache(cache_dir, enabled)
+        # 双重检查：并发首次访问时只由一个线程加载缓存文件
+        with _result_cache_lock:
+            if _result_cache is None:
+                if cache_dir is None:
+                    # 默认缓存目录：全局 ~/.biliobjclint/（按文件绝对路径隔离）
+                    cache_dir = str(Path.home() / ".biliobjclint")
+                _result_cache = ResultCache(cache_dir, enabled)
     return _result_cache
 
 
 def reset_result_cache():
     """重置全局缓存实例"""
     global _result_cache
-    _result_cache = None
+    with _result_cache_lock:
+        _result_cache = None
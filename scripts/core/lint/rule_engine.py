@@ -3,46 +3,101 @@ Rule Engine Module - Python 规则引擎
 
 支持:
 - 文件内容缓存
-- 多文件并行检查
+- 多文件并行检查（线程池 / 可选进程池）
 - 规则结果缓存（持久化）
 """
+import os
 import sys
+import pickle
 import importlib.util
 from pathlib import Path
 from typing import List, Dict, Set, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from dataclasses import replace
 from threading import Lock
 
 from .reporter import Violation
 from .config import RuleConfig
 from .logger import get_logger
-from .file_cache import get_file_cache
-from .result_cache import ResultCache
+from .file_cache import CachedFile, get_file_cache
+from .result_cache import ResultCache, get_result_cache
 from .rules.base_rule import BaseRule
 
 
+def _run_rules(rules: List[BaseRule], file_path: str, content: str, lines: List[str],
+               changed_lines: Set[int]) -> Tuple[List[Violation], List[str]]:
+    """对单个文件依次执行规则，返回 (违规列表, 规则异常信息列表)"""
+    violations = []
+    errors = []
+    for rule in rules:
+        if not rule.enabled:
+            continue
+        try:
+            # code_hash 已在 create_violation 时计算，无需事后处理
+            violations.extend(rule.check(
+                file_path=file_path,
+                content=content,
+                lines=lines,
+                changed_lines=changed_lines
+            ))
+        except Exception as e:
+            errors.append(f"Rule {rule.identifier} failed on {file_path}: {e}")
+    return violations, errors
+
+
+# 进程池 worker 内的规则实例（由 initializer 注入，每个 worker 只反序列化一次）
+_worker_rules: List[BaseRule] = []
+
+
+def _init_process_worker(rules: List[BaseRule]):
+    """进程池 worker 初始化"""
+    global _worker_rules
+    _worker_rules = rules
+
+
+def _process_check_file(task: Tuple[str, Set[int]]) -> Tuple[str, List[Violation], List[str],
+                                                            Optional[CachedFile]]:
+    """进程池任务：读取文件并执行全部规则
+
+    worker 中不写日志（子进程没有父进程日志队列的消费线程），
+    规则异常以字符串形式返回，由父进程统一记录。
+    同时返回本次读取的文件条目，父进程据此写入结果缓存（不回传 content/lines）。
+    """
+    file_path, changed_lines = task
+    cached = get_file_cache().get_entry(file_path)
+    if cached is None:
+        return file_path, [], [], None
+    violations, errors = _run_rules(_worker_rules, file_path, cached.content, cached.lines, changed_lines)
+    return file_path, violations, errors, replace(cached, content="", lines=[])
+
+
 class RuleEngine:
     """规则引擎 - 管理和执行规则（性能优化版）"""
 
     def __init__(self, project_root: str, parallel: bool = True, max_workers: int = 0,
-                 file_cache_size_mb: int = 100, result_cache_enabled: bool = True):
+                 file_cache_size_mb: int = 100, result_cache_enabled: bool = True,
+                 use_processes: bool = False):
         """
         Args:
             project_root: 项目根目录
             parallel: 是否启用并行执行
-            max_workers: 最大工作线程数（0 表示自动：min(32, cpu_count * 2)）
+            max_workers: 最大工作线程数（0 表示自动：min(32, cpu_count * 2)；进程池为 cpu_count）
             file_cache_size_mb: 文件缓存最大容量（MB）
             result_cache_enabled: 是否启用规则结果缓存
+            use_processes: 并行时使用进程池（规则检查为纯 CPU 计算，绕开 GIL）
         """
         self.project_root = Path(project_root)
         self.rules: List[BaseRule] = []
         self.logger = get_logger("biliobjclint")
         self.parallel = parallel
         self.max_workers = max_workers
+        self.use_processes = use_processes
         self._file_cache = get_file_cache(file_cache_size_mb)
-        # 规则结果缓存（全局目录，按文件绝对路径隔离）
-        cache_dir = Path.home() / ".biliobjclint"
-        self._result_cache = ResultCache(str(cache_dir), enabled=result_cache_enabled)
+        # 规则结果缓存（全局目录，按文件绝对路径隔离）；复用进程内单例，避免重复加载缓存文件
+        if result_cache_enabled:
+            self._result_cache = get_result_cache()
+        else:
+            self._result_cache = ResultCache(str(Path.home() / ".biliobjclint"), enabled=False)
         self._config_hash: Optional[str] = None
         self.logger.debug(f"RuleEngine initialized: project_root={project_root}, parallel={parallel}, result_cache={result_cache_enabled}")
 
@@ -147,49 +202,45 @@ class RuleEngine:
         Returns:
             违规列表
         """
-        # 判断是否可以使用结果缓存
-        # 只有全量检查（无 changed_lines）时才使用缓存
-        use_result_cache = (not changed_lines) and self._config_hash
-
-        # 尝试从结果缓存获取
-        if use_result_cache:
-            cached_violations = self._result_cache.get(file_path, self._config_hash)
-            if cached_violations is not None:
-                # 使用 Violation.from_dict() 反序列化
-                return [Violation.from_dict(v) for v in cached_violations]
-
-        violations = []
+        cached_violations = self._get_cached_violations(file_path, changed_lines)
+        if cached_violations is not None:
+            return cached_violations
 
         # 使用文件缓存读取文件内容
-        cached = self._file_cache.get(file_path)
+        cached = self._file_cache.get_entry(file_path)
         if cached is None:
-            return violations
+            return []
 
-        content, lines = cached
-
-        for rule in self.rules:
-            if not rule.enabled:
-                continue
+        violations, errors = _run_rules(self.rules, file_path, cached.content, cached.lines,
+                                        changed_lines or set())
+        self._report_rule_errors(errors)
+        self._store_cached_violations(file_path, changed_lines, violations, cached)
 
-            try:
-                rule_violations = rule.check(
-                    file_path=file_path,
-                    content=content,
-                    lines=lines,
-                    changed_lines=changed_lines or set()
-                )
-                # code_hash 已在 create_violation 时计算，无需事后处理
-                violations.extend(rule_violations)
-            except Exception as e:
-                self.logger.warning(f"Rule {rule.identifier} failed on {file_path}: {e}")
-                print(f"Warning: Rule {rule.identifier} failed on {file_path}: {e}", file=sys.stderr)
+        return violations
 
-        # 存储到结果缓存（使用 Violation.to_dict()）
-        if use_result_cache and violations is not None:
-            serialized = [v.to_dict() for v in violations]
-            self._result_cache.put(file_path, self._config_hash, serialized)
+    def _get_cached_violations(self, file_path: str, changed_lines: Optional[Set[int]]) -> Optional[List[Violation]]:
+        """从结果缓存获取违规（只有全量检查，即无 changed_lines 时才使用缓存）"""
+        if changed_lines or not self._config_hash:
+            return None
+        cached_violations = self._result_cache.get(file_path, self._config_hash)
+        if cached_violations is None:
+            return None
+        # 使用 Violation.from_dict() 反序列化
+        return [Violation.from_dict(v) for v in cached_violations]
+
+    def _store_cached_violations(self, file_path: str, changed_lines: Optional[Set[int]],
+                                 violations: List[Violation], cached_file: Optional[CachedFile]):
+        """存储到结果缓存（使用 Violation.to_dict()；mtime/摘要取自检查所用的文件条目）"""
+        if changed_lines or not self._config_hash or cached_file is None:
+            return
+        self._result_cache.put(file_path, self._config_hash, [v.to_dict() for v in violations],
+                               cached_file.mtime, cached_file.content_hash)
 
-        return violations
+    def _report_rule_errors(self, errors: List[str]):
+        """记录规则执行异常"""
+        for message in errors:
+            self.logger.warning(message)
+            print(f"Warning: {message}", file=sys.stderr)
 
     def check_files(self, files: List[str], changed_lines_map: Dict[str, Set[int]] = None) -> List[Violation]:
         """
@@ -205,6 +256,8 @@ class RuleEngine:
 
         if not self.parallel or len(files) <= 1:
             violations = self._check_files_sequential(files, changed_lines_map)
+        elif self.use_processes and self._rules_picklable():
+            violations = self._check_files_processes(files, changed_lines_map)
         else:
             violations = self._check_files_parallel(files, changed_lines_map)
 
@@ -244,7 +297,6 @@ class RuleEngine:
         # 确定工作线程数
         workers = self.max_workers
         if workers <= 0:
-            import os
             workers = min(32, (os.cpu_count() or 1) * 2)
         workers = min(workers, len(files))
 
@@ -276,3 +328,54 @@ class RuleEngine:
                          f"size={cache_stats['cache_size_mb']:.2f}MB")
 
         return all_violations
+
+    def _rules_picklable(self) -> bool:
+        """进程池需要把规则实例传给 worker；自定义规则等无法序列化时回退到线程池"""
+        try:
+            pickle.dumps(self.rules)
+        except Exception as e:
+            self.logger.warning(f"Rules are not picklable, falling back to threads: {e}")
+            return False
+        return True
+
+    def _check_files_processes(self, files: List[str], changed_lines_map: Dict[str, Set[int]] = None) -> List[Violation]:
+        """多进程检查文件
+
+        结果缓存的读写都在父进程完成，worker 只处理缓存未命中的文件；
+        executor.map 按提交顺序返回，输出顺序与串行检查一致。
+        """
+        results: Dict[str, List[Violation]] = {}
+        tasks = []
+        for file_path in files:
+            changed_lines = changed_lines_map.get(file_path, set()) if changed_lines_map else None
+            cached_violations = self._get_cached_violations(file_path, changed_lines)
+            if cached_violations is not None:
+                results[file_path] = cached_violations
+            else:
+                tasks.append((file_path, changed_lines or set()))
+
+        if tasks:
+            workers = self.max_workers if self.max_workers > 0 else (os.cpu_count() or 1)
+            workers = min(workers, len(tasks))
+            self.logger.debug(f"Starting process pool check with {workers} workers "
+                              f"({len(results)} files served from result cache)")
+
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_process_worker,
+                                         initargs=(self.rules,)) as executor:
+                    outcomes = executor.map(_process_check_file, tasks, chunksize=8)
+                    for (file_path, changed_lines), (_, violations, errors, cached_file) in zip(tasks, outcomes):
+                        self._report_rule_errors(errors)
+                        self._store_cached_violations(file_path, changed_lines, violations, cached_file)
+                        results[file_path] = violations
+            except Exception as e:
+                # 进程池不可用（如受限环境无法创建子进程）时回退到线程池
+                self.logger.error(f"Process pool check failed, falling back to threads: {e}")
+                return self._check_files_parallel(files, changed_lines_map)
+
+        all_violations = []
+        for file_path in files:
+            all_violations.extend(results.get(file_path, ()))
+
+        self.logger.info(f"Total violations found: {len(all_violations)}")
+        return all_violations
@@ -28,31 +28,35 @@ from .security_rules import (
 )
 
 
+# 内置规则类（不可变，get_all_rules 直接返回，无需每次重建列表）
+_ALL_RULES = (
+    # Naming
+    ClassPrefixRule,
+    PropertyNamingRule,
+    ConstantNamingRule,
+    MethodNamingRule,
+    MethodParameterRule,
+    # Style
+    LineLengthRule,
+    MethodLengthRule,
+    TodoFixmeRule,
+    FileHeaderRule,
+    # Memory
+    WeakDelegateRule,
+    BlockRetainCycleRule,
+    WrapperEmptyPointerRule,
+    DictUsageRule,
+    CollectionMutationRule,
+    # Security
+    ForbiddenApiRule,
+    HardcodedCredentialsRule,
+    InsecureRandomRule,
+)
+
+
 def get_all_rules():
-    """获取所有内置规则类"""
-    return [
-        # Naming
-        ClassPrefixRule,
-        PropertyNamingRule,
-        ConstantNamingRule,
-        MethodNamingRule,
-        MethodParameterRule,
-        # Style
-        LineLengthRule,
-        MethodLengthRule,
-        TodoFixmeRule,
-        FileHeaderRule,
-        # Memory
-        WeakDelegateRule,
-        BlockRetainCycleRule,
-        WrapperEmptyPointerRule,
-        DictUsageRule,
-        CollectionMutationRule,
-        # Security
-        ForbiddenApiRule,
-        HardcodedCredentialsRule,
-        InsecureRandomRule,
-    ]
+    """获取所有内置规则类（只读元组，需要修改时请自行 list() 拷贝）"""
+    return _ALL_RULES
 
 
 __all__ = [
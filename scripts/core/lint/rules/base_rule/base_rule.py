@@ -2,7 +2,7 @@
 Base Rule - 规则基类
 """
 from abc import ABC, abstractmethod
-from typing import List, Set, Optional, Tuple, Dict
+from typing import List, Set, Optional, Tuple, Dict, Iterator, Pattern
 import sys
 
 # 添加路径以便导入
@@ -11,8 +11,23 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.lint.reporter import Violation, Severity, ViolationType
 from core.lint.config import RuleConfig
+from ..rule_context import get_rule_context
 from ..rule_utils import compute_context_hash
 
+# value -> Severity；未知取值回落为 WARNING，不走枚举查找与异常分支
+_SEVERITY_MAP = {member.value: member for member in Severity}
+
+
+def _lines_align_with_content(content: str, lines: List[str]) -> bool:
+    """
+    判断 lines 是否可视为 content.split('\n') 的结果（整文件偏移可直接换算为行号）
+
+    除行数外再核对首尾行，廉价排除行数恰好相同但内容不对应的调用
+    """
+    return (len(lines) == content.count('\n') + 1
+            and content.startswith(lines[0])
+            and content.endswith(lines[-1]))
+
 
 class BaseRule(ABC):
     """
@@ -40,10 +55,7 @@ class BaseRule(ABC):
         # 确定严重级别
         # 如果配置中显式指定了 severity，使用配置值；否则使用规则的 default_severity
         severity_str = config.severity if (config and config.severity) else self.default_severity
-        try:
-            self.severity = Severity(severity_str)
-        except ValueError:
-            self.severity = Severity.WARNING
+        self.severity = _SEVERITY_MAP.get(severity_str, Severity.WARNING)
 
     @property
     def enabled(self) -> bool:
@@ -69,6 +81,10 @@ class BaseRule(ABC):
         """
         执行规则检查
 
+        规则实例会被多个线程共享，也会被序列化分发到进程池 worker：check 期间不要把
+        当前文件的状态直接写到 self 上。需要在辅助方法间共享的单文件数据放入
+        get_rule_context(lines).rule_data(...)（按线程、按文件独享）。
+
         Args:
             file_path: 文件绝对路径
             content: 文件完整内容
@@ -93,6 +109,96 @@ class BaseRule(ABC):
             return True
         return line_num in changed_lines
 
+    def iter_checked_lines(self, lines: List[str], changed_lines: Set[int]) -> Iterator[Tuple[int, str]]:
+        """
+        遍历需要检查的行
+
+        增量模式下只按变更行号取行（有序、越界行号丢弃），不再逐行查询集合；
+        changed_lines 为空时等价于 enumerate(lines, 1)。
+
+        Args:
+            lines: 文件行列表
+            changed_lines: 变更行号集合
+        Returns:
+            (行号, 行内容) 迭代器，行号从 1 开始
+        """
+        if not changed_lines:
+            return enumerate(lines, 1)
+        total = len(lines)
+        return ((line_num, lines[line_num - 1])
+                for line_num in sorted(changed_lines) if 0 < line_num <= total)
+
+    def iter_lines_containing(self, content: str, lines: List[str], changed_lines: Set[int],
+                              needle: str) -> Iterator[Tuple[int, str]]:
+        """
+        遍历需要检查且包含 needle 的行（等价于 iter_checked_lines 再按 needle in line 过滤）
+
+        全量检查且 lines 为 content.split('\n') 时，用 str.find 在整个 content 上跳跃查找，
+        不含 needle 的行不再经过 Python 循环；适合绝大多数行都不含的字面量预筛。
+        对齐判断同 iter_match_line_numbers（_lines_align_with_content）。
+
+        Args:
+            content: 文件内容
+            lines: 文件行列表
+            changed_lines: 变更行号集合
+            needle: 行内必须包含的子串（不含换行符）
+        Returns:
+            (行号, 行内容) 迭代器，行号从 1 开始
+        """
+        if changed_lines or not _lines_align_with_content(content, lines):
+            for line_num, line in self.iter_checked_lines(lines, changed_lines):
+                if needle in line:
+                    yield line_num, line
+            return
+
+        line_num = 1
+        offset = 0
+        pos = content.find(needle)
+        while pos != -1:
+            line_num += content.count('\n', offset, pos)
+            yield line_num, lines[line_num - 1]
+            line_end = content.find('\n', pos)
+            if line_end == -1:
+                return
+            # 从本行行尾继续：下一次计数包含该换行符
+            offset = line_end
+            pos = content.find(needle, line_end + 1)
+
+    def iter_match_line_numbers(self, content: str, lines: List[str],
+                                content_pattern: Pattern, line_pattern: Pattern) -> Iterator[int]:
+        """
+        按顺序产出包含匹配的行号（1-indexed，每行至多一次）
+
+        lines 为 content.split('\n') 时对整个 content 做一次 finditer，由匹配偏移
+        增量换算行号，未命中的行不再经过 Python 循环；否则回退到逐行匹配。
+        是否对齐只按行数与首尾行判断（_lines_align_with_content），调用方须保证
+        lines 与 content 来自同一文件内容。
+
+        Args:
+            content: 文件内容
+            lines: 文件行列表
+            content_pattern: 整文件匹配用模式，须与逐行匹配 line_pattern 等价（不跨行）
+            line_pattern: 逐行匹配用模式
+        Returns:
+            行号迭代器
+        """
+        if not _lines_align_with_content(content, lines):
+            for line_num, line in enumerate(lines, 1):
+                if line_pattern.search(line):
+                    yield line_num
+            return
+
+        line_num = 1
+        offset = 0
+        last_line = 0
+        for match in content_pattern.finditer(content):
+            start = match.start()
+            line_num += content.count('\n', offset, start)
+            offset = start
+            if line_num != last_line:
+                last_line = line_num
+                yield line_num
+
     def get_related_lines(self, file_path: str, line: int, lines: List[str]) -> Tuple[int, int]:
         """
         获取关联行范围（子类覆写）
@@ -167,11 +273,18 @@ class BaseRule(ABC):
         if related_lines is None:
             related_lines = self.get_related_lines(file_path, line, lines)
 
-        # 2. 提取 context
-        context = self.get_context(lines, related_lines)
-
-        # 3. 计算 code_hash（不含 rule_id）
-        code_hash = self.compute_code_hash(context)
+        violation_contexts = get_rule_context(lines).violation_contexts
+        range_key = (self.identifier, related_lines[0], related_lines[1])
+        cached = violation_contexts.get(range_key)
+        if cached is None:
+            # 2. 提取 context
+            context = self.get_context(lines, related_lines)
+
+            # 3. 计算 code_hash（不含 rule_id）
+            code_hash = self.compute_code_hash(context)
+            violation_contexts[range_key] = (context, code_hash)
+        else:
+            context, code_hash = cached
 
         # 4. 格式化 message（替换占位符）
         message = violation_type.message
@@ -2,11 +2,13 @@
 Block Retain Cycle Rule - Block 循环引用检查
 """
 import re
-from typing import List, Set, Optional, Tuple
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import List, NamedTuple, Set, Optional, Tuple
 
 from ..base_rule import BaseRule
-from ..rule_utils import get_method_range, strip_line_comment
+from ..rule_context import get_rule_context
+from ..rule_utils import COMMENT_PREFIXES, get_method_range, strip_line_comment
 from core.lint.reporter import Violation, Severity, ViolationType
 
 
@@ -70,22 +72,206 @@ class SubType:
     )
 
 
-@dataclass
-class WeakDeclaration:
-    """Weak 声明信息"""
+class WeakDeclaration(NamedTuple):
+    """Weak 声明信息（每个声明行一个，使用元组存储）"""
     line_num: int
     var_name: str  # 变量名，如 wSelf, weakSelf, self_weak_ (for @weakify)
     is_macro: bool  # 是否为 @weakify 宏
 
 
-@dataclass
-class StrongDeclaration:
-    """Strong 声明信息"""
+class StrongDeclaration(NamedTuple):
+    """Strong 声明信息（每个声明行一个，使用元组存储）"""
     line_num: int
     var_name: str  # 变量名，如 sSelf, strongSelf, self (for @strongify)
     is_macro: bool  # 是否为 @strongify 宏
 
 
+class _DeclarationSummary(NamedTuple):
+    """方法作用域内 weak/strong 声明的汇总，同一作用域内各 self 使用共用"""
+    has_weak: bool
+    has_manual_weak: bool
+    has_macro_weak: bool
+    has_strong: bool
+    has_macro_strong: bool
+    weak_var_name: Optional[str]  # 第一个 manual weak 的变量名
+    strong_var_name: Optional[str]  # 第一个 manual strong 的变量名
+    has_shadow_self: bool  # self 已被 shadow（manual strong 名为 self 或有 @strongify）
+
+
+def _summarize_declarations(weak_decls: List[WeakDeclaration],
+                            strong_decls: List[StrongDeclaration]) -> _DeclarationSummary:
+    """单次遍历 weak/strong 声明，得到规则判定所需的全部标志"""
+    has_macro_weak = False
+    weak_var_name = None
+    for decl in weak_decls:
+        if decl.is_macro:
+            has_macro_weak = True
+        elif weak_var_name is None:
+            weak_var_name = decl.var_name
+
+    has_macro_strong = False
+    strong_var_name = None
+    for decl in strong_decls:
+        if decl.is_macro:
+            has_macro_strong = True
+        elif strong_var_name is None:
+            strong_var_name = decl.var_name
+
+    has_strong = bool(strong_decls)
+    return _DeclarationSummary(
+        has_weak=bool(weak_decls),
+        has_manual_weak=weak_var_name is not None,
+        has_macro_weak=has_macro_weak,
+        has_strong=has_strong,
+        has_macro_strong=has_macro_strong,
+        weak_var_name=weak_var_name,
+        strong_var_name=strong_var_name,
+        has_shadow_self=has_strong and (strong_var_name == 'self' or has_macro_strong),
+    )
+
+
+def _scan_block_chars(code: str, brace_stack: List[bool], pending_block: bool,
+                      block_param_depth: int) -> Tuple[bool, int]:
+    """
+    扫描一段代码，更新 block 作用域状态
+
+    brace_stack 原地更新（每个 { 记录其是否为 block 体），
+    返回更新后的 (pending_block, block_param_depth)。
+    字符串状态只在行内有效，因此调用方需按行调用。
+    """
+    in_string = False
+    escape_next = False
+
+    for char in code:
+        if escape_next:
+            escape_next = False
+            continue
+
+        if char == '\\':
+            escape_next = True
+            continue
+
+        if char == '"':
+            in_string = not in_string
+            continue
+
+        if in_string:
+            continue
+
+        if pending_block:
+            if char.isspace():
+                continue
+
+            if char == ')' and block_param_depth == 0:
+                pending_block = False
+                continue
+
+            if char == '(':
+                block_param_depth += 1
+                continue
+
+            if block_param_depth > 0:
+                if char == ')':
+                    block_param_depth = max(0, block_param_depth - 1)
+                continue
+
+        if char == '^':
+            pending_block = True
+            block_param_depth = 0
+            continue
+
+        if char == '{':
+            brace_stack.append(pending_block)
+            pending_block = False
+            block_param_depth = 0
+            continue
+
+        if char == '}':
+            if brace_stack:
+                brace_stack.pop()
+            pending_block = False
+            block_param_depth = 0
+            continue
+
+        if char == ';':
+            pending_block = False
+            block_param_depth = 0
+
+    return pending_block, block_param_depth
+
+
+def _scan_block_line(raw_line: str, brace_stack: List[bool], pending_block: bool,
+                     block_param_depth: int, scan_limit: Optional[int] = None,
+                     code_line: Optional[str] = None) -> Tuple[bool, int]:
+    """
+    按行扫描 block 作用域状态
+
+    scan_limit 为去掉行尾注释后的扫描长度上限；
+    code_line 为调用方已去掉行尾注释的同一行，传入时不再重复处理
+    """
+    # 不处于 block 参数声明中时，没有 { } ^ 的行不会改变扫描状态
+    if (not pending_block and '{' not in raw_line
+            and '}' not in raw_line and '^' not in raw_line):
+        return pending_block, block_param_depth
+    if code_line is None:
+        code_line = strip_line_comment(raw_line)
+    if scan_limit is not None:
+        code_line = code_line[:max(0, scan_limit)]
+    return _scan_block_chars(code_line, brace_stack, pending_block, block_param_depth)
+
+
+class _BlockScopeTracker:
+    """
+    单次 check 内的 block 作用域追踪器
+
+    check 按行号递增查询，同一方法内的扫描状态从上次位置继续推进，
+    整个文件每行最多扫描一次，而不是每个 self 使用都从方法开头重新扫描。
+    结果与从 method_start 行起逐行调用 _scan_block_line、当前行截断到 column 之前的
+    完整重扫一致（见 tests/test_rule_regressions.py）。
+    """
+
+    __slots__ = ("lines", "context", "method_start", "next_index", "brace_stack",
+                 "pending_block", "block_param_depth")
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.context = get_rule_context(lines)
+        self.method_start = 0
+        self.next_index = 0
+        self.brace_stack: List[bool] = []
+        self.pending_block = False
+        self.block_param_depth = 0
+
+    def is_in_block(self, line_num: int, column: int, method_start: int,
+                    code_line: Optional[str] = None) -> bool:
+        """检测指定位置是否位于 block 作用域内（code_line 为当前行去掉行尾注释后的内容）"""
+        if method_start != self.method_start or self.next_index > line_num - 1:
+            self.method_start = method_start
+            self.next_index = method_start - 1
+            self.brace_stack = []
+            self.pending_block = False
+            self.block_param_depth = 0
+
+        # 推进到当前行行首的状态
+        lines = self.lines
+        while self.next_index < line_num - 1:
+            raw_line = lines[self.next_index]
+            # 与 _scan_block_line 相同的预筛，命中时复用 RuleContext 中已去除注释的行
+            if (self.pending_block or '{' in raw_line
+                    or '}' in raw_line or '^' in raw_line):
+                self.pending_block, self.block_param_depth = _scan_block_line(
+                    raw_line, self.brace_stack, self.pending_block, self.block_param_depth,
+                    code_line=self.context.code_line(self.next_index)
+                )
+            self.next_index += 1
+
+        # 当前行只扫描到 column 之前，使用状态副本，不影响后续查询
+        brace_stack = list(self.brace_stack)
+        _scan_block_line(lines[line_num - 1], brace_stack, self.pending_block,
+                         self.block_param_depth, scan_limit=column - 1, code_line=code_line)
+        return any(brace_stack)
+
+
 class BlockRetainCycleRule(BaseRule):
     """Block 循环引用检查（合并 strong_self_in_block）"""
 
@@ -110,6 +296,16 @@ class BlockRetainCycleRule(BaseRule):
     # @strongify(self)
     STRONG_MACRO_PATTERN = re.compile(r'@strongify\s*\([^)]*\bself\b[^)]*\)')
 
+    # 四种声明各自必含的关键字，用于整文件预筛
+    DECLARATION_KEYWORDS = ('__weak', '__strong', '@weakify', '@strongify')
+
+    # 以上四种声明的合并模式：_find_self_usages 只需判断是否为声明行，一次扫描即可
+    DECLARATION_PATTERN = re.compile(
+        r'__weak\s+(?:typeof|__typeof|__typeof__)\s*\(\s*self\s*\)\s*\w+\s*=\s*self'
+        r'|__strong\s+(?:typeof|__typeof|__typeof__)\s*\(\s*(\w+)\s*\)\s*\w+\s*=\s*\1'
+        r'|@(?:weakify|strongify)\s*\([^)]*\bself\b[^)]*\)'
+    )
+
     # Block 开始检测：支持 ^{, ^(, ^ReturnType(, ^ReturnType { 等形式
     BLOCK_START_PATTERN = re.compile(r'\^\s*(?:[A-Za-z_]\w*\s*)?[\(\{]')
 
@@ -138,14 +334,41 @@ class BlockRetainCycleRule(BaseRule):
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
 
+        # 整个文件都不含 "elf" 时不可能有 self 相关问题
+        if 'elf' not in content:
+            return violations
+
+        # 文件级字面量预筛：不含 '^' 的文件不存在 block，只需检测 __block self 声明
+        has_blocks = '^' in content
+        if not has_blocks and '__block' not in content:
+            return violations
+
+        # 方法起始行表、block 开始行表与 weak/strong 声明在首次需要时整文件扫描一次，
+        # 避免每个 self 使用行都从方法开头重新向下扫描
+        method_starts: Optional[List[int]] = None
+        block_start_before: List[int] = []
+        block_tracker = _BlockScopeTracker(lines)
+        method_ranges = {}
+        all_weak_decls: List[WeakDeclaration] = []
+        all_strong_decls: List[StrongDeclaration] = []
+        weak_decl_lines: List[int] = []
+        strong_decl_lines: List[int] = []
+        # (weak 区间, strong 区间) -> 声明汇总；同一方法内相邻 self 使用行通常区间相同
+        decl_summaries = {}
+        # (方法起始行, block 开始行索引) -> block 调用上下文；同一 block 内的 self 使用行结果相同
+        block_contexts = {}
+        context = get_rule_context(lines)
+
         # 逐行分析
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
+        for line_num, line in self.iter_checked_lines(lines, changed_lines):
+            # 快速过滤：__block self 声明和 self/weakSelf/strongSelf 使用都必然包含 "elf"，
+            # 绝大多数代码行可在任何正则匹配之前跳过
+            if 'elf' not in line:
                 continue
 
             # 跳过注释行
             stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            if stripped.startswith(COMMENT_PREFIXES):
                 continue
 
             # 检测 __block self 声明（不需要在 block 内，声明本身就是问题）
@@ -162,35 +385,68 @@ class BlockRetainCycleRule(BaseRule):
                 ))
                 continue
 
+            if not has_blocks:
+                continue
+
+            # 行尾注释与字符串字面量在本行只处理一次，后续各步骤共用
+            code_line = context.code_line(line_num - 1)
+
             # 检测 self 使用
-            if not self._line_contains_self(line):
+            if not self._line_contains_self(line, code_line):
                 continue
 
             # 检测 self 的具体使用位置和类型
-            self_usages = self._find_self_usages(line)
+            check_line = self._strip_string_literals(code_line)
+            self_usages = self._find_self_usages(line, check_line)
             if not self_usages:
                 continue
 
+            if method_starts is None:
+                method_starts = self._build_method_starts(lines)
+                block_start_before = self._build_block_start_before(lines)
+                # 四种声明的关键字都不在文件中时无需逐行扫描
+                if any(keyword in content for keyword in self.DECLARATION_KEYWORDS):
+                    all_weak_decls, all_strong_decls = self._scan_declarations(lines)
+                weak_decl_lines = [d.line_num for d in all_weak_decls]
+                strong_decl_lines = [d.line_num for d in all_strong_decls]
+
+            # 获取当前方法的作用域
+            method_start = method_starts[line_num - 1]
+
             self_usages = [
                 (col, usage_type)
                 for col, usage_type in self_usages
-                if self._is_in_block_at_position(lines, line_num, col)
+                if block_tracker.is_in_block(line_num, col, method_start, code_line)
             ]
             if not self_usages:
                 continue
 
-            # 获取当前方法的作用域
-            method_start = self._find_method_start(lines, line_num)
-
-            # 在方法作用域内查找 weak/strong 声明
-            weak_decls = self._find_weak_declarations(lines, method_start, line_num)
-            strong_decls = self._find_strong_declarations(lines, method_start, line_num)
+            # 在方法作用域内查找 weak/strong 声明（weak 不含当前行，strong 含当前行）；
+            # 声明按行号有序，二分定位区间，文件内没有声明时直接为空
+            if all_weak_decls:
+                weak_lo = bisect_left(weak_decl_lines, method_start)
+                weak_hi = bisect_left(weak_decl_lines, line_num)
+            else:
+                weak_lo = weak_hi = 0
+            if all_strong_decls:
+                strong_lo = bisect_left(strong_decl_lines, method_start)
+                strong_hi = bisect_right(strong_decl_lines, line_num)
+            else:
+                strong_lo = strong_hi = 0
+            summary_key = (weak_lo, weak_hi, strong_lo, strong_hi)
+            decl_summary = decl_summaries.get(summary_key)
+            if decl_summary is None:
+                decl_summary = decl_summaries[summary_key] = _summarize_declarations(
+                    all_weak_decls[weak_lo:weak_hi], all_strong_decls[strong_lo:strong_hi]
+                )
 
-            # 获取 related_lines
-            related_lines = self.get_related_lines(file_path, line_num, lines)
+            # 获取 related_lines（即所在方法范围，同一方法只计算一次）
+            related_lines = method_ranges.get(method_start)
+            if related_lines is None:
+                related_lines = method_ranges[method_start] = get_method_range(lines, method_start)
 
             # 检测混用 warning
-            if self._has_mixed_usage(weak_decls):
+            if decl_summary.has_manual_weak and decl_summary.has_macro_weak:
                 violations.append(self.create_violation(
                     file_path=file_path,
                     line=line_num,
@@ -201,7 +457,13 @@ class BlockRetainCycleRule(BaseRule):
                 ))
 
             # 检测 block 调用上下文
-            block_context = self._get_block_context(lines, line_num)
+            block_start_idx = block_start_before[line_num - 1]
+            context_key = (method_start, block_start_idx)
+            block_context = block_contexts.get(context_key)
+            if block_context is None:
+                block_context = block_contexts[context_key] = self._get_block_context(
+                    lines, line_num, method_start, block_start_idx
+                )
 
             # 对每个 self 使用进行检查
             for col, usage_type in self_usages:
@@ -210,168 +472,112 @@ class BlockRetainCycleRule(BaseRule):
                     line_num=line_num,
                     column=col,
                     usage_type=usage_type,
-                    weak_decls=weak_decls,
-                    strong_decls=strong_decls,
+                    decl_summary=decl_summary,
                     block_context=block_context,
                     line=line,
                     lines=lines,
-                    related_lines=related_lines
+                    related_lines=related_lines,
+                    check_line=check_line
                 )
                 if violation:
                     violations.append(violation)
 
         return violations
 
-    def _line_contains_self(self, line: str) -> bool:
+    def _line_contains_self(self, line: str, code_line: Optional[str] = None) -> bool:
         """检查行是否包含 self（排除注释和字符串中的）"""
-        line_lower = strip_line_comment(line).lower()
+        if code_line is None:
+            code_line = strip_line_comment(line)
+        line_lower = code_line.lower()
         if 'self' not in line_lower:
             return False
         return True
 
-    def _is_in_block_at_position(self, lines: List[str], line_num: int, column: int) -> bool:
-        """检测指定位置是否位于 block 作用域内。"""
-        method_start = self._find_method_start(lines, line_num)
-        brace_stack = []
-        pending_block = False
-        block_param_depth = 0
-
-        for i in range(method_start - 1, line_num):
-            code_line = strip_line_comment(lines[i])
-            scan_limit = len(code_line)
-            if i == line_num - 1:
-                scan_limit = max(0, min(len(code_line), column - 1))
-
-            in_string = False
-            escape_next = False
-
-            for char in code_line[:scan_limit]:
-                if escape_next:
-                    escape_next = False
-                    continue
-
-                if char == '\\':
-                    escape_next = True
-                    continue
-
-                if char == '"':
-                    in_string = not in_string
-                    continue
-
-                if in_string:
-                    continue
-
-                if pending_block:
-                    if char.isspace():
-                        continue
-
-                    if char == ')' and block_param_depth == 0:
-                        pending_block = False
-                        continue
-
-                    if char == '(':
-                        block_param_depth += 1
-                        continue
-
-                    if block_param_depth > 0:
-                        if char == ')':
-                            block_param_depth = max(0, block_param_depth - 1)
-                        continue
-
-                if char == '^':
-                    pending_block = True
-                    block_param_depth = 0
-                    continue
-
-                if char == '{':
-                    brace_stack.append(pending_block)
-                    pending_block = False
-                    block_param_depth = 0
-                    continue
-
-                if char == '}':
-                    if brace_stack:
-                        brace_stack.pop()
-                    pending_block = False
-                    block_param_depth = 0
-                    continue
-
-                if char == ';':
-                    pending_block = False
-                    block_param_depth = 0
-
-        return any(brace_stack)
-
     def _find_method_start(self, lines: List[str], line_num: int) -> int:
         """查找当前行所属方法的起始行号"""
-        for i in range(line_num - 1, -1, -1):
-            if self.METHOD_START_PATTERN.match(lines[i].strip()):
-                return i + 1  # 返回 1-based 行号
-        return 1  # 如果找不到，返回文件开头
-
-    def _strip_comment(self, line: str) -> str:
-        """移除行尾注释"""
-        return strip_line_comment(line)
-
-    def _find_weak_declarations(self, lines: List[str], start_line: int, end_line: int) -> List[WeakDeclaration]:
-        """在指定范围内查找 weak 声明"""
-        declarations = []
-
-        for i in range(start_line - 1, end_line - 1):  # 转换为 0-based
-            line = self._strip_comment(lines[i])
+        method_start_lines = get_rule_context(lines).method_start_lines
+        index = bisect_right(method_start_lines, line_num)
+        return method_start_lines[index - 1] if index else 1  # 如果找不到，返回文件开头
+
+    def _build_method_starts(self, lines: List[str]) -> List[int]:
+        """一次扫描得到每一行所属方法的起始行号（与 _find_method_start 结果一致）"""
+        starts = []
+        current = 1
+        for i, is_method_start in enumerate(get_rule_context(lines).method_start_flags, 1):
+            if is_method_start:
+                current = i
+            starts.append(current)
+        return starts
+
+    def _scan_declarations(self, lines: List[str]) -> Tuple[List[WeakDeclaration], List[StrongDeclaration]]:
+        """扫描整个文件的 weak/strong 声明（按行号有序）"""
+        weak_decls = []
+        strong_decls = []
+        context = get_rule_context(lines)
+
+        for i, raw_line in enumerate(lines):
+            # manual 声明必含 typeof，宏声明必含 weakify/strongify，先做子串过滤；
+            # 仅以 '@' 过滤时 @"..." 字符串、@property 等行都会进入四次正则匹配
+            if 'typeof' not in raw_line and 'ify' not in raw_line:
+                continue
+            line = context.code_line(i)
 
             # 检测 manual weak
-            match = self.WEAK_MANUAL_PATTERN.search(line)
+            match = '__weak' in line and self.WEAK_MANUAL_PATTERN.search(line)
             if match:
-                declarations.append(WeakDeclaration(
+                weak_decls.append(WeakDeclaration(
                     line_num=i + 1,
                     var_name=match.group(1),
                     is_macro=False
                 ))
 
             # 检测 @weakify
-            if self.WEAK_MACRO_PATTERN.search(line):
-                declarations.append(WeakDeclaration(
+            if '@weakify' in line and self.WEAK_MACRO_PATTERN.search(line):
+                weak_decls.append(WeakDeclaration(
                     line_num=i + 1,
                     var_name='self_weak_',  # @weakify 生成的变量名
                     is_macro=True
                 ))
 
-        return declarations
-
-    def _find_strong_declarations(self, lines: List[str], start_line: int, end_line: int) -> List[StrongDeclaration]:
-        """在指定范围内查找 strong 声明"""
-        declarations = []
-
-        for i in range(start_line - 1, end_line):  # 转换为 0-based，包含当前行
-            line = self._strip_comment(lines[i])
-
             # 检测 manual strong
-            match = self.STRONG_MANUAL_PATTERN.search(line)
+            match = '__strong' in line and self.STRONG_MANUAL_PATTERN.search(line)
             if match:
-                declarations.append(StrongDeclaration(
+                strong_decls.append(StrongDeclaration(
                     line_num=i + 1,
                     var_name=match.group(2),
                     is_macro=False
                 ))
 
             # 检测 @strongify
-            if self.STRONG_MACRO_PATTERN.search(line):
-                declarations.append(StrongDeclaration(
+            if '@strongify' in line and self.STRONG_MACRO_PATTERN.search(line):
+                strong_decls.append(StrongDeclaration(
                     line_num=i + 1,
                     var_name='self',  # @strongify shadow self
                     is_macro=True
                 ))
 
-        return declarations
+        return weak_decls, strong_decls
 
-    def _has_mixed_usage(self, weak_decls: List[WeakDeclaration]) -> bool:
-        """检测是否混用 manual 和 macro"""
-        has_manual = any(not d.is_macro for d in weak_decls)
-        has_macro = any(d.is_macro for d in weak_decls)
-        return has_manual and has_macro
+    def _build_block_start_before(self, lines: List[str]) -> List[int]:
+        """
+        一次扫描得到每一行之前最近的 block 开始行索引（0-based，-1 表示没有）
 
-    def _get_block_context(self, lines: List[str], line_num: int) -> str:
+        遇到方法定义行即截断，与 _get_block_context 的向上查找结果一致
+        """
+        result = []
+        previous = -1
+        method_start_flags = get_rule_context(lines).method_start_flags
+        for i, line in enumerate(lines):
+            result.append(previous)
+            if method_start_flags[i]:
+                previous = -1
+            elif '^' in line and self.BLOCK_START_PATTERN.search(line):
+                previous = i
+        return result
+
+    def _get_block_context(self, lines: List[str], line_num: int,
+                           method_start: Optional[int] = None,
+                           block_start_idx: Optional[int] = None) -> str:
         """
         获取 block 的调用上下文
         返回: 'c_function' | 'class_method' | 'retain_class_method' | 'instance_method'
@@ -382,33 +588,35 @@ class BlockRetainCycleRule(BaseRule):
 
         retain_class_method: 类方法会持有 block（如 NSTimer），应升级为 error
         """
-        method_start = self._find_method_start(lines, line_num)
-
-        # 先找到 block 开始的行
-        block_start_line = None
-        block_start_idx = -1
-
-        for i in range(line_num - 2, method_start - 2, -1):
-            if i < 0:
-                break
-            line = lines[i]
-
-            # 如果遇到方法定义，停止搜索
-            if self.METHOD_START_PATTERN.match(line.strip()):
-                break
-
-            # 找到 block 开始的行
-            if self.BLOCK_START_PATTERN.search(line):
-                block_start_line = line
-                block_start_idx = i
-                break
-
-        if block_start_line is None:
+        if method_start is None:
+            method_start = self._find_method_start(lines, line_num)
+        # 方法定义行标记整文件只计算一次，向上查找时不再逐行 strip + 正则
+        method_start_flags = get_rule_context(lines).method_start_flags
+
+        # 先找到 block 开始的行（调用方已预先计算时直接使用）
+        if block_start_idx is None:
+            block_start_idx = -1
+            for i in range(line_num - 2, method_start - 2, -1):
+                if i < 0:
+                    break
+                line = lines[i]
+
+                # 如果遇到方法定义，停止搜索
+                if method_start_flags[i]:
+                    break
+
+                # 找到 block 开始的行
+                if self.BLOCK_START_PATTERN.search(line):
+                    block_start_idx = i
+                    break
+
+        if block_start_idx < 0:
             return 'instance_method'
+        block_start_line = lines[block_start_idx]
 
         # 只分析 block 开始那一行的调用上下文
-        # 检测 C 函数
-        if self.C_FUNCTION_PATTERN.search(block_start_line):
+        # 检测 C 函数（先做字面量过滤，绝大多数行不含 dispatch_）
+        if 'dispatch_' in block_start_line and self.C_FUNCTION_PATTERN.search(block_start_line):
             return 'c_function'
 
         # 检测类方法调用：[ClassName methodName:^{...}]
@@ -417,7 +625,7 @@ class BlockRetainCycleRule(BaseRule):
         block_match = self.BLOCK_START_PATTERN.search(block_start_line)
         if block_match:
             line_before_block = block_start_line[:block_match.start()]
-            class_match = self.CLASS_METHOD_PATTERN.search(line_before_block)
+            class_match = '[' in line_before_block and self.CLASS_METHOD_PATTERN.search(line_before_block)
             if class_match:
                 # 检查是否为嵌套调用：[[ClassName xxx] instanceMethod:]
                 # CLASS_METHOD_PATTERN 匹配的 [ 是内层的，如果它前面紧邻另一个 [
@@ -426,7 +634,7 @@ class BlockRetainCycleRule(BaseRule):
                 if prefix.endswith('['):
                     return 'instance_method'
                 # 检查是否为会持有 block 的类方法（如 NSTimer）
-                if self.RETAIN_BLOCK_CLASS_METHODS.search(block_start_line):
+                if 'NSTimer' in block_start_line and self.RETAIN_BLOCK_CLASS_METHODS.search(block_start_line):
                     return 'retain_class_method'
                 return 'class_method'
 
@@ -438,12 +646,12 @@ class BlockRetainCycleRule(BaseRule):
                 for j in range(block_start_idx - 1, method_start - 2, -1):
                     if j < 0:
                         break
-                    prev_line = lines[j]
-                    if self.METHOD_START_PATTERN.match(prev_line.strip()):
+                    if method_start_flags[j]:
                         break
-                    if self.C_FUNCTION_PATTERN.search(prev_line):
+                    prev_line = lines[j]
+                    if 'dispatch_' in prev_line and self.C_FUNCTION_PATTERN.search(prev_line):
                         return 'c_function'
-                    prev_class_match = self.CLASS_METHOD_PATTERN.search(prev_line)
+                    prev_class_match = '[' in prev_line and self.CLASS_METHOD_PATTERN.search(prev_line)
                     if prev_class_match:
                         prev_prefix = prev_line[:prev_class_match.start()].rstrip()
                         if prev_prefix.endswith('[[') or prev_prefix.endswith('[ ['):
@@ -457,33 +665,49 @@ class BlockRetainCycleRule(BaseRule):
     # 字符串字面量匹配（@"..." 或 "..."，支持转义引号）
     STRING_LITERAL_PATTERN = re.compile(r'@?"(?:[^"\\]|\\.)*"')
 
+    # self 及其 weak/strong 变体（self_weak_、weakSelf、strongSelf 等）
+    SELF_WORD_PATTERN = re.compile(r'(?<!\w)(self|self_weak_|\w*[sS]elf)\b')
+
+    # weak 变量被解引用：[weakSelf ...] 或 weakSelf. / weakSelf->
+    WEAK_MESSAGE_PATTERN = re.compile(r'\[\s*(?:self_weak_|\w*[sS]elf)\b')
+    WEAK_ACCESS_PATTERN = re.compile(r'\b(?:self_weak_|\w*[sS]elf)\s*(?:\.|->)')
+
     def _strip_string_literals(self, line: str) -> str:
         """移除字符串字面量内容，保留位置占位（避免列号偏移影响后续匹配）"""
         def _replace_with_spaces(m):
             return ' ' * len(m.group(0))
         return self.STRING_LITERAL_PATTERN.sub(_replace_with_spaces, line)
 
-    def _find_self_usages(self, line: str) -> List[Tuple[int, str]]:
+    def _find_self_usages(self, line: str, check_line: Optional[str] = None) -> List[Tuple[int, str]]:
         """
         查找行中所有 self 使用
         返回: [(column, usage_type), ...]
         usage_type: 'self' | 'weak_var' | 'strong_var' | 'self_weak_'
+
+        check_line 为已去掉行尾注释和字符串字面量内容的同一行，传入时不再重复处理
         """
-        usages = []
+        if check_line is None:
+            # 跳过注释部分，并移除字符串字面量中的内容（避免 @"self" 被误检）
+            check_line = self._strip_string_literals(strip_line_comment(line))
 
-        # 跳过注释部分
-        check_line = strip_line_comment(line)
+        return list(self._scan_self_usages(check_line))
 
-        # 移除字符串字面量中的内容（避免 @"self" 被误检）
-        check_line = self._strip_string_literals(check_line)
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _scan_self_usages(cls, check_line: str) -> Tuple[Tuple[int, str], ...]:
+        """
+        _find_self_usages 的纯函数部分，结果只取决于行内容
+
+        头文件与模板代码中大量重复行直接命中缓存，不再重复正则扫描
+        """
+        usages = []
 
         # 跳过 weak/strong 声明行（manual 和 macro）
-        if (self.WEAK_MANUAL_PATTERN.search(check_line) or self.STRONG_MANUAL_PATTERN.search(check_line)
-                or self.WEAK_MACRO_PATTERN.search(check_line) or self.STRONG_MACRO_PATTERN.search(check_line)):
-            return usages
+        if cls.DECLARATION_PATTERN.search(check_line):
+            return ()
 
         # 如果行包含 block 开始 (^{)，只检查 ^{ 之后的部分
-        block_start_match = self.BLOCK_START_PATTERN.search(check_line)
+        block_start_match = cls.BLOCK_START_PATTERN.search(check_line)
         if block_start_match:
             # 只检查 block 开始之后的部分
             check_line = check_line[block_start_match.end():]
@@ -492,7 +716,7 @@ class BlockRetainCycleRule(BaseRule):
             col_offset = 0
 
         # 查找 self 使用
-        for match in re.finditer(r'(?<!\w)(self|self_weak_|\w*[sS]elf)\b', check_line):
+        for match in cls.SELF_WORD_PATTERN.finditer(check_line):
             word = match.group(1)
             col = match.start(1) + 1 + col_offset
 
@@ -509,52 +733,71 @@ class BlockRetainCycleRule(BaseRule):
                 continue
 
             # 分类
-            if word == 'self':
-                usages.append((col, 'self'))
-            elif word == 'self_weak_':
-                usages.append((col, 'self_weak_'))
-            elif 'weak' in word.lower() or (word.startswith('w') and 'Self' in word):
-                usages.append((col, 'weak_var'))
-            elif 'strong' in word.lower() or (word.startswith('s') and 'Self' in word):
-                usages.append((col, 'strong_var'))
-
-        return usages
-
-    def _line_has_weak_dereference(self, line: str) -> bool:
+            kind = cls._classify_self_word(word)
+            if kind is not None:
+                usages.append((col, kind))
+
+        return tuple(usages)
+
+    # 常见 self 变体词 -> usage_type（只读静态表）；其余命名由 _classify_other_self_word 判断
+    _WORD_KIND = {
+        'self': 'self',
+        'self_weak_': 'self_weak_',
+        'weakSelf': 'weak_var',
+        'wSelf': 'weak_var',
+        'strongSelf': 'strong_var',
+        'sSelf': 'strong_var',
+    }
+
+    @classmethod
+    def _classify_self_word(cls, word: str) -> Optional[str]:
+        """判断 self 变体词的使用类型（None 表示不属于任何一类）"""
+        kind = cls._WORD_KIND.get(word)
+        if kind is not None:
+            return kind
+        return cls._classify_other_self_word(word)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _classify_other_self_word(word: str) -> Optional[str]:
+        """静态表之外的命名按规则判断，结果有界缓存"""
+        if 'weak' in word.lower() or (word.startswith('w') and 'Self' in word):
+            return 'weak_var'
+        if 'strong' in word.lower() or (word.startswith('s') and 'Self' in word):
+            return 'strong_var'
+        return None
+
+    def _line_has_weak_dereference(self, line: str, check_line: Optional[str] = None) -> bool:
         """weak/self_weak_ 只有在被真正解引用时才需要 strongify。"""
-        check_line = self._strip_string_literals(strip_line_comment(line))
+        if check_line is None:
+            check_line = self._strip_string_literals(strip_line_comment(line))
         return bool(
-            re.search(r'\[\s*(?:self_weak_|\w*[sS]elf)\b', check_line) or
-            re.search(r'\b(?:self_weak_|\w*[sS]elf)\s*(?:\.|->)', check_line)
+            self.WEAK_MESSAGE_PATTERN.search(check_line) or
+            self.WEAK_ACCESS_PATTERN.search(check_line)
         )
 
     def _check_self_usage(self, file_path: str, line_num: int, column: int,
-                          usage_type: str, weak_decls: List[WeakDeclaration],
-                          strong_decls: List[StrongDeclaration],
+                          usage_type: str, decl_summary: _DeclarationSummary,
                           block_context: str, line: str,
                           lines: List[str],
-                          related_lines: Tuple[int, int]) -> Optional[Violation]:
+                          related_lines: Tuple[int, int],
+                          check_line: Optional[str] = None) -> Optional[Violation]:
         """
         检查单个 self 使用是否违规
 
         Returns:
             Violation 或 None
         """
-        has_manual_weak = any(not d.is_macro for d in weak_decls)
-        has_macro_weak = any(d.is_macro for d in weak_decls)
-        has_weak = len(weak_decls) > 0
+        has_manual_weak = decl_summary.has_manual_weak
+        has_macro_weak = decl_summary.has_macro_weak
+        has_weak = decl_summary.has_weak
 
-        has_manual_strong = any(not d.is_macro for d in strong_decls)
-        has_macro_strong = any(d.is_macro for d in strong_decls)
-        has_strong = len(strong_decls) > 0
+        has_macro_strong = decl_summary.has_macro_strong
+        has_strong = decl_summary.has_strong
 
         # 检查是否存在 shadow self（manual 或 macro）
         # shadow self 意味着 self 已被重定义为局部变量，不会导致循环引用
-        has_shadow_self = False
-        if has_strong:
-            manual_strong_name = next((d.var_name for d in strong_decls if not d.is_macro), None)
-            if manual_strong_name == 'self' or has_macro_strong:
-                has_shadow_self = True
+        has_shadow_self = decl_summary.has_shadow_self
 
         # 规则 0: C 函数中的 block -> WARNING 或不检测
         if block_context == 'c_function':
@@ -617,8 +860,8 @@ class BlockRetainCycleRule(BaseRule):
 
         # 规则 3: 使用 manual weak 方式
         if has_manual_weak:
-            weak_var_name = next((d.var_name for d in weak_decls if not d.is_macro), None)
-            strong_var_name = next((d.var_name for d in strong_decls if not d.is_macro), None)
+            weak_var_name = decl_summary.weak_var_name
+            strong_var_name = decl_summary.strong_var_name
 
             if usage_type == 'self':
                 # 如果 strong 声明的变量名就是 self（如 __strong typeof(weakSelf) self = weakSelf），
@@ -653,7 +896,7 @@ class BlockRetainCycleRule(BaseRule):
                     )
 
             elif usage_type == 'weak_var':
-                if not self._line_has_weak_dereference(line):
+                if not self._line_has_weak_dereference(line, check_line):
                     return None
                 # 使用 weak 变量
                 if has_strong:
@@ -700,7 +943,7 @@ class BlockRetainCycleRule(BaseRule):
                     )
 
             elif usage_type == 'self_weak_':
-                if not self._line_has_weak_dereference(line):
+                if not self._line_has_weak_dereference(line, check_line):
                     return None
                 # 使用 self_weak_ -> WARNING (建议用 @strongify)
                 return self.create_violation(
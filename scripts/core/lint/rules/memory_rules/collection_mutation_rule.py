@@ -5,10 +5,16 @@ import re
 from typing import List, Set
 
 from ..base_rule import BaseRule
-from ..rule_utils import SAFE_VALUE_PATTERNS, find_matching_brace, strip_line_comment
+from ..rule_context import get_rule_context
+from ..rule_utils import COMMENT_PREFIXES, SAFE_CONSTRUCTOR_PATTERN, SAFE_VALUE_PATTERN, find_matching_brace
 from core.lint.reporter import Violation, Severity, ViolationType
 
 
+# 三目运算符分支中可视为安全的 key / 值字面量
+_SAFE_KEY_ALTERNATION = r'@"[^"]*"|k[A-Z]\w*|[A-Z][A-Z0-9_]+|NS\w+'
+_SAFE_LITERAL_ALTERNATION = r'@"[^"]*"|@\d+\.?\d*|@\([^)]+\)|@YES|@NO|@\{[^}]*\}|@\[[^\]]*\]'
+
+
 # SubType 定义
 class SubType:
     """collection_mutation 规则的子类型"""
@@ -93,24 +99,53 @@ class CollectionMutationRule(BaseRule):
         r'\[\s*(\S+)\s+replaceObjectAtIndex\s*:\s*\S+\s+withObject\s*:\s*([^\]]+)\s*\]'
     )
 
+    # 变量声明行: NSArray *arr = ...、__weak Foo *x = ...
+    VARIABLE_DECLARATION_PATTERN = re.compile(r'^\s*(NS\w+|__strong|__weak)\s*\*')
+
+    # 安全的字典 key：字符串字面量、常量（k 开头驼峰或全大写）、系统常量（NS 开头）
+    SAFE_KEY_PATTERN = re.compile(r'^(?:@".*"|k[A-Z]\w*|[A-Z][A-Z0-9_]+|NS\w+)$')
+
+    # 三目运算符：Elvis（x ?: safe）与标准三目（cond ? safe : safe）
+    SAFE_KEY_ELVIS_PATTERN = re.compile(r'\?\s*:\s*(' + _SAFE_KEY_ALTERNATION + r')\s*$')
+    SAFE_KEY_TERNARY_PATTERN = re.compile(
+        r'\?\s*(' + _SAFE_KEY_ALTERNATION + r')\s*:\s*(' + _SAFE_KEY_ALTERNATION + r')\s*$'
+    )
+    SAFE_LITERAL_ELVIS_PATTERN = re.compile(r'\?\s*:\s*(' + _SAFE_LITERAL_ALTERNATION + r')\s*$')
+    SAFE_LITERAL_TERNARY_PATTERN = re.compile(
+        r'\?\s*(' + _SAFE_LITERAL_ALTERNATION + r')\s*:\s*(' + _SAFE_LITERAL_ALTERNATION + r')\s*$'
+    )
+
+    # 本地 C 函数：函数名提取、return 语句、可确定非空的返回表达式
+    FUNCTION_NAME_PATTERN = re.compile(r'(\w+)\s*\([^()]*\)\s*$')
+    RETURN_PATTERN = re.compile(r'\breturn\s+(.+?)\s*;')
+    FUNCTION_CALL_PATTERN = re.compile(r'^([A-Za-z_]\w*)\s*\(.*\)$')
+
+    # 强转: (ClassName *)var
+    CAST_PATTERN = re.compile(r'^\(\s*([A-Za-z_]\w*)\s*\*\s*\)\s*([A-Za-z_]\w*)$')
+
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         del content  # unused
         violations = []
-        self._safe_local_functions = self._collect_safe_local_functions(lines)
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
+        for line_num, line in self.iter_checked_lines(lines, changed_lines):
+            # 下标赋值与消息发送都必含 '['，绝大多数行在此直接跳过
+            if '[' not in line:
                 continue
 
             # 跳过注释行
             stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            if stripped.startswith(COMMENT_PREFIXES):
                 continue
 
             # 移除行尾注释
             comment_pos = line.find('//')
             check_line = line[:comment_pos] if comment_pos != -1 else line
 
+            # 下标赋值必含 '='，三种方法调用必含 "Object"，两者都没有的行不会命中任何模式
+            has_assign = '=' in check_line
+            if not has_assign and 'Object' not in check_line:
+                continue
+
             # 跳过变量声明行（如 NSArray *arr = @[...]）
             if self._is_variable_declaration(check_line):
                 continue
@@ -118,8 +153,12 @@ class CollectionMutationRule(BaseRule):
             # 获取 related_lines（单行）
             related_lines = self.get_related_lines(file_path, line_num, lines)
 
+            # 两种数组下标模式能匹配的文本，字典下标模式同样能匹配：先用字典下标模式
+            # 做一次搜索，未命中时三种下标赋值都不可能存在
+            subscript_match = has_assign and self.DICT_SUBSCRIPT_PATTERN.search(check_line)
+
             # 1. 检测数组数字下标赋值（错误用法）
-            array_match = self.ARRAY_SUBSCRIPT_PATTERN.search(check_line)
+            array_match = subscript_match and self.ARRAY_SUBSCRIPT_PATTERN.search(check_line)
             if array_match:
                 violations.append(self.create_violation(
                     file_path=file_path,
@@ -132,7 +171,7 @@ class CollectionMutationRule(BaseRule):
                 continue  # 跳过后续检测，避免重复报告
 
             # 2. 检测数组变量下标赋值（警告用法）
-            array_var_match = self.ARRAY_VAR_SUBSCRIPT_PATTERN.search(check_line)
+            array_var_match = subscript_match and self.ARRAY_VAR_SUBSCRIPT_PATTERN.search(check_line)
             if array_var_match:
                 var_name = array_var_match.group(1)
                 index_var = array_var_match.group(2)
@@ -148,7 +187,7 @@ class CollectionMutationRule(BaseRule):
                 continue  # 跳过后续检测，避免重复报告
 
             # 3. 检测字典下标赋值
-            dict_match = self.DICT_SUBSCRIPT_PATTERN.search(check_line)
+            dict_match = subscript_match
             if dict_match:
                 key = dict_match.group(2).strip()
                 if not self._is_safe_key(key):
@@ -163,7 +202,7 @@ class CollectionMutationRule(BaseRule):
                     ))
 
             # 4. 检测 addObject:
-            add_match = self.ADD_OBJECT_PATTERN.search(check_line)
+            add_match = 'addObject' in check_line and self.ADD_OBJECT_PATTERN.search(check_line)
             if add_match:
                 value = add_match.group(2).strip()
                 if not self._is_safe_value(value, line_num, lines):
@@ -178,7 +217,7 @@ class CollectionMutationRule(BaseRule):
                     ))
 
             # 5. 检测 insertObject:atIndex:
-            insert_match = self.INSERT_OBJECT_PATTERN.search(check_line)
+            insert_match = 'insertObject' in check_line and self.INSERT_OBJECT_PATTERN.search(check_line)
             if insert_match:
                 value = insert_match.group(2).strip()
                 if not self._is_safe_value(value, line_num, lines):
@@ -193,7 +232,9 @@ class CollectionMutationRule(BaseRule):
                     ))
 
             # 6. 检测 replaceObjectAtIndex:withObject:
-            replace_match = self.REPLACE_OBJECT_PATTERN.search(check_line)
+            replace_match = (
+                'replaceObjectAtIndex' in check_line and self.REPLACE_OBJECT_PATTERN.search(check_line)
+            )
             if replace_match:
                 value = replace_match.group(2).strip()
                 if not self._is_safe_value(value, line_num, lines):
@@ -212,23 +253,14 @@ class CollectionMutationRule(BaseRule):
     def _is_variable_declaration(self, line: str) -> bool:
         """检查是否是变量声明行"""
         # 匹配类型声明模式: NSArray *, NSDictionary *, NSMutableArray * 等
-        decl_pattern = re.compile(r'^\s*(NS\w+|__strong|__weak)\s*\*')
-        return bool(decl_pattern.search(line))
+        return bool(self.VARIABLE_DECLARATION_PATTERN.search(line))
 
     def _is_safe_key(self, key: str) -> bool:
         """检查字典 key 是否安全"""
         key = key.strip()
 
-        # 字符串字面量是安全的
-        if re.match(r'^@".*"$', key):
-            return True
-
-        # 常量（全大写或以 k 开头的驼峰）通常是安全的
-        if re.match(r'^k[A-Z]\w*$', key) or re.match(r'^[A-Z][A-Z0-9_]+$', key):
-            return True
-
-        # 系统常量（NS 开头的常量）
-        if re.match(r'^NS\w+$', key):
+        # 字符串字面量、常量（全大写或以 k 开头的驼峰）、系统常量（NS 开头）一次匹配
+        if self.SAFE_KEY_PATTERN.match(key):
             return True
 
         # 检查三目运算符（Elvis 或标准三目）
@@ -239,18 +271,15 @@ class CollectionMutationRule(BaseRule):
 
     def _check_ternary_safe_key(self, key: str) -> bool:
         """检查三目运算符作为 key 的安全性"""
-        # 安全的 key 模式：字符串字面量、常量等
-        safe_key_pattern = r'@"[^"]*"|k[A-Z]\w*|[A-Z][A-Z0-9_]+|NS\w+'
-
         # Elvis 运算符: someValue ?: @"default"
         # 只需检查 default 值是否是安全的 key
-        elvis_match = re.search(r'\?\s*:\s*(' + safe_key_pattern + r')\s*$', key)
+        elvis_match = self.SAFE_KEY_ELVIS_PATTERN.search(key)
         if elvis_match:
             return True
 
         # 标准三目: cond ? trueKey : falseKey
         # 两个分支都必须是安全的 key 值
-        ternary_match = re.search(r'\?\s*(' + safe_key_pattern + r')\s*:\s*(' + safe_key_pattern + r')\s*$', key)
+        ternary_match = self.SAFE_KEY_TERNARY_PATTERN.search(key)
         if ternary_match:
             return True
 
@@ -263,16 +292,15 @@ class CollectionMutationRule(BaseRule):
         if not value:
             return True
 
-        # 使用 rule_utils 中的 SAFE_VALUE_PATTERNS
-        for pattern in SAFE_VALUE_PATTERNS:
-            if pattern.match(value):
-                return True
+        # 使用 rule_utils 中的 SAFE_VALUE_PATTERN
+        if SAFE_VALUE_PATTERN.match(value):
+            return True
 
         # 检查三目运算符
         if '?' in value:
             return self._check_ternary_safe(value)
 
-        if self._is_safe_function_call(value):
+        if self._is_safe_function_call(value, lines):
             return True
 
         if self._is_guarded_cast_value(value, line_num, lines):
@@ -282,17 +310,15 @@ class CollectionMutationRule(BaseRule):
 
     def _check_ternary_safe(self, value: str) -> bool:
         """检查三目运算符的安全性"""
-        literal_pattern = r'@"[^"]*"|@\d+\.?\d*|@\([^)]+\)|@YES|@NO|@\{[^}]*\}|@\[[^\]]*\]'
-
         # Elvis 运算符: someValue ?: @"default"
         # 只需检查 default 值是否安全
-        elvis_match = re.search(r'\?\s*:\s*(' + literal_pattern + r')\s*$', value)
+        elvis_match = self.SAFE_LITERAL_ELVIS_PATTERN.search(value)
         if elvis_match:
             return True
 
         # 标准三目: cond ? trueValue : falseValue
         # 两个分支都必须是安全的字面量
-        ternary_match = re.search(r'\?\s*(' + literal_pattern + r')\s*:\s*(' + literal_pattern + r')\s*$', value)
+        ternary_match = self.SAFE_LITERAL_TERNARY_PATTERN.search(value)
         if ternary_match:
             return True
 
@@ -301,17 +327,18 @@ class CollectionMutationRule(BaseRule):
     def _collect_safe_local_functions(self, lines: List[str]) -> Set[str]:
         """收集当前文件内可确定返回非空对象的 C 函数。"""
         safe_functions = set()
+        code_lines = get_rule_context(lines).code_lines
         line_num = 1
 
         while line_num <= len(lines):
-            code_line = strip_line_comment(lines[line_num - 1]).strip()
+            code_line = code_lines[line_num - 1].strip()
             if not self.FUNCTION_START_PATTERN.match(code_line):
                 line_num += 1
                 continue
 
             signature_end = line_num
             while signature_end <= len(lines):
-                code = strip_line_comment(lines[signature_end - 1])
+                code = code_lines[signature_end - 1]
                 if '{' in code or ';' in code:
                     break
                 signature_end += 1
@@ -320,15 +347,13 @@ class CollectionMutationRule(BaseRule):
                 break
 
             signature_text = " ".join(s.strip() for s in lines[line_num - 1:signature_end])
-            if ';' in strip_line_comment(lines[signature_end - 1]):
+            if ';' in code_lines[signature_end - 1]:
                 line_num = signature_end + 1
                 continue
 
             function_name = self._extract_function_name(signature_text)
             function_end = find_matching_brace(lines, signature_end, '{', '}')
-            function_lines = lines[signature_end - 1:function_end]
-
-            if function_name and self._function_returns_safe_value(function_lines):
+            if function_name and self._function_returns_safe_value(code_lines[signature_end - 1:function_end]):
                 safe_functions.add(function_name)
 
             line_num = max(signature_end + 1, function_end + 1)
@@ -337,42 +362,45 @@ class CollectionMutationRule(BaseRule):
 
     def _extract_function_name(self, signature_text: str) -> str:
         signature_body = signature_text.split('{', 1)[0].strip()
-        match = re.search(r'(\w+)\s*\([^()]*\)\s*$', signature_body)
+        match = self.FUNCTION_NAME_PATTERN.search(signature_body)
         return match.group(1) if match else ""
 
-    def _function_returns_safe_value(self, function_lines: List[str]) -> bool:
+    def _function_returns_safe_value(self, code_lines: List[str]) -> bool:
         return_exprs = []
-        for line in function_lines:
-            code = strip_line_comment(line).strip()
+        for line in code_lines:
+            code = line.strip()
             if not code:
                 continue
-            return_match = re.search(r'\breturn\s+(.+?)\s*;', code)
+            return_match = self.RETURN_PATTERN.search(code)
             if return_match:
                 return_exprs.append(return_match.group(1).strip())
 
         return bool(return_exprs) and all(self._is_safe_return_expr(expr) for expr in return_exprs)
 
     def _is_safe_return_expr(self, expr: str) -> bool:
-        for pattern in SAFE_VALUE_PATTERNS:
-            if pattern.match(expr):
-                return True
-        if re.match(r'^\[\s*[\w.]+\s+new\s*\]$', expr):
-            return True
-        if re.match(r'^\[\[\s*[\w.]+\s+alloc\s*\]\s*init(?:[A-Z]\w*)?:?.*\]$', expr):
-            return True
-        if re.match(r'^\[\s*[\w.]+\s+(?:copy|mutableCopy)\s*\]$', expr):
-            return True
-        return False
+        return bool(SAFE_VALUE_PATTERN.match(expr) or SAFE_CONSTRUCTOR_PATTERN.match(expr))
+
+    def _get_safe_local_functions(self, lines: List[str]) -> Set[str]:
+        """
+        获取当前文件内可确定返回非空对象的 C 函数
+
+        只在遇到函数调用形式的值时才扫描整个文件，结果存放在线程独享的 RuleContext 中
+        """
+        data = get_rule_context(lines).rule_data(self.identifier)
+        safe_functions = data.get('safe_functions')
+        if safe_functions is None:
+            safe_functions = data['safe_functions'] = self._collect_safe_local_functions(lines)
+        return safe_functions
 
-    def _is_safe_function_call(self, value: str) -> bool:
-        match = re.match(r'^([A-Za-z_]\w*)\s*\(.*\)$', value)
+    def _is_safe_function_call(self, value: str, lines: List[str]) -> bool:
+        match = self.FUNCTION_CALL_PATTERN.match(value)
         if not match:
             return False
-        return match.group(1) in getattr(self, '_safe_local_functions', set())
+        return match.group(1) in self._get_safe_local_functions(lines)
 
     def _is_guarded_cast_value(self, value: str, line_num: int, lines: List[str]) -> bool:
         """识别在 isKindOfClass 保护下的安全强转。"""
-        cast_match = re.match(r'^\(\s*([A-Za-z_]\w*)\s*\*\s*\)\s*([A-Za-z_]\w*)$', value)
+        cast_match = self.CAST_PATTERN.match(value)
         if not cast_match:
             return False
 
@@ -382,9 +410,10 @@ class CollectionMutationRule(BaseRule):
             rf'\[\s*{re.escape(var_name)}\s+isKindOfClass:\s*\[\s*{re.escape(class_name)}\s+class\s*\]\s*\]'
         )
 
+        context = get_rule_context(lines)
         start_line = max(0, line_num - 4)
         for i in range(start_line, line_num - 1):
-            if guard_pattern.search(strip_line_comment(lines[i])):
+            if guard_pattern.search(context.code_line(i)):
                 return True
 
         return False
@@ -5,6 +5,7 @@ import re
 from typing import List, Set
 
 from ..base_rule import BaseRule
+from ..rule_utils import COMMENT_PREFIXES
 from core.lint.reporter import Violation, ViolationType
 
 
@@ -39,16 +40,12 @@ class DictUsageRule(BaseRule):
     )
 
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
-        del content  # unused
         violations = []
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
-                continue
-
+        for line_num, line in self.iter_lines_containing(content, lines, changed_lines, 'setObject'):
             # 跳过注释行
             stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            if stripped.startswith(COMMENT_PREFIXES):
                 continue
 
             # 移除行尾注释
@@ -2,7 +2,8 @@
 Weak Delegate Rule - delegate 应使用 weak 属性
 """
 import re
-from typing import List, Set, Tuple
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
 
 from ..base_rule import BaseRule
 from ..rule_utils import find_statement_end, get_property_range
@@ -41,48 +42,64 @@ class WeakDelegateRule(BaseRule):
     PROPERTY_START_PATTERN = re.compile(r'@property\s*\(')
     # delegate 属性名模式（在完整声明中匹配）
     DELEGATE_NAME_PATTERN = re.compile(r'\b(\w*[dD]elegate)\s*;')
+    # @property 修饰符提取模式
+    PROPERTY_MODIFIERS_PATTERN = re.compile(r'@property\s*\(([^)]*)\)')
+
+    # 整文件扫描用：与逐行匹配 PROPERTY_START_PATTERN 等价（空白不跨行）
+    PROPERTY_START_CONTENT_PATTERN = re.compile(r'@property[^\S\n]*\(')
 
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
 
-        line_num = 1
-        while line_num <= len(lines):
-            line = lines[line_num - 1]
+        next_line = 1
+        property_starts = self.iter_match_line_numbers(
+            content, lines, self.PROPERTY_START_CONTENT_PATTERN, self.PROPERTY_START_PATTERN
+        )
+        for property_start in property_starts:
+            # 跳过已作为上一个多行属性声明一部分处理过的行
+            if property_start < next_line:
+                continue
+
+            # 通过 get_related_lines 获取属性声明范围
+            related_lines = self.get_related_lines(file_path, property_start, lines)
+            property_end = related_lines[1]
+
+            # 合并多行属性声明
+            full_declaration = ' '.join(
+                lines[i].strip() for i in range(property_start - 1, property_end)
+            )
 
-            # 检测 @property 开始
-            if self.PROPERTY_START_PATTERN.search(line):
-                property_start = line_num
-                # 通过 get_related_lines 获取属性声明范围
-                related_lines = self.get_related_lines(file_path, property_start, lines)
-                property_end = related_lines[1]
+            # 检查是否是 delegate 属性，并提取修饰符
+            parsed = self._parse_delegate_declaration(full_declaration)
+            if parsed:
+                prop_name, modifiers = parsed
 
-                # 合并多行属性声明
-                full_declaration = ' '.join(
-                    lines[i].strip() for i in range(property_start - 1, property_end)
+                # 检查修饰符
+                violation = self._check_modifiers(
+                    file_path, property_start, prop_name, modifiers, lines, related_lines
                 )
+                if violation:
+                    violations.append(violation)
 
-                # 检查是否是 delegate 属性
-                name_match = self.DELEGATE_NAME_PATTERN.search(full_declaration)
-                if name_match:
-                    prop_name = name_match.group(1)
+            next_line = property_end + 1
 
-                    # 提取修饰符
-                    modifier_match = re.search(r'@property\s*\(([^)]*)\)', full_declaration)
-                    if modifier_match:
-                        modifiers = modifier_match.group(1).lower()
-
-                        # 检查修饰符
-                        violation = self._check_modifiers(
-                            file_path, property_start, prop_name, modifiers, lines, related_lines
-                        )
-                        if violation:
-                            violations.append(violation)
+        return violations
 
-                line_num = property_end + 1
-            else:
-                line_num += 1
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _parse_delegate_declaration(cls, full_declaration: str) -> Optional[Tuple[str, str]]:
+        """
+        解析 delegate 属性声明，返回 (属性名, 小写修饰符)；非 delegate 属性或无修饰符返回 None
 
-        return violations
+        结果只取决于声明文本，重复的属性声明直接命中缓存
+        """
+        name_match = cls.DELEGATE_NAME_PATTERN.search(full_declaration)
+        if not name_match:
+            return None
+        modifier_match = cls.PROPERTY_MODIFIERS_PATTERN.search(full_declaration)
+        if not modifier_match:
+            return None
+        return name_match.group(1), modifier_match.group(1).lower()
 
     def _check_modifiers(self, file_path: str, line: int, prop_name: str,
                          modifiers: str, lines: List[str], related_lines: Tuple[int, int]) -> Violation:
@@ -2,18 +2,37 @@
 Wrapper Empty Pointer Rule - 容器字面量空指针检查
 """
 import re
-from typing import List, Set, Optional, Tuple
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterator, List, Set, Optional, Pattern, Tuple
 
 from ..base_rule import BaseRule
+from ..rule_context import get_rule_context
 from ..rule_utils import (
-    SAFE_VALUE_PATTERNS,
+    COMMENT_PREFIXES,
+    SAFE_CONSTRUCTOR_PATTERN,
+    SAFE_VALUE_PATTERN,
     find_matching_brace,
     is_comment_line,
-    strip_line_comment,
 )
 from core.lint.reporter import Violation, ViolationType
 
 
+# 括号 -> 嵌套深度变化
+_NESTING_DELTA = {'(': 1, '[': 1, '{': 1, ')': -1, ']': -1, '}': -1}
+
+
+@lru_cache(maxsize=None)
+def _token_pattern(chars: str) -> Pattern:
+    """
+    逐字符扫描用的 token 模式：转义序列、双引号以及 chars 中的字符
+
+    finditer 在 C 层跳过其余字符，Python 循环只处理 token，
+    结果与逐字符维护 in_string / escape_next 状态一致。
+    """
+    return re.compile(r'\\.?|"|[' + re.escape(chars) + ']', re.S)
+
+
 # SubType 定义
 class SubType:
     """wrapper_empty_pointer 规则的子类型"""
@@ -23,6 +42,45 @@ class SubType:
     )
 
 
+class _LineIndex:
+    """
+    单个文件的行级索引（按需构建）
+
+    - 括号差值前缀和：brace_prefix[k] 为前 k 行 '}' 与 '{' 个数之差的累计，
+      任意行区间的括号平衡为两个前缀值之差
+    - 含 @{ / @[ 的行下标（有序），向上查找容器开始行时二分定位
+    - 每行所属方法 / C 函数的起始行号
+    """
+
+    __slots__ = ("lines", "brace_prefix", "bracket_prefix", "container_lines", "scope_starts")
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.brace_prefix: Optional[List[int]] = None
+        self.bracket_prefix: Optional[List[int]] = None
+        self.container_lines: List[int] = []
+        self.scope_starts: Optional[List[int]] = None
+
+    def build_container_tables(self):
+        brace_prefix = [0]
+        bracket_prefix = [0]
+        container_lines = []
+        brace_total = 0
+        bracket_total = 0
+        for i, line in enumerate(self.lines):
+            if '{' in line or '}' in line:
+                brace_total += line.count('}') - line.count('{')
+            if '[' in line or ']' in line:
+                bracket_total += line.count(']') - line.count('[')
+            brace_prefix.append(brace_total)
+            bracket_prefix.append(bracket_total)
+            if '@{' in line or '@[' in line:
+                container_lines.append(i)
+        self.brace_prefix = brace_prefix
+        self.bracket_prefix = bracket_prefix
+        self.container_lines = container_lines
+
+
 class WrapperEmptyPointerRule(BaseRule):
     """容器字面量空指针检查
 
@@ -38,19 +96,58 @@ class WrapperEmptyPointerRule(BaseRule):
     FUNCTION_START_PATTERN = re.compile(
         r'^\s*(?:static\s+)?(?:const\s+)?[A-Za-z_]\w*(?:\s*<[^>]+>)?\s*\*\s*\w+\s*\([^;]*\)'
     )
-    SAFE_CONSTRUCTOR_PATTERNS = [
-        re.compile(r'^\[\s*[\w.]+\s+new\s*\]$'),
-        re.compile(r'^\[\[\s*[\w.]+\s+alloc\s*\]\s*init(?:[A-Z]\w*)?:?.*\]$'),
-        re.compile(r'^\[\s*[\w.]+\s+(?:copy|mutableCopy)\s*\]$'),
-    ]
+    # 逗号/冒号切分用的词法单元：转义对、字符串字面量（可能未闭合）、括号与分隔符，
+    # 由 re 在 C 层完成逐字符扫描，Python 层只处理这些结构性 token
+    NESTING_TOKEN_PATTERN = re.compile(r'\\.|"(?:[^"\\]|\\.)*"?|[()\[\]{},:]', re.S)
+    # 单行字面量闭合查找：只匹配同类括号
+    LITERAL_BRACKET_PATTERNS = {
+        '{': re.compile(r'[{}]'),
+        '[': re.compile(r'[\[\]]'),
+    }
+    # 消息片段（以 selector 关键字开头，如 "defaultText:@\"\""）
+    SELECTOR_FRAGMENT_PATTERN = re.compile(r'^[A-Za-z_]\w*\s*:')
+    SELECTOR_KEYWORD_PATTERN = re.compile(r'([A-Za-z_]\w*)\s*:')
+    FUNCTION_NAME_PATTERN = re.compile(r'(\w+)\s*\([^()]*\)\s*$')
+    # 方法体扫描：局部变量声明、赋值与 return 语句
+    LOCAL_DECLARATION_PATTERN = re.compile(r'\*\s*(\w+)\s*=\s*(.+?)\s*;')
+    LOCAL_ASSIGNMENT_PATTERN = re.compile(r'^\s*(\w+)\s*=\s*(.+?)\s*;$')
+    RETURN_PATTERN = re.compile(r'\breturn\s+(.+?)\s*;')
+    MESSAGE_RECEIVER_PATTERN = re.compile(r'^(self|super|\w*[sS]elf)\b')
+    FUNCTION_CALL_PATTERN = re.compile(r'^([A-Za-z_]\w*)\s*\(.*\)$')
+    IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_]\w*$')
+
+    def _get_file_data(self, lines: List[str]) -> dict:
+        """
+        当前文件的规则私有数据（存放在线程独享的 RuleContext 中，不写到共享的规则实例上）
+
+        - 'line_index': 行级索引
+        - 'methods' / 'functions': 可确定返回非空对象的方法 selector 与 C 函数
+        """
+        return get_rule_context(lines).rule_data(self.identifier)
+
+    def _get_line_index(self, lines: List[str]) -> _LineIndex:
+        """获取当前文件的行级索引"""
+        data = self._get_file_data(lines)
+        index = data.get('line_index')
+        if index is None:
+            index = data['line_index'] = _LineIndex(lines)
+        return index
 
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
-        self._safe_local_methods = self._collect_safe_local_methods(lines)
-        self._safe_local_functions = self._collect_safe_local_functions(lines)
+
+        # 文件中没有任何容器字面量时，跳过安全方法/函数收集等整文件扫描
+        if '@{' not in content and '@[' not in content:
+            return violations
+
+        # 先收集方法再收集函数，收集过程中尚未确定的集合按空集处理
+        safe_locals = self._get_file_data(lines)
+        if 'functions' not in safe_locals:
+            safe_locals['methods'] = self._collect_safe_local_methods(lines)
+            safe_locals['functions'] = self._collect_safe_local_functions(lines)
 
         # 查找所有容器字面量
-        containers = self._find_containers(content, lines)
+        containers = self._find_containers(lines)
 
         for container in containers:
             line_num = container['line']
@@ -61,7 +158,7 @@ class WrapperEmptyPointerRule(BaseRule):
             # 跳过注释行
             line = lines[line_num - 1] if line_num <= len(lines) else ''
             stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            if stripped.startswith(COMMENT_PREFIXES):
                 continue
 
             # 通过 get_related_lines 获取容器范围
@@ -88,9 +185,10 @@ class WrapperEmptyPointerRule(BaseRule):
 
         return violations
 
-    def _find_containers(self, _content: str, lines: List[str]) -> List[dict]:
+    def _find_containers(self, lines: List[str]) -> List[dict]:
         """查找所有容器字面量及其内容（支持多行）"""
         containers = []
+        context = get_rule_context(lines)
 
         # 追踪多行容器状态
         in_dict = False
@@ -99,12 +197,16 @@ class WrapperEmptyPointerRule(BaseRule):
         array_bracket_count = 0
 
         for line_num, line in enumerate(lines, 1):
+            # 快速过滤：不在多行容器内且不含 @{ / @[ 的行不会产生任何容器元素
+            if not in_dict and not in_array and '@{' not in line and '@[' not in line:
+                continue
+
             # 跳过注释
             if is_comment_line(line):
                 continue
 
             # 移除行尾注释
-            check_line = strip_line_comment(line)
+            check_line = context.code_line(line_num - 1)
 
             # 如果在多行字典内，检测键值对
             if in_dict:
@@ -155,17 +257,18 @@ class WrapperEmptyPointerRule(BaseRule):
     def _collect_safe_local_methods(self, lines: List[str]) -> Set[str]:
         """收集当前文件内可确定返回非空对象的方法 selector。"""
         safe_methods = set()
-        line_num = 1
+        next_line = 1
+        context = get_rule_context(lines)
+        code_lines = context.code_lines
 
-        while line_num <= len(lines):
-            line = lines[line_num - 1]
-            if not self.METHOD_START_PATTERN.match(line.strip()):
-                line_num += 1
+        for line_num in context.method_start_lines:
+            # 跳过已处理过的方法体内的行
+            if line_num < next_line:
                 continue
 
             signature_end = line_num
             while signature_end <= len(lines):
-                code = strip_line_comment(lines[signature_end - 1])
+                code = code_lines[signature_end - 1]
                 if '{' in code or ';' in code:
                     break
                 signature_end += 1
@@ -175,35 +278,36 @@ class WrapperEmptyPointerRule(BaseRule):
 
             signature_lines = lines[line_num - 1:signature_end]
             signature_text = " ".join(s.strip() for s in signature_lines)
-            if ';' in strip_line_comment(lines[signature_end - 1]):
-                line_num = signature_end + 1
+            if ';' in code_lines[signature_end - 1]:
+                next_line = signature_end + 1
                 continue
 
             selector = self._extract_selector_from_signature(signature_text)
             method_end = find_matching_brace(lines, signature_end, '{', '}')
-            method_lines = lines[signature_end - 1:method_end]
-
-            if selector and self._method_returns_safe_value(method_lines):
+            if selector and self._method_returns_safe_value(
+                code_lines[signature_end - 1:method_end], lines
+            ):
                 safe_methods.add(selector)
 
-            line_num = max(signature_end + 1, method_end + 1)
+            next_line = max(signature_end + 1, method_end + 1)
 
         return safe_methods
 
     def _collect_safe_local_functions(self, lines: List[str]) -> Set[str]:
         """收集当前文件内可确定返回非空对象的 C 函数。"""
         safe_functions = set()
+        code_lines = get_rule_context(lines).code_lines
         line_num = 1
 
         while line_num <= len(lines):
-            line = strip_line_comment(lines[line_num - 1]).strip()
+            line = code_lines[line_num - 1].strip()
             if not self.FUNCTION_START_PATTERN.match(line):
                 line_num += 1
                 continue
 
             signature_end = line_num
             while signature_end <= len(lines):
-                code = strip_line_comment(lines[signature_end - 1])
+                code = code_lines[signature_end - 1]
                 if '{' in code or ';' in code:
                     break
                 signature_end += 1
@@ -213,15 +317,15 @@ class WrapperEmptyPointerRule(BaseRule):
 
             signature_lines = lines[line_num - 1:signature_end]
             signature_text = " ".join(s.strip() for s in signature_lines)
-            if ';' in strip_line_comment(lines[signature_end - 1]):
+            if ';' in code_lines[signature_end - 1]:
                 line_num = signature_end + 1
                 continue
 
             function_name = self._extract_function_name_from_signature(signature_text)
             function_end = find_matching_brace(lines, signature_end, '{', '}')
-            function_lines = lines[signature_end - 1:function_end]
-
-            if function_name and self._method_returns_safe_value(function_lines):
+            if function_name and self._method_returns_safe_value(
+                code_lines[signature_end - 1:function_end], lines
+            ):
                 safe_functions.add(function_name)
 
             line_num = max(signature_end + 1, function_end + 1)
@@ -240,27 +344,22 @@ class WrapperEmptyPointerRule(BaseRule):
         """统计字符串中括号差值，忽略字符串字面量中的字符。"""
         delta = 0
         in_string = False
-        escape_next = False
 
-        for char in text:
-            if escape_next:
-                escape_next = False
+        for match in _token_pattern(open_char + close_char).finditer(text):
+            token = match.group()
+            if token[0] == '\\':
                 continue
 
-            if char == '\\':
-                escape_next = True
-                continue
-
-            if char == '"':
+            if token == '"':
                 in_string = not in_string
                 continue
 
             if in_string:
                 continue
 
-            if char == open_char:
+            if token == open_char:
                 delta += 1
-            elif char == close_char:
+            else:
                 delta -= 1
 
         return delta
@@ -306,77 +405,59 @@ class WrapperEmptyPointerRule(BaseRule):
 
         return containers
 
+    def _iter_closed_literals(self, line: str, opener: str) -> Iterator[Tuple[int, int]]:
+        """
+        查找行中以 opener（'@{' 或 '@['）开始且在本行闭合的字面量
+
+        起始位置用 str.find 定位，匹配的闭合括号用正则只在括号字符间跳转，
+        不再逐字符循环。返回 (内容起始下标, 内容结束下标)。
+        """
+        open_char = opener[1]
+        bracket_pattern = self.LITERAL_BRACKET_PATTERNS[open_char]
+        i = line.find(opener)
+
+        while i != -1:
+            content_start = i + 2
+            depth = 1
+            for match in bracket_pattern.finditer(line, content_start):
+                depth += 1 if match.group() == open_char else -1
+                if depth == 0:
+                    yield content_start, match.start()
+                    i = line.find(opener, match.end())
+                    break
+            else:
+                # 本行未闭合，从下一个字符继续查找
+                i = line.find(opener, i + 1)
+
     def _find_dict_literals(self, line: str, line_num: int) -> List[dict]:
         """查找行中的字典字面量"""
         containers = []
-        i = 0
-
-        while i < len(line):
-            # 查找 @{
-            if i < len(line) - 1 and line[i:i+2] == '@{':
-                start = i
-                # 找到匹配的 }
-                content_start = i + 2
-                brace_count = 1
-                j = content_start
-
-                while j < len(line) and brace_count > 0:
-                    if line[j] == '{':
-                        brace_count += 1
-                    elif line[j] == '}':
-                        brace_count -= 1
-                    j += 1
-
-                if brace_count == 0:
-                    # 提取字典内容
-                    dict_content = line[content_start:j-1]
-                    values = self._parse_dict_values(dict_content, start + 2)
-                    if values:
-                        containers.append({
-                            'type': 'dict',
-                            'line': line_num,
-                            'values': values
-                        })
-                    i = j
-                    continue
-            i += 1
+
+        for content_start, content_end in self._iter_closed_literals(line, '@{'):
+            # 提取字典内容
+            values = self._parse_dict_values(line[content_start:content_end], content_start)
+            if values:
+                containers.append({
+                    'type': 'dict',
+                    'line': line_num,
+                    'values': values
+                })
 
         return containers
 
     def _find_array_literals(self, line: str, line_num: int) -> List[dict]:
         """查找行中的数组字面量"""
         containers = []
-        i = 0
-
-        while i < len(line):
-            # 查找 @[
-            if i < len(line) - 1 and line[i:i+2] == '@[':
-                start = i
-                # 找到匹配的 ]
-                content_start = i + 2
-                bracket_count = 1
-                j = content_start
-
-                while j < len(line) and bracket_count > 0:
-                    if line[j] == '[':
-                        bracket_count += 1
-                    elif line[j] == ']':
-                        bracket_count -= 1
-                    j += 1
-
-                if bracket_count == 0:
-                    # 提取数组内容
-                    array_content = line[content_start:j-1]
-                    values = self._parse_array_values(array_content, start + 2)
-                    if values:
-                        containers.append({
-                            'type': 'array',
-                            'line': line_num,
-                            'values': values
-                        })
-                    i = j
-                    continue
-            i += 1
+
+        for content_start, content_end in self._iter_closed_literals(line, '@['):
+            # 提取数组内容
+            values = self._parse_array_values(line[content_start:content_end], content_start)
+            if values:
+                containers.append({
+                    'type': 'array',
+                    'line': line_num,
+                    'values': values
+                })
 
         return containers
 
@@ -440,76 +521,34 @@ class WrapperEmptyPointerRule(BaseRule):
     def _split_by_comma(self, content: str) -> List[str]:
         """按逗号分割，但忽略嵌套结构中的逗号"""
         result = []
-        current = []
         depth = 0  # 跟踪嵌套深度 (括号、方括号、大括号)
-        in_string = False
-        escape_next = False
-
-        for char in content:
-            if escape_next:
-                current.append(char)
-                escape_next = False
-                continue
+        start = 0
 
-            if char == '\\':
-                escape_next = True
-                current.append(char)
-                continue
+        for match in self.NESTING_TOKEN_PATTERN.finditer(content):
+            token = match.group()
+            delta = _NESTING_DELTA.get(token)
+            if delta:
+                depth += delta
+            elif token == ',' and depth == 0:
+                result.append(content[start:match.start()])
+                start = match.end()
 
-            if char == '"' and not escape_next:
-                in_string = not in_string
-                current.append(char)
-                continue
-
-            if in_string:
-                current.append(char)
-                continue
-
-            if char in '([{':
-                depth += 1
-                current.append(char)
-            elif char in ')]}':
-                depth -= 1
-                current.append(char)
-            elif char == ',' and depth == 0:
-                result.append(''.join(current))
-                current = []
-            else:
-                current.append(char)
-
-        if current:
-            result.append(''.join(current))
+        if start < len(content):
+            result.append(content[start:])
 
         return result
 
     def _find_colon_separator(self, pair: str) -> int:
         """找到键值对中的冒号分隔符位置（忽略嵌套中的冒号）"""
         depth = 0
-        in_string = False
-        escape_next = False
-
-        for i, char in enumerate(pair):
-            if escape_next:
-                escape_next = False
-                continue
 
-            if char == '\\':
-                escape_next = True
-                continue
-
-            if char == '"':
-                in_string = not in_string
-                continue
-
-            if in_string:
-                continue
-
-            if char in '([{':
-                depth += 1
-            elif char in ')]}':
-                depth -= 1
-            elif char == ':' and depth == 0:
-                return i
+        for match in self.NESTING_TOKEN_PATTERN.finditer(pair):
+            token = match.group()
+            delta = _NESTING_DELTA.get(token)
+            if delta:
+                depth += delta
+            elif token == ':' and depth == 0:
+                return match.start()
 
         return -1
 
@@ -529,20 +568,19 @@ class WrapperEmptyPointerRule(BaseRule):
         if self._looks_like_message_fragment(value):
             return True, None
 
-        # 检查是否匹配安全模式（使用 rule_utils 中的 SAFE_VALUE_PATTERNS）
-        for pattern in SAFE_VALUE_PATTERNS:
-            if pattern.match(value):
-                return True, None
+        # 检查是否匹配安全模式（使用 rule_utils 中的 SAFE_VALUE_PATTERN）
+        if SAFE_VALUE_PATTERN.match(value):
+            return True, None
 
         # 检查三目运算符
         ternary_result = self._check_ternary_operator(value)
         if ternary_result is not None:
             return ternary_result
 
-        if self._is_safe_method_call(value):
+        if self._is_safe_method_call(value, lines):
             return True, None
 
-        if self._is_safe_function_call(value):
+        if self._is_safe_function_call(value, lines):
             return True, None
 
         if self._is_safe_local_identifier(value, line_num, lines):
@@ -605,30 +643,24 @@ class WrapperEmptyPointerRule(BaseRule):
         """查找运算符位置（忽略嵌套结构和字符串中的）"""
         depth = 0
         in_string = False
-        escape_next = False
 
-        for i, char in enumerate(text):
-            if escape_next:
-                escape_next = False
-                continue
-
-            if char == '\\':
-                escape_next = True
+        for match in _token_pattern('()[]{}' + operator).finditer(text):
+            token = match.group()
+            if token[0] == '\\':
                 continue
 
-            if char == '"':
+            if token == '"':
                 in_string = not in_string
                 continue
 
             if in_string:
                 continue
 
-            if char in '([{':
-                depth += 1
-            elif char in ')]}':
-                depth -= 1
-            elif char == operator and depth == 0:
-                return i
+            delta = _NESTING_DELTA.get(token)
+            if delta is not None:
+                depth += delta
+            elif depth == 0:
+                return match.start()
 
         return -1
 
@@ -639,10 +671,9 @@ class WrapperEmptyPointerRule(BaseRule):
         if not value:
             return True, None
 
-        # 使用 rule_utils 中的 SAFE_VALUE_PATTERNS
-        for pattern in SAFE_VALUE_PATTERNS:
-            if pattern.match(value):
-                return True, None
+        # 使用 rule_utils 中的 SAFE_VALUE_PATTERN
+        if SAFE_VALUE_PATTERN.match(value):
+            return True, None
 
         # 递归检查嵌套的三目运算符
         ternary_result = self._check_ternary_operator(value)
@@ -656,7 +687,7 @@ class WrapperEmptyPointerRule(BaseRule):
         normalized = value.rstrip('];').strip()
         if normalized.startswith('@'):
             return False
-        return bool(re.match(r'^[A-Za-z_]\w*\s*:', normalized))
+        return bool(self.SELECTOR_FRAGMENT_PATTERN.match(normalized))
 
     def _extract_selector_from_signature(self, signature_text: str) -> Optional[str]:
         """从方法声明提取 selector。"""
@@ -669,7 +700,7 @@ class WrapperEmptyPointerRule(BaseRule):
         if not signature_body:
             return None
 
-        keywords = re.findall(r'([A-Za-z_]\w*)\s*:', signature_body)
+        keywords = self.SELECTOR_KEYWORD_PATTERN.findall(signature_body)
         if keywords:
             return ''.join(f"{keyword}:" for keyword in keywords)
 
@@ -679,81 +710,75 @@ class WrapperEmptyPointerRule(BaseRule):
     def _extract_function_name_from_signature(self, signature_text: str) -> Optional[str]:
         """从 C 函数声明提取函数名。"""
         signature_body = signature_text.split('{', 1)[0].strip()
-        match = re.search(r'(\w+)\s*\([^()]*\)\s*$', signature_body)
+        match = self.FUNCTION_NAME_PATTERN.search(signature_body)
         return match.group(1) if match else None
 
-    def _method_returns_safe_value(self, method_lines: List[str]) -> bool:
-        """判断方法的所有返回路径是否都能确定返回非空值。"""
+    def _method_returns_safe_value(self, code_lines: List[str], lines: List[str]) -> bool:
+        """判断方法的所有返回路径是否都能确定返回非空值（code_lines 为已去除行尾注释的方法体行）。"""
         safe_vars = set()
         return_exprs = []
 
-        for line in method_lines:
-            code = strip_line_comment(line).strip()
+        for line in code_lines:
+            code = line.strip()
             if not code:
                 continue
 
-            decl_match = re.search(r'\*\s*(\w+)\s*=\s*(.+?)\s*;', code)
+            decl_match = self.LOCAL_DECLARATION_PATTERN.search(code)
             if decl_match:
                 var_name = decl_match.group(1)
                 expr = decl_match.group(2).strip()
-                if self._is_definitely_nonnull_expression(expr):
+                if self._is_definitely_nonnull_expression(expr, lines):
                     safe_vars.add(var_name)
                 else:
                     safe_vars.discard(var_name)
 
-            assign_match = re.search(r'^\s*(\w+)\s*=\s*(.+?)\s*;$', code)
+            assign_match = self.LOCAL_ASSIGNMENT_PATTERN.search(code)
             if assign_match:
                 var_name = assign_match.group(1)
                 expr = assign_match.group(2).strip()
-                if self._is_definitely_nonnull_expression(expr):
+                if self._is_definitely_nonnull_expression(expr, lines):
                     safe_vars.add(var_name)
                 else:
                     safe_vars.discard(var_name)
 
-            return_match = re.search(r'\breturn\s+(.+?)\s*;', code)
+            return_match = self.RETURN_PATTERN.search(code)
             if return_match:
                 return_exprs.append(return_match.group(1).strip())
 
         if not return_exprs:
             return False
 
-        return all(self._is_safe_return_expression(expr, safe_vars) for expr in return_exprs)
+        return all(self._is_safe_return_expression(expr, safe_vars, lines) for expr in return_exprs)
 
-    def _is_safe_return_expression(self, expr: str, safe_vars: Set[str]) -> bool:
+    def _is_safe_return_expression(self, expr: str, safe_vars: Set[str], lines: List[str]) -> bool:
         if expr == 'nil':
             return False
         if expr in safe_vars:
             return True
-        return self._is_definitely_nonnull_expression(expr)
+        return self._is_definitely_nonnull_expression(expr, lines)
 
-    def _is_definitely_nonnull_expression(self, expr: str) -> bool:
+    def _is_definitely_nonnull_expression(self, expr: str, lines: List[str]) -> bool:
         expr = expr.strip()
         if not expr:
             return False
 
-        for pattern in SAFE_VALUE_PATTERNS:
-            if pattern.match(expr):
-                return True
-
-        for pattern in self.SAFE_CONSTRUCTOR_PATTERNS:
-            if pattern.match(expr):
-                return True
+        if SAFE_VALUE_PATTERN.match(expr) or SAFE_CONSTRUCTOR_PATTERN.match(expr):
+            return True
 
-        if self._is_safe_function_call(expr):
+        if self._is_safe_function_call(expr, lines):
             return True
 
         return False
 
-    def _is_safe_method_call(self, value: str) -> bool:
+    def _is_safe_method_call(self, value: str, lines: List[str]) -> bool:
         """识别明显安全的方法调用。"""
         value = value.strip()
 
-        for pattern in self.SAFE_CONSTRUCTOR_PATTERNS:
-            if pattern.match(value):
-                return True
+        if SAFE_CONSTRUCTOR_PATTERN.match(value):
+            return True
 
         local_selector = self._extract_selector_from_message_call(value)
-        if local_selector and local_selector in getattr(self, '_safe_local_methods', set()):
+        if local_selector and local_selector in self._get_file_data(lines).get('methods', ()):
             return True
 
         return False
@@ -764,7 +789,7 @@ class WrapperEmptyPointerRule(BaseRule):
             return None
 
         inner = value[1:-1].strip()
-        receiver_match = re.match(r'^(self|super|\w*[sS]elf)\b', inner)
+        receiver_match = self.MESSAGE_RECEIVER_PATTERN.match(inner)
         if not receiver_match:
             return None
 
@@ -821,25 +846,26 @@ class WrapperEmptyPointerRule(BaseRule):
 
         return ''.join(token) if token else None
 
-    def _is_safe_function_call(self, value: str) -> bool:
+    def _is_safe_function_call(self, value: str, lines: List[str]) -> bool:
         """识别当前文件内可确定返回非空对象的 C 函数调用。"""
         value = value.strip()
-        match = re.match(r'^([A-Za-z_]\w*)\s*\(.*\)$', value)
+        match = self.FUNCTION_CALL_PATTERN.match(value)
         if not match:
             return False
-        return match.group(1) in getattr(self, '_safe_local_functions', set())
+        return match.group(1) in self._get_file_data(lines).get('functions', ())
 
     def _is_safe_local_identifier(self, value: str, line_num: int, lines: List[str]) -> bool:
         """识别在当前作用域内已被安全初始化的局部变量。"""
         value = value.strip()
-        if not re.match(r'^[A-Za-z_]\w*$', value):
+        if not self.IDENTIFIER_PATTERN.match(value):
             return False
 
         scope_start = self._find_enclosing_scope_start(lines, line_num)
         assign_pattern = re.compile(rf'(?<![.\w]){re.escape(value)}\s*=\s*(.+?)\s*;')
 
+        context = get_rule_context(lines)
         for i in range(line_num - 2, scope_start - 2, -1):
-            code = strip_line_comment(lines[i]).strip()
+            code = context.code_line(i).strip()
             if not code:
                 continue
 
@@ -850,18 +876,33 @@ class WrapperEmptyPointerRule(BaseRule):
             expr = assign_match.group(1).strip()
             if expr == value:
                 continue
-            return self._is_definitely_nonnull_expression(expr) or self._is_safe_method_call(expr)
+            return self._is_definitely_nonnull_expression(expr, lines) or self._is_safe_method_call(expr, lines)
 
         return False
 
     def _find_enclosing_scope_start(self, lines: List[str], line_num: int) -> int:
-        """向上查找当前行所属的方法或 C 函数起始行。"""
-        for i in range(line_num - 1, -1, -1):
-            code = strip_line_comment(lines[i]).strip()
-            if self.METHOD_START_PATTERN.match(code) or self.FUNCTION_START_PATTERN.match(code):
-                return i + 1
+        """查找当前行所属的方法或 C 函数起始行（整文件一次扫描建表）。"""
+        index = self._get_line_index(lines)
+        if index.scope_starts is None:
+            index.scope_starts = self._build_scope_starts(lines)
+        if 0 < line_num <= len(lines):
+            return index.scope_starts[line_num - 1]
         return 1
 
+    def _build_scope_starts(self, lines: List[str]) -> List[int]:
+        """每一行所属方法或 C 函数的起始行号（找不到为 1）"""
+        starts = []
+        current = 1
+        context = get_rule_context(lines)
+        for i, line in enumerate(lines):
+            # 方法与 C 函数声明都必含 '('
+            if '(' in line:
+                code = context.code_line(i).strip()
+                if self.METHOD_START_PATTERN.match(code) or self.FUNCTION_START_PATTERN.match(code):
+                    current = i + 1
+            starts.append(current)
+        return starts
+
     def get_related_lines(self, file_path: str, line: int, lines: List[str]) -> Tuple[int, int]:
         """
         获取容器字面量范围
@@ -879,20 +920,27 @@ class WrapperEmptyPointerRule(BaseRule):
         if '@{' in current_line or '@[' in current_line:
             return line_num
 
-        # 向上查找 @{ 或 @[
-        brace_count = 0
-        bracket_count = 0
-
-        for i in range(line_num - 2, max(0, line_num - 30), -1):
+        # 向上（最多 30 行）查找未闭合的 @{ 或 @[：
+        # 第 i 行到当前行上一行的括号平衡 = 前缀和之差，只需检查含容器开始的行
+        index = self._get_line_index(lines)
+        if index.brace_prefix is None:
+            index.build_container_tables()
+
+        end = line_num - 1
+        lower = max(0, line_num - 30)
+        brace_end = index.brace_prefix[end]
+        bracket_end = index.bracket_prefix[end]
+        container_lines = index.container_lines
+
+        pos = bisect_left(container_lines, end) - 1
+        while pos >= 0 and container_lines[pos] > lower:
+            i = container_lines[pos]
             line = lines[i]
-
-            brace_count += line.count('}') - line.count('{')
-            bracket_count += line.count(']') - line.count('[')
-
-            if '@{' in line and brace_count < 0:
+            if '@{' in line and brace_end - index.brace_prefix[i] < 0:
                 return i + 1
-            if '@[' in line and bracket_count < 0:
+            if '@[' in line and bracket_end - index.bracket_prefix[i] < 0:
                 return i + 1
+            pos -= 1
 
         return line_num
 
@@ -39,10 +39,10 @@ class ClassPrefixRule(BaseRule):
         # @implementation ClassName
         pattern = r'@(?:interface|implementation)\s+([A-Z][A-Za-z0-9_]*)\s*(?:[:(]|$)'
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
+        for line_num, line in self.iter_checked_lines(lines, changed_lines):
+            # @interface/@implementation 都以 "@i" 开头，先做字面量过滤
+            if '@i' not in line:
                 continue
-
             match = re.search(pattern, line)
             if match:
                 class_name = match.group(1)
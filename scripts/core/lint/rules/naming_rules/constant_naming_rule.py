@@ -5,6 +5,7 @@ import re
 from typing import List, Set
 
 from ..base_rule import BaseRule
+from ..rule_utils import COMMENT_PREFIXES
 from core.lint.reporter import Violation, ViolationType
 
 
@@ -45,13 +46,14 @@ class ConstantNamingRule(BaseRule):
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
+        for line_num, line in self.iter_checked_lines(lines, changed_lines):
+            # 宏常量必含 #define，const/static 常量必含 "="
+            if '#define' not in line and '=' not in line:
                 continue
 
             # 跳过注释行
             stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            if stripped.startswith(COMMENT_PREFIXES):
                 continue
 
             # 获取 related_lines（单行）
@@ -5,7 +5,7 @@ import re
 from typing import List, Set, Tuple
 
 from ..base_rule import BaseRule
-from ..rule_utils import find_statement_end
+from ..rule_utils import COMMENT_PREFIXES, find_statement_end
 from core.lint.reporter import Violation, ViolationType
 
 
@@ -45,7 +45,7 @@ class EnumNamingRule(BaseRule):
 
             # 跳过注释行
             stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            if stripped.startswith(COMMENT_PREFIXES):
                 line_num += 1
                 continue
 
@@ -5,7 +5,7 @@ import re
 from typing import List, Set, Tuple
 
 from ..base_rule import BaseRule
-from ..rule_utils import strip_line_comment
+from ..rule_context import get_rule_context
 from core.lint.reporter import Violation, ViolationType
 
 
@@ -32,13 +32,15 @@ class MethodNamingRule(BaseRule):
 
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
+        context = get_rule_context(lines)
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
+        for line_num, line in self.iter_checked_lines(lines, changed_lines):
+            # METHOD_PATTERN 锚定行首 -/+，其余行无需逐字符去除注释
+            if not line.startswith(('-', '+')):
                 continue
 
             # 去除注释
-            code_line = strip_line_comment(line)
+            code_line = context.code_line(line_num - 1)
 
             match = self.METHOD_PATTERN.search(code_line)
             if match:
@@ -67,8 +69,9 @@ class MethodNamingRule(BaseRule):
 
         从方法定义行到 ; 或 {
         """
+        context = get_rule_context(lines)
         for i in range(line - 1, min(len(lines), line + 20)):
-            code_line = strip_line_comment(lines[i])
+            code_line = context.code_line(i)
             if ';' in code_line or '{' in code_line:
                 return (line, i + 1)
         return (line, line)
@@ -5,7 +5,7 @@ import re
 from typing import List, Set, Tuple
 
 from ..base_rule import BaseRule
-from ..rule_utils import strip_line_comment
+from ..rule_context import get_rule_context
 from core.lint.reporter import Violation, ViolationType
 
 
@@ -33,13 +33,12 @@ class MethodParameterRule(BaseRule):
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
         max_params = self.get_param("max_params", 4)
+        # 去除注释后的代码行由 RuleContext 缓存，同一文件的其他规则可复用
+        code_lines = get_rule_context(lines).code_lines
 
         line_num = 1
         while line_num <= len(lines):
-            line = lines[line_num - 1]
-
-            # 去除注释
-            code_line = strip_line_comment(line)
+            code_line = code_lines[line_num - 1]
 
             # 检查是否是方法定义行
             if self.METHOD_START_PATTERN.match(code_line.strip()):
@@ -49,9 +48,7 @@ class MethodParameterRule(BaseRule):
                 method_end = related_lines[1]
 
                 # 合并多行方法声明
-                full_declaration = ' '.join(
-                    strip_line_comment(lines[i]) for i in range(method_start - 1, method_end)
-                )
+                full_declaration = ' '.join(code_lines[method_start - 1:method_end])
 
                 # 计算参数数量：统计冒号数量
                 param_count = full_declaration.count(':')
@@ -83,8 +80,9 @@ class MethodParameterRule(BaseRule):
 
         方法声明以 ; 或 { 结束
         """
+        context = get_rule_context(lines)
         for i in range(start_line - 1, min(len(lines), start_line + 20)):
-            code_line = strip_line_comment(lines[i])
+            code_line = context.code_line(i)
             if ';' in code_line or '{' in code_line:
                 return i + 1
         return start_line
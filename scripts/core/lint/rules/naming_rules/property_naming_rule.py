@@ -36,60 +36,63 @@ class PropertyNamingRule(BaseRule):
     # 属性名提取模式（在完整声明中匹配）
     PROPERTY_NAME_PATTERN = re.compile(r'\*?\s*(\w+)\s*;')
 
+    # 整文件扫描用：与逐行匹配 PROPERTY_START_PATTERN 等价（空白不跨行）
+    PROPERTY_START_CONTENT_PATTERN = re.compile(r'@property[^\S\n]*\(')
+
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
 
-        line_num = 1
-        while line_num <= len(lines):
-            line = lines[line_num - 1]
-
-            # 检测 @property 开始
-            if self.PROPERTY_START_PATTERN.search(line):
-                property_start = line_num
-                # 通过 get_related_lines 获取属性声明范围
-                related_lines = self.get_related_lines(file_path, property_start, lines)
-                property_end = related_lines[1]
-
-                # 合并多行属性声明
-                full_declaration = ' '.join(
-                    lines[i].strip() for i in range(property_start - 1, property_end)
-                )
-
-                # 检查是否是 IBOutlet（跳过下划线检查）
-                is_iboutlet = 'IBOutlet' in full_declaration
-
-                # 提取属性名
-                name_match = self.PROPERTY_NAME_PATTERN.search(full_declaration)
-                if name_match:
-                    prop_name = name_match.group(1)
-
-                    # 检查是否以小写字母开头
-                    if prop_name and prop_name[0].isupper():
-                        violations.append(self.create_violation(
-                            file_path=file_path,
-                            line=property_start,
-                            column=1,
-                            lines=lines,
-                            violation_type=SubType.UPPERCASE_START,
-                            related_lines=related_lines,
-                            message_vars={"prop": prop_name}
-                        ))
-
-                    # 检查是否包含下划线（IBOutlet 除外）
-                    if '_' in prop_name and not is_iboutlet:
-                        violations.append(self.create_violation(
-                            file_path=file_path,
-                            line=property_start,
-                            column=1,
-                            lines=lines,
-                            violation_type=SubType.CONTAINS_UNDERSCORE,
-                            related_lines=related_lines,
-                            message_vars={"prop": prop_name}
-                        ))
-
-                line_num = property_end + 1
-            else:
-                line_num += 1
+        next_line = 1
+        property_starts = self.iter_match_line_numbers(
+            content, lines, self.PROPERTY_START_CONTENT_PATTERN, self.PROPERTY_START_PATTERN
+        )
+        for property_start in property_starts:
+            # 跳过已作为上一个多行属性声明一部分处理过的行
+            if property_start < next_line:
+                continue
+
+            # 通过 get_related_lines 获取属性声明范围
+            related_lines = self.get_related_lines(file_path, property_start, lines)
+            property_end = related_lines[1]
+
+            # 合并多行属性声明
+            full_declaration = ' '.join(
+                lines[i].strip() for i in range(property_start - 1, property_end)
+            )
+
+            # 检查是否是 IBOutlet（跳过下划线检查）
+            is_iboutlet = 'IBOutlet' in full_declaration
+
+            # 提取属性名
+            name_match = self.PROPERTY_NAME_PATTERN.search(full_declaration)
+            if name_match:
+                prop_name = name_match.group(1)
+
+                # 检查是否以小写字母开头
+                if prop_name and prop_name[0].isupper():
+                    violations.append(self.create_violation(
+                        file_path=file_path,
+                        line=property_start,
+                        column=1,
+                        lines=lines,
+                        violation_type=SubType.UPPERCASE_START,
+                        related_lines=related_lines,
+                        message_vars={"prop": prop_name}
+                    ))
+
+                # 检查是否包含下划线（IBOutlet 除外）
+                if '_' in prop_name and not is_iboutlet:
+                    violations.append(self.create_violation(
+                        file_path=file_path,
+                        line=property_start,
+                        column=1,
+                        lines=lines,
+                        violation_type=SubType.CONTAINS_UNDERSCORE,
+                        related_lines=related_lines,
+                        message_vars={"prop": prop_name}
+                    ))
+
+            next_line = property_end + 1
 
         return violations
 
@@ -5,6 +5,7 @@ import re
 from typing import List, Set, Tuple
 
 from ..base_rule import BaseRule
+from ..rule_utils import COMMENT_PREFIXES
 from core.lint.reporter import Violation, ViolationType
 
 
@@ -35,13 +36,10 @@ class ProtocolNamingRule(BaseRule):
         # 获取配置的前缀列表
         prefixes = self.get_param("prefixes", [])
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
-                continue
-
+        for line_num, line in self.iter_lines_containing(content, lines, changed_lines, '@protocol'):
             # 跳过注释行
             stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            if stripped.startswith(COMMENT_PREFIXES):
                 continue
 
             # 检测协议声明
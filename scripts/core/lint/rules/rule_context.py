@@ -0,0 +1,103 @@
+"""
+Rule Context - 单文件内各规则共享的派生数据
+
+同一文件的所有规则收到的是同一个 lines 列表对象（由 FileContentCache 构建）。
+RuleContext 以 lines 的对象身份为键，把多个规则都会用到的派生结果
+（如方法定义起始行、去除行尾注释后的代码行）只计算一次，供后续规则直接复用。
+
+BaseRule.check 的签名保持不变，自定义规则无需感知 RuleContext。
+"""
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .rule_utils import strip_line_comment
+
+
+# 方法定义开始：- (ReturnType) / + (ReturnType)，在去除首尾空白后的行上匹配
+METHOD_START_PATTERN = re.compile(r'^[-+]\s*\([^)]+\)')
+
+
+class RuleContext:
+    """单个文件的共享派生数据，各项在首次访问时惰性计算"""
+
+    __slots__ = ('lines', '_method_start_flags', '_method_start_lines', '_code_lines', '_rule_data',
+                 'violation_contexts')
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self._method_start_flags: Optional[List[bool]] = None
+        self._method_start_lines: Optional[List[int]] = None
+        self._code_lines: Optional[List[Optional[str]]] = None
+        self._rule_data: Optional[Dict[str, dict]] = None
+        # (规则 identifier, 起始行, 结束行) -> (context, code_hash)：同一审查范围只提取/哈希一次
+        self.violation_contexts: Dict[Tuple[str, int, int], Tuple[str, str]] = {}
+
+    def rule_data(self, key: str) -> dict:
+        """
+        规则私有的单文件数据（按 key 隔离，通常为规则 identifier）
+
+        上下文按线程独享、切换文件时整体丢弃，规则无需把当前文件的状态写到共享的实例上
+        """
+        data = self._rule_data
+        if data is None:
+            data = self._rule_data = {}
+        return data.setdefault(key, {})
+
+    def code_line(self, index: int) -> str:
+        """第 index 行（0-based）去除行尾注释后的代码，按行惰性计算并缓存"""
+        code_lines = self._code_lines
+        if code_lines is None:
+            code_lines = self._code_lines = [None] * len(self.lines)
+        code = code_lines[index]
+        if code is None:
+            code = code_lines[index] = strip_line_comment(self.lines[index])
+        return code
+
+    @property
+    def code_lines(self) -> List[str]:
+        """全部行去除行尾注释后的代码（补齐尚未计算的行）"""
+        code_lines = self._code_lines
+        if code_lines is None:
+            code_lines = self._code_lines = [strip_line_comment(line) for line in self.lines]
+        elif None in code_lines:
+            lines = self.lines
+            for i, code in enumerate(code_lines):
+                if code is None:
+                    code_lines[i] = strip_line_comment(lines[i])
+        return code_lines
+
+    @property
+    def method_start_flags(self) -> List[bool]:
+        """每行（0-based）是否为方法定义开始行"""
+        flags = self._method_start_flags
+        if flags is None:
+            match = METHOD_START_PATTERN.match
+            # 方法定义行必含 - 或 +，先做子串过滤再 strip + 正则
+            flags = self._method_start_flags = [
+                ('-' in line or '+' in line) and match(line.strip()) is not None
+                for line in self.lines
+            ]
+        return flags
+
+    @property
+    def method_start_lines(self) -> List[int]:
+        """方法定义开始行号列表（1-based，升序）"""
+        starts = self._method_start_lines
+        if starts is None:
+            starts = self._method_start_lines = [
+                i for i, is_start in enumerate(self.method_start_flags, 1) if is_start
+            ]
+        return starts
+
+
+# 每个线程只保留最近一个文件的上下文：同一文件的规则在同一线程内顺序执行
+_local = threading.local()
+
+
+def get_rule_context(lines: List[str]) -> RuleContext:
+    """获取 lines 对应的 RuleContext（与上次调用是同一个 lines 对象时直接复用）"""
+    context = getattr(_local, 'context', None)
+    if context is None or context.lines is not lines:
+        context = _local.context = RuleContext(lines)
+    return context
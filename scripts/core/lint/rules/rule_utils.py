@@ -19,6 +19,21 @@ SAFE_VALUE_PATTERNS = [
     re.compile(r'^nil$'),             # nil 本身（显式使用）
 ]
 
+# 以上安全值模式合并为一个锚定的多分支正则，一次 match 完成判断（结果与逐个匹配一致）
+SAFE_VALUE_PATTERN = re.compile(
+    r'^(?:@".*"|@\d+\.?\d*|@\(.+\)|@(?:YES|NO|TRUE|FALSE|true|false)|@\{.*\}|@\[.*\]|nil)$'
+)
+
+# 一定返回非 nil 对象的构造表达式：[Cls new]、[[Cls alloc] init...]、[obj copy] / [obj mutableCopy]
+SAFE_CONSTRUCTOR_PATTERN = re.compile(
+    r'^(?:\[\s*[\w.]+\s+new\s*\]'
+    r'|\[\[\s*[\w.]+\s+alloc\s*\]\s*init(?:[A-Z]\w*)?:?.*\]'
+    r'|\[\s*[\w.]+\s+(?:copy|mutableCopy)\s*\])$'
+)
+
+# 注释行前缀（配合 str.startswith 的元组形式一次判断）
+COMMENT_PREFIXES = ('//', '/*', '*')
+
 
 def strip_line_comment(line: str) -> str:
     """
@@ -30,6 +45,13 @@ def strip_line_comment(line: str) -> str:
     Returns:
         移除注释后的代码
     """
+    # 绝大多数行不含 //，或不含引号与转义符，用一次 C 层 find 即可得到结果
+    comment_pos = line.find('//')
+    if comment_pos == -1:
+        return line
+    if '"' not in line and '\\' not in line:
+        return line[:comment_pos]
+
     # 需要处理字符串中的 // 不被误判
     in_string = False
     escape_next = False
@@ -63,10 +85,7 @@ def is_comment_line(line: str) -> bool:
     Returns:
         True 如果是注释行
     """
-    stripped = line.strip()
-    return (stripped.startswith('//') or
-            stripped.startswith('/*') or
-            stripped.startswith('*'))
+    return line.strip().startswith(COMMENT_PREFIXES)
 
 
 def strip_block_comments(content: str) -> str:
@@ -150,9 +169,10 @@ def is_safe_value(value: str, patterns: Optional[List[re.Pattern]] = None) -> bo
     if not value:
         return True
 
-    check_patterns = patterns or SAFE_VALUE_PATTERNS
+    if not patterns:
+        return bool(SAFE_VALUE_PATTERN.match(value))
 
-    for pattern in check_patterns:
+    for pattern in patterns:
         if pattern.match(value):
             return True
 
@@ -5,6 +5,7 @@ import re
 from typing import List, Set
 
 from ..base_rule import BaseRule
+from ..rule_utils import COMMENT_PREFIXES
 from core.lint.reporter import Violation, Severity, ViolationType
 
 
@@ -150,16 +151,25 @@ class ForbiddenApiRule(BaseRule):
         },
     ]
 
+    # 默认启用的 API 及其预编译模式
+    ENABLED_DEFAULT_APIS = [
+        (api, re.compile(api["pattern"])) for api in DEFAULT_FORBIDDEN_APIS if api.get("enabled", True)
+    ]
+
+    # 默认 API 合并后的多分支模式：逐行版本用于回退；整文件版本把 \s* 换成 [^\S\n]*，
+    # 保证匹配不跨行，只用于筛出候选行，候选行仍逐个 API 判断
+    DEFAULT_API_LINE_PATTERN = re.compile(
+        '|'.join(f'(?:{api["pattern"]})' for api, _ in ENABLED_DEFAULT_APIS)
+    )
+    DEFAULT_API_CONTENT_PATTERN = re.compile(
+        '|'.join(f'(?:{api["pattern"]})'.replace(r'\s*', r'[^\S\n]*') for api, _ in ENABLED_DEFAULT_APIS)
+    )
+
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
 
-        # 合并默认和自定义的禁用 API
-        apis_to_check = []
-
-        # 添加默认的（如果启用）
-        for api in self.DEFAULT_FORBIDDEN_APIS:
-            if api.get("enabled", True):
-                apis_to_check.append(api)
+        # 合并默认和自定义的禁用 API：(api, 预编译模式)
+        apis_to_check = list(self.ENABLED_DEFAULT_APIS)
 
         # 添加自定义的
         custom_apis = self.get_param("apis", [])
@@ -167,32 +177,41 @@ class ForbiddenApiRule(BaseRule):
             if isinstance(api, dict):
                 # 自定义 API 使用 CUSTOM SubType
                 api["sub_type"] = None  # 标记为自定义
-                apis_to_check.append(api)
+                pattern = api.get("pattern", "")
+                apis_to_check.append((api, re.compile(pattern) if pattern else None))
             elif isinstance(api, str):
                 # 简单字符串格式
-                apis_to_check.append({
+                apis_to_check.append(({
                     "pattern": re.escape(api),
                     "message": f"禁止使用 {api}",
                     "sub_type": None  # 标记为自定义
-                })
-
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
-                continue
-
+                }, re.compile(re.escape(api))))
+
+        if changed_lines or len(apis_to_check) != len(self.ENABLED_DEFAULT_APIS):
+            candidates = self.iter_checked_lines(lines, changed_lines)
+        else:
+            # 全量检查且只有默认 API 时，对整个文件做一次 finditer 筛出候选行；
+            # 自定义模式可能含 ^ / $ 等按行语义的锚点，不参与整文件扫描
+            candidates = (
+                (line_num, lines[line_num - 1])
+                for line_num in self.iter_match_line_numbers(
+                    content, lines, self.DEFAULT_API_CONTENT_PATTERN, self.DEFAULT_API_LINE_PATTERN
+                )
+            )
+
+        for line_num, line in candidates:
             # 跳过注释行
             stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            if stripped.startswith(COMMENT_PREFIXES):
                 continue
 
             # 获取 related_lines（单行）
             related_lines = self.get_related_lines(file_path, line_num, lines)
 
-            for api in apis_to_check:
-                pattern = api.get("pattern", "")
+            for api, pattern in apis_to_check:
                 sub_type_name = api.get("sub_type")
 
-                if pattern and re.search(pattern, line):
+                if pattern and pattern.search(line):
                     # 获取对应的 ViolationType
                     if sub_type_name and sub_type_name in _API_SUBTYPE_MAP:
                         violation_type = _API_SUBTYPE_MAP[sub_type_name]
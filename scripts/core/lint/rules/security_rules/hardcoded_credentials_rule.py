@@ -56,10 +56,7 @@ class HardcodedCredentialsRule(BaseRule):
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
-                continue
-
+        for line_num, line in self.iter_checked_lines(lines, changed_lines):
             # 注释中也检测凭证（凭证不应该出现在任何地方，包括注释）
 
             # 获取 related_lines（单行）
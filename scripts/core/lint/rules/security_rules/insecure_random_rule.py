@@ -37,10 +37,8 @@ class InsecureRandomRule(BaseRule):
     def check(self, file_path: str, content: str, lines: List[str], changed_lines: Set[int]) -> List[Violation]:
         violations = []
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
-                continue
-
+        # 所有检测的 API 名都包含 "rand"，不含的行无需逐个正则匹配
+        for line_num, line in self.iter_lines_containing(content, lines, changed_lines, 'rand'):
             # 获取 related_lines（单行）
             related_lines = self.get_related_lines(file_path, line_num, lines)
 
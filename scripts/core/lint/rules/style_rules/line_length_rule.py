@@ -28,10 +28,7 @@ class LineLengthRule(BaseRule):
         max_length = self.get_param("max_length", 120)
         tab_width = self.get_param("tab_width", 4)  # 制表符宽度，默认 4 空格
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
-                continue
-
+        for line_num, line in self.iter_checked_lines(lines, changed_lines):
             # 忽略 URL 和 import 语句
             if 'http://' in line or 'https://' in line:
                 continue
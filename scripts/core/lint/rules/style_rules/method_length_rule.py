@@ -5,6 +5,7 @@ import re
 from typing import List, Set, Tuple
 
 from ..base_rule import BaseRule
+from ..rule_context import get_rule_context
 from ..rule_utils import find_matching_brace
 from core.lint.reporter import Violation, ViolationType
 
@@ -24,8 +25,6 @@ class MethodLengthRule(BaseRule):
     display_name = "方法长度"
     default_severity = "warning"
 
-    # 方法声明模式
-    METHOD_START_PATTERN = re.compile(r'^[-+]\s*\([^)]+\)')
     # 方法名提取模式
     METHOD_NAME_PATTERN = re.compile(r'^[-+]\s*\([^)]+\)\s*([a-zA-Z_][a-zA-Z0-9_:]*)')
 
@@ -33,39 +32,36 @@ class MethodLengthRule(BaseRule):
         violations = []
 
         max_lines = self.get_param("max_lines", 80)
-        line_num = 1
-
-        while line_num <= len(lines):
-            line = lines[line_num - 1]
-
-            # 检测方法开始
-            if self.METHOD_START_PATTERN.match(line.strip()):
-                method_start_line = line_num
-
-                # 提取方法名
-                match = self.METHOD_NAME_PATTERN.search(line.strip())
-                method_name = match.group(1) if match else "unknown"
-
-                # 通过 get_related_lines 获取方法范围
-                related_lines = self.get_related_lines(file_path, method_start_line, lines)
-                method_end_line = related_lines[1]
-                method_length = method_end_line - method_start_line + 1
-
-                if method_length > max_lines:
-                    violations.append(self.create_violation(
-                        file_path=file_path,
-                        line=method_start_line,
-                        column=1,
-                        lines=lines,
-                        violation_type=SubType.TOO_LONG,
-                        related_lines=related_lines,
-                        message_vars={"method": method_name, "length": str(method_length), "max_lines": str(max_lines)}
-                    ))
-
-                # 跳到方法结束行之后继续扫描
-                line_num = method_end_line + 1
-            else:
-                line_num += 1
+        next_line = 1
+
+        for method_start_line in get_rule_context(lines).method_start_lines:
+            # 跳过位于上一个方法体内的行
+            if method_start_line < next_line:
+                continue
+
+            # 提取方法名
+            line = lines[method_start_line - 1]
+            match = self.METHOD_NAME_PATTERN.search(line.strip())
+            method_name = match.group(1) if match else "unknown"
+
+            # 通过 get_related_lines 获取方法范围
+            related_lines = self.get_related_lines(file_path, method_start_line, lines)
+            method_end_line = related_lines[1]
+            method_length = method_end_line - method_start_line + 1
+
+            if method_length > max_lines:
+                violations.append(self.create_violation(
+                    file_path=file_path,
+                    line=method_start_line,
+                    column=1,
+                    lines=lines,
+                    violation_type=SubType.TOO_LONG,
+                    related_lines=related_lines,
+                    message_vars={"method": method_name, "length": str(method_length), "max_lines": str(max_lines)}
+                ))
+
+            # 跳到方法结束行之后继续扫描
+            next_line = method_end_line + 1
 
         return violations
 
@@ -43,10 +43,7 @@ class TodoFixmeRule(BaseRule):
         # 匹配 TODO、FIXME、HACK、XXX 等标记
         pattern = r'(?://|/\*|\*)\s*(TODO|FIXME|HACK|XXX|BUG)[\s:]*(.{0,50})'
 
-        for line_num, line in enumerate(lines, 1):
-            if not self.should_check_line(line_num, changed_lines):
-                continue
-
+        for line_num, line in self.iter_checked_lines(lines, changed_lines):
             match = re.search(pattern, line, re.IGNORECASE)
             if match:
                 tag = match.group(1).upper()
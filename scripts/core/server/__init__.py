@@ -1,8 +1,22 @@
-"""BiliObjCLint local server package."""
-from .db import Database
-from .auth import SessionStore, hash_password, verify_password
-from .handlers import RequestHandler, ServerState
-from .utils import ensure_dir, default_config_path, default_pid_path
+"""BiliObjCLint local server package.
+
+导出项按需加载（PEP 562），导入 core.server.utils 等子模块时不会连带加载
+db / handlers / ui 等全部模块。
+"""
+from importlib import import_module
+
+# 导出名 -> 所在子模块
+_LAZY_EXPORTS = {
+    "Database": ".db",
+    "SessionStore": ".auth",
+    "hash_password": ".auth",
+    "verify_password": ".auth",
+    "RequestHandler": ".handlers",
+    "ServerState": ".handlers",
+    "ensure_dir": ".utils",
+    "default_config_path": ".utils",
+    "default_pid_path": ".utils",
+}
 
 __all__ = [
     "Database",
@@ -15,3 +29,16 @@ __all__ = [
     "default_config_path",
     "default_pid_path",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
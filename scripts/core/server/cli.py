@@ -103,7 +103,7 @@ def run_server(config_path: Path) -> int:
     port = int(server_cfg.get("port", 18080))
 
     # 检查端口是否被占用
-    if is_port_in_use(port, host if host != "0.0.0.0" else "127.0.0.1"):
+    if is_port_in_use(port, host):
         pid, proc_name = find_process_using_port(port)
         print("")
         print("=" * 60)
@@ -30,9 +30,18 @@ class Database:
         """
         self.path = path
         self.logger = logger
+        # 数据版本号：每次写入违规相关数据并提交后递增，用于页面渲染缓存失效
+        self.data_version = 0
         ensure_dir(self.path.parent)
         self._init_db()
 
+    def _bump_data_version(self) -> None:
+        """写入提交后递增数据版本号
+
+        服务为单线程 HTTPServer，读写都在处理请求的同一线程上，无需加锁
+        """
+        self.data_version += 1
+
     def _connect(self) -> sqlite3.Connection:
         """获取数据库连接"""
         return sqlite3.connect(str(self.path))
@@ -401,6 +410,7 @@ class Database:
                 action_time = payload.get("created_at") or datetime.now().isoformat()
                 self.replace_autofix_actions(run_id, project_key, project_name, action_time, actions)
 
+        self._bump_data_version()
         return True, "ok"
 
     def replace_rule_counts(self, run_id: str, rules: Dict[str, Any]) -> None:
@@ -1179,7 +1189,9 @@ class Database:
                 f"DELETE FROM {table_name} WHERE last_seen < date('now', ?)",
                 (f"-{days} days",)
             )
-            return cursor.rowcount
+        # 在事务提交之后递增，避免读到新版本号的请求仍查询到未提交前的数据
+        self._bump_data_version()
+        return cursor.rowcount
 
     def cleanup_project(self, project_key: str, project_name: str) -> bool:
         """删除整个项目的 violations 表
@@ -1211,6 +1223,7 @@ class Database:
                 (project_key, project_name)
             )
 
+        self._bump_data_version()
         self.logger.info(f"Deleted project: {project_key}/{project_name} (table: {table_name})")
         return True
 
@@ -1729,3 +1742,4 @@ class Database:
                 "DELETE FROM runs WHERE created_at < date('now', ?)",
                 (f"-{retention_days} days",)
             )
+        self._bump_data_version()
@@ -9,13 +9,13 @@ import os
 from http import cookies
 from http.server import BaseHTTPRequestHandler
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from .db import Database
 from .auth import SessionStore
 from .ui import render_dashboard, render_login, render_register, render_users
-from .ui.violations import render_violations_list, render_violation_detail
+from .ui.violations import get_cached_violations_list, iter_violations_list, render_violation_detail
 
 
 PROJECT_TOKEN_SEP = "|||"
@@ -66,6 +66,15 @@ class RequestHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(payload)
 
+    def _send_html_stream(self, status: int, chunks: Iterable[str]) -> None:
+        """分块发送 HTML 响应（不带 Content-Length，HTTP/1.0 以关闭连接结束响应）"""
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("X-Content-Type-Options", "nosniff")
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(chunk.encode("utf-8"))
+
     def _serve_static(self, filename: str) -> None:
         """提供静态文件服务"""
         # 静态文件目录: scripts/core/server/static/
@@ -502,6 +511,16 @@ class RequestHandler(BaseHTTPRequestHandler):
         page_size = 50
         offset = (page - 1) * page_size
 
+        # 先读取数据版本号再查询：查询期间发生写入时，页面以旧版本号缓存，下次请求即失效
+        data_version = state.db.data_version
+        cached_html = get_cached_violations_list(
+            username, role, project_key, project_name, page, rule_id, sub_type, search,
+            start_date, end_date, data_version,
+        )
+        if cached_html is not None:
+            self._send_html(200, cached_html)
+            return
+
         violations, total = state.db.get_violations(
             project_key, project_name, rule_id, sub_type, None, search, page_size, offset,
             start_date=start_date, end_date=end_date,
@@ -512,9 +531,9 @@ class RequestHandler(BaseHTTPRequestHandler):
         # 获取可用的筛选选项
         available_rules, available_sub_types = state.db.get_available_filters(project_key, project_name)
 
-        self._send_html(
+        self._send_html_stream(
             200,
-            render_violations_list(
+            iter_violations_list(
                 username=username,
                 role=role,
                 project_key=project_key,
@@ -530,6 +549,7 @@ class RequestHandler(BaseHTTPRequestHandler):
                 available_sub_types=available_sub_types,
                 start_date=start_date,
                 end_date=end_date,
+                data_version=data_version,
             ),
         )
 
@@ -17,7 +17,7 @@ from .login import render_login
 from .register import render_register
 from .dashboard import render_dashboard
 from .users import render_users
-from .violations import render_violations_list, render_violation_detail
+from .violations import iter_violations_list, render_violations_list, render_violation_detail
 
 # Re-export styles for any direct usage
 from .styles import STYLE
@@ -36,6 +36,7 @@ __all__ = [
     "render_register",
     "render_dashboard",
     "render_users",
+    "iter_violations_list",
     "render_violations_list",
     "render_violation_detail",
     "STYLE",
@@ -1,13 +1,175 @@
 """Violations page templates for BiliObjCLint server."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from html import escape
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
 
 from .styles import STYLE
 from .components import get_rule_display_name
 
+# ObjC 语法高亮正则（模块加载时编译一次，单次扫描按命名分组分派）
+_HL_RE = re.compile(
+    r'(?P<kw>\b(?:if|else|for|while|do|switch|case|default|break|continue|return|goto|typedef|struct|enum|union|sizeof|static|extern|const|volatile|inline|void|char|short|int|long|float|double|bool|BOOL|YES|NO|nil|NULL|self|super|id|Class|SEL|IMP|instancetype)\b)'
+    r'|(?P<at>@(?:interface|implementation|end|protocol|property|synthesize|dynamic|class|public|private|protected|selector|try|catch|finally|throw|synchronized|autoreleasepool))'
+    r'|(?P<prop>\b(?:nonatomic|atomic|strong|weak|copy|assign|retain|readonly|readwrite|nullable|nonnull)\b)'
+    r'|(?P<num>\b\d+\.?\d*[fFlL]?\b)'
+)
+# 不含字母/数字/@ 的行（空行、纯括号行等）不可能命中任何高亮规则
+_HAS_WORD_RE = re.compile(r'[A-Za-z0-9@]')
+_HL_CLASSES = {
+    "kw": "hl-keyword",
+    "at": "hl-at-keyword",
+    "prop": "hl-prop",
+    "num": "hl-number",
+}
+
+
+@lru_cache(maxsize=512)
+def _rule_display_html(rule_id: str, rule_name: Optional[str] = None) -> str:
+    """HTML-escaped rule display name, memoized across rows and requests."""
+    return escape(get_rule_display_name(rule_id, rule_name))
+
+
+def _hl_repl(match: "re.Match[str]") -> str:
+    return f'<span class="{_HL_CLASSES[match.lastgroup]}">{match.group()}</span>'
+
+
+VIOLATIONS_STYLE = """
+<style>
+.clickable-row { cursor: pointer; }
+.clickable-row:hover { background: #faf6f0; }
+.severity-error { color: #b91c1c; font-weight: 600; }
+.severity-warning { color: #d97706; }
+.pagination { display: flex; gap: 8px; margin-top: 16px; justify-content: center; align-items: center; }
+.pagination a, .pagination span { padding: 6px 12px; border-radius: 6px; text-decoration: none; }
+.pagination a { background: #f5f0e8; color: #333; }
+.pagination a:hover { background: #efe5d7; }
+.pagination .current { background: #fb7299; color: #fff; }
+.pagination .disabled { color: #999; }
+.filter-form { display: flex; flex-wrap: wrap; gap: 12px; margin-bottom: 16px; align-items: flex-end; }
+.filter-form .filter-group { display: flex; flex-direction: column; gap: 4px; }
+.filter-form label { font-size: 12px; color: #6b6b6b; }
+.filter-form select { padding: 8px 12px; border: 1px solid #e6ded4; border-radius: 8px; min-width: 150px; background: #fff; }
+.filter-form input[type="text"] { padding: 8px 12px; border: 1px solid #e6ded4; border-radius: 8px; min-width: 200px; }
+.filter-form button { padding: 8px 16px; background: #fb7299; color: #fff; border: none; border-radius: 8px; cursor: pointer; height: 38px; }
+.filter-form .clear-link { padding: 8px 12px; color: #666; text-decoration: none; font-size: 13px; }
+.filter-info { color: #6b6b6b; font-size: 14px; margin-bottom: 12px; }
+.back-link { color: #fb7299; text-decoration: none; margin-bottom: 16px; display: inline-block; }
+.back-link:hover { text-decoration: underline; }
+</style>
+"""
+
+VIOLATION_DETAIL_STYLE = """
+<style>
+.severity-error { color: #b91c1c; font-weight: 600; }
+.severity-warning { color: #d97706; }
+.back-link { color: #fb7299; text-decoration: none; margin-bottom: 16px; display: inline-block; }
+.back-link:hover { text-decoration: underline; }
+.detail-grid { display: grid; grid-template-columns: repeat(2, 1fr); gap: 16px; }
+.detail-item { padding: 12px; background: #faf6f0; border-radius: 8px; }
+.detail-item .label { color: #6b6b6b; font-size: 12px; margin-bottom: 4px; }
+.detail-item .value { color: #1e1e1e; font-size: 14px; word-break: break-all; }
+.message-box { background: #fef9f3; border-left: 4px solid #fb7299; padding: 16px; margin: 16px 0; border-radius: 0 8px 8px 0; }
+/* 代码块样式 - 与 Claude html_report 一致 */
+.code-block { background: #1e1e1e; border-radius: 8px; overflow: hidden; margin: 12px 0; }
+.code-line { display: flex; padding: 2px 12px; }
+.code-line.highlighted { background: rgba(255, 200, 0, 0.2); }
+.code-line-num { min-width: 45px; padding-right: 12px; text-align: right; color: #858585; user-select: none; border-right: 1px solid #404040; margin-right: 12px; font-family: 'SF Mono', Monaco, monospace; font-size: 13px; }
+.code-line-content { white-space: pre; color: #d4d4d4; font-family: 'SF Mono', Monaco, monospace; font-size: 13px; }
+/* ObjC 语法高亮 */
+.hl-keyword { color: #569cd6; }
+.hl-at-keyword { color: #c586c0; }
+.hl-prop { color: #4ec9b0; }
+.hl-string { color: #ce9178; }
+.hl-number { color: #b5cea8; }
+.hl-comment { color: #6a9955; font-style: italic; }
+</style>
+"""
+
+# 列表页违规行模板（字段均需预先 HTML 转义）
+_ROW_TMPL = """
+        <tr class="clickable-row" onclick="window.location='{detail_link}'">
+            <td title="{file_path}">{display_path}:{line}</td>
+            <td>{rule_display}</td>
+            <td>{sub_type}</td>
+            <td><span class="severity-{severity_class}">{severity}</span></td>
+            <td title="{full_message}">{message}</td>
+        </tr>
+        """
 
-def render_violations_list(
+# 详情页代码上下文行模板
+_CODE_LINE_TMPL = (
+    '<div class="code-line {hl}">'
+    '<span class="code-line-num">{n}</span>'
+    '<span class="code-line-content">{c}</span>'
+    '</div>'
+)
+
+# 列表页渲染缓存: 渲染参数 + 数据版本 -> (写入时间, html)
+# 用户徽标以占位符写入缓存，命中后再替换，避免按用户拆分缓存。
+# 服务为单线程 HTTPServer，缓存只在处理请求的线程上读写，不需要加锁。
+# 详情页只渲染单条违规、构建开销小且很少被重复访问，不做缓存。
+_RENDER_CACHE_MAX_SIZE = 256
+_RENDER_CACHE_TTL = 30.0
+_BADGE_PLACEHOLDER = "\x00badge\x00"
+_render_cache: "OrderedDict[tuple, Tuple[float, str]]" = OrderedDict()
+
+
+def _render_cache_key(
+    project_key: str,
+    project_name: str,
+    page: int,
+    rule_id: Optional[str],
+    sub_type: Optional[str],
+    search: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    data_version: int,
+) -> tuple:
+    return (
+        project_key, project_name, page, rule_id or "", sub_type or "", search or "",
+        start_date or "", end_date or "", data_version,
+    )
+
+
+def get_cached_violations_list(
+    username: str,
+    role: str,
+    project_key: str,
+    project_name: str,
+    page: int,
+    rule_id: Optional[str] = None,
+    sub_type: Optional[str] = None,
+    search: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    data_version: Optional[int] = None,
+) -> Optional[str]:
+    """Return the cached violations page for these parameters, or None on a miss.
+
+    Lets callers skip the violations/filter queries entirely when the page for the
+    current data_version has already been rendered.
+    """
+    if data_version is None:
+        return None
+    cache_key = _render_cache_key(
+        project_key, project_name, page, rule_id, sub_type, search,
+        start_date, end_date, data_version,
+    )
+    cached = _render_cache.get(cache_key)
+    if not cached or time.monotonic() - cached[0] >= _RENDER_CACHE_TTL:
+        return None
+    _render_cache.move_to_end(cache_key)
+    badge = f"{escape(username)} · {escape(role)}"
+    return cached[1].replace(_BADGE_PLACEHOLDER, badge)
+
+
+def iter_violations_list(
     username: str,
     role: str,
     project_key: str,
@@ -23,8 +185,12 @@ def render_violations_list(
     available_sub_types: Optional[List[str]] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-) -> str:
-    """Render the violations list page.
+    data_version: Optional[int] = None,
+) -> Iterator[str]:
+    """Render the violations list page as a stream of HTML chunks.
+
+    The page is yielded piecewise (header, one chunk per row, footer) so the
+    HTTP handler can start sending before all rows are built.
 
     Args:
         username: Current user's username
@@ -42,7 +208,32 @@ def render_violations_list(
         available_sub_types: List of sub_type values for filter dropdown
         start_date: Start date filter (YYYY-MM-DD)
         end_date: End date filter (YYYY-MM-DD)
+        data_version: Data version of the violations store; enables render caching when given
     """
+    cached_html = get_cached_violations_list(
+        username, role, project_key, project_name, page, rule_id, sub_type, search,
+        start_date, end_date, data_version,
+    )
+    if cached_html is not None:
+        yield cached_html
+        return
+
+    badge = f"{escape(username)} · {escape(role)}"
+    cache_key = None
+    if data_version is not None:
+        cache_key = _render_cache_key(
+            project_key, project_name, page, rule_id, sub_type, search,
+            start_date, end_date, data_version,
+        )
+
+    # 缓存中保存带徽标占位符的原始分块，输出时替换为当前用户徽标
+    chunks: List[str] = []
+
+    def emit(chunk: str) -> str:
+        if cache_key is not None:
+            chunks.append(chunk)
+        return badge if chunk is _BADGE_PLACEHOLDER else chunk
+
     # 构建过滤条件描述
     filter_desc = []
     if rule_id:
@@ -58,54 +249,16 @@ def render_violations_list(
             filter_desc.append(f"从: {start_date}")
         if end_date:
             filter_desc.append(f"至: {end_date}")
-    filter_text = " | ".join(filter_desc) if filter_desc else "全部"
+    filter_text = escape(" | ".join(filter_desc)) if filter_desc else "全部"
 
     has_any_filter = rule_id or sub_type or search or start_date or end_date
 
-    # 构建违规行
-    violation_rows = []
-    for v in violations:
-        vid = v.get("violation_id", "")
-        file_path = v.get("file_path", "")
-        line = v.get("line", 0)
-        rid = v.get("rule_id", "")
-        st = v.get("sub_type") or "-"
-        severity = v.get("severity", "warning")
-        message = v.get("message", "")[:80]  # 截断消息
-        if len(v.get("message", "")) > 80:
-            message += "..."
-
-        # 文件路径截断显示
-        display_path = file_path
-        if len(file_path) > 50:
-            display_path = "..." + file_path[-47:]
-
-        detail_link = f"/violations/{vid}?project_key={project_key}&project_name={project_name}"
-        severity_class = "error" if severity == "error" else "warning"
-
-        # 优先使用 violation 自带的 rule_name
-        rule_display = get_rule_display_name(rid, v.get("rule_name"))
-        row = f"""
-        <tr class="clickable-row" onclick="window.location='{detail_link}'">
-            <td title="{file_path}">{display_path}:{line}</td>
-            <td>{rule_display}</td>
-            <td>{st}</td>
-            <td><span class="severity-{severity_class}">{severity}</span></td>
-            <td title="{v.get('message', '')}">{message}</td>
-        </tr>
-        """
-        violation_rows.append(row)
-
-    rows_html = "".join(violation_rows) or '<tr><td colspan="5">暂无违规记录</td></tr>'
-
-    # 构建分页
-    pagination_html = _render_pagination(
-        page, total_pages, project_key, project_name, rule_id, sub_type, search,
-        start_date, end_date,
-    )
+    project_query = urlencode({"project_key": project_key, "project_name": project_name})
+    project_key_html = escape(project_key)
+    project_name_html = escape(project_name)
 
     # 构建搜索表单
-    search_value = search or ""
+    search_value = escape(search or "")
 
     # 构建规则下拉选项
     rule_options = '<option value="">全部规则</option>'
@@ -113,59 +266,39 @@ def render_violations_list(
         for rid, rname, cnt in available_rules:
             selected = 'selected' if rid == rule_id else ''
             display = rname or rid
-            rule_options += f'<option value="{rid}" {selected}>{display} ({cnt})</option>'
+            rule_options += f'<option value="{escape(rid)}" {selected}>{escape(display)} ({cnt})</option>'
 
     # 构建子类型下拉选项
     sub_type_options = '<option value="">全部子类型</option>'
     if available_sub_types:
         for st in available_sub_types:
             selected = 'selected' if st == sub_type else ''
-            sub_type_options += f'<option value="{st}" {selected}>{st}</option>'
+            sub_type_options += f'<option value="{escape(st)}" {selected}>{escape(st)}</option>'
 
-    return f"""
-    <html><head><title>Violations - {project_name}</title>{STYLE}
-    <style>
-    .clickable-row {{ cursor: pointer; }}
-    .clickable-row:hover {{ background: #faf6f0; }}
-    .severity-error {{ color: #b91c1c; font-weight: 600; }}
-    .severity-warning {{ color: #d97706; }}
-    .pagination {{ display: flex; gap: 8px; margin-top: 16px; justify-content: center; align-items: center; }}
-    .pagination a, .pagination span {{ padding: 6px 12px; border-radius: 6px; text-decoration: none; }}
-    .pagination a {{ background: #f5f0e8; color: #333; }}
-    .pagination a:hover {{ background: #efe5d7; }}
-    .pagination .current {{ background: #fb7299; color: #fff; }}
-    .pagination .disabled {{ color: #999; }}
-    .filter-form {{ display: flex; flex-wrap: wrap; gap: 12px; margin-bottom: 16px; align-items: flex-end; }}
-    .filter-form .filter-group {{ display: flex; flex-direction: column; gap: 4px; }}
-    .filter-form label {{ font-size: 12px; color: #6b6b6b; }}
-    .filter-form select {{ padding: 8px 12px; border: 1px solid #e6ded4; border-radius: 8px; min-width: 150px; background: #fff; }}
-    .filter-form input[type="text"] {{ padding: 8px 12px; border: 1px solid #e6ded4; border-radius: 8px; min-width: 200px; }}
-    .filter-form button {{ padding: 8px 16px; background: #fb7299; color: #fff; border: none; border-radius: 8px; cursor: pointer; height: 38px; }}
-    .filter-form .clear-link {{ padding: 8px 12px; color: #666; text-decoration: none; font-size: 13px; }}
-    .filter-info {{ color: #6b6b6b; font-size: 14px; margin-bottom: 12px; }}
-    .back-link {{ color: #fb7299; text-decoration: none; margin-bottom: 16px; display: inline-block; }}
-    .back-link:hover {{ text-decoration: underline; }}
-    </style>
+    yield emit(f"""
+    <html><head><title>Violations - {project_name_html}</title>{STYLE}{VIOLATIONS_STYLE}
     </head><body>
       <div class="container">
         <header>
           <div class="brand">
             <h1>Violations</h1>
-            <p>{project_key} / {project_name}</p>
+            <p>{project_key_html} / {project_name_html}</p>
           </div>
           <div class="nav">
-            <span class="badge">{username} · {role}</span>
-            <a href="/dashboard?project_key={project_key}&project_name={project_name}">Dashboard</a>
+            <span class="badge">""")
+    yield emit(_BADGE_PLACEHOLDER)
+    yield emit(f"""</span>
+            <a href="/dashboard?{project_query}">Dashboard</a>
             <a href="/logout">退出</a>
           </div>
         </header>
 
-        <a class="back-link" href="/dashboard?project_key={project_key}&project_name={project_name}">← 返回 Dashboard</a>
+        <a class="back-link" href="/dashboard?{project_query}">← 返回 Dashboard</a>
 
         <div class="card">
           <form class="filter-form" method="get" action="/violations">
-            <input type="hidden" name="project_key" value="{project_key}" />
-            <input type="hidden" name="project_name" value="{project_name}" />
+            <input type="hidden" name="project_key" value="{project_key_html}" />
+            <input type="hidden" name="project_name" value="{project_name_html}" />
             <div class="filter-group">
               <label>规则</label>
               <select name="rule_id">{rule_options}</select>
@@ -176,18 +309,18 @@ def render_violations_list(
             </div>
             <div class="filter-group">
               <label>开始日期</label>
-              <input type="date" name="start_date" value="{start_date or ''}" />
+              <input type="date" name="start_date" value="{escape(start_date or '')}" />
             </div>
             <div class="filter-group">
               <label>结束日期</label>
-              <input type="date" name="end_date" value="{end_date or ''}" />
+              <input type="date" name="end_date" value="{escape(end_date or '')}" />
             </div>
             <div class="filter-group">
               <label>搜索</label>
               <input type="text" name="search" value="{search_value}" placeholder="文件路径或消息内容..." />
             </div>
             <button type="submit">筛选</button>
-            {f'<a class="clear-link" href="/violations?project_key={project_key}&project_name={project_name}">清除筛选</a>' if has_any_filter else ''}
+            {f'<a class="clear-link" href="/violations?{project_query}">清除筛选</a>' if has_any_filter else ''}
           </form>
           <p class="filter-info">共 {total} 条违规 | 筛选: {filter_text}</p>
         </div>
@@ -204,14 +337,108 @@ def render_violations_list(
               </tr>
             </thead>
             <tbody>
-              {rows_html}
+              """)
+
+    # 构建违规行
+    for v in violations:
+        yield emit(_render_violation_row(v, project_query))
+
+    if not violations:
+        yield emit('<tr><td colspan="5">暂无违规记录</td></tr>')
+
+    # 构建分页
+    pagination_html = _render_pagination(
+        page, total_pages, project_key, project_name, rule_id, sub_type, search,
+        start_date, end_date,
+    )
+
+    yield emit(f"""
             </tbody>
           </table>
           {pagination_html}
         </div>
       </div>
     </body></html>
+    """)
+
+    if cache_key is not None:
+        _render_cache[cache_key] = (time.monotonic(), "".join(chunks))
+        _render_cache.move_to_end(cache_key)
+        while len(_render_cache) > _RENDER_CACHE_MAX_SIZE:
+            _render_cache.popitem(last=False)
+
+
+def _render_violation_row(v: Dict[str, Any], project_query: str) -> str:
+    """Render one <tr> of the violations table."""
+    vid = v.get("violation_id", "")
+    file_path = v.get("file_path", "")
+    line = v.get("line", 0)
+    rid = v.get("rule_id") or ""
+    st = v.get("sub_type") or "-"
+    severity = v.get("severity", "warning")
+    full_message = v.get("message", "")
+    message = full_message[:80]  # 截断消息
+    if len(full_message) > 80:
+        message += "..."
+
+    # 文件路径截断显示
+    display_path = file_path
+    if len(file_path) > 50:
+        display_path = "..." + file_path[-47:]
+
+    detail_link = escape(f"/violations/{quote(vid)}?{project_query}")
+    severity_class = "error" if severity == "error" else "warning"
+
+    # 优先使用 violation 自带的 rule_name
+    rule_display = _rule_display_html(rid, v.get("rule_name"))
+    return _ROW_TMPL.format_map({
+        "detail_link": detail_link,
+        "file_path": escape(file_path),
+        "display_path": escape(display_path),
+        "line": line,
+        "rule_display": rule_display,
+        "sub_type": escape(st),
+        "severity_class": severity_class,
+        "severity": escape(severity),
+        "full_message": escape(full_message),
+        "message": escape(message),
+    })
+
+
+def render_violations_list(
+    username: str,
+    role: str,
+    project_key: str,
+    project_name: str,
+    violations: List[Dict[str, Any]],
+    total: int,
+    page: int,
+    total_pages: int,
+    rule_id: Optional[str] = None,
+    sub_type: Optional[str] = None,
+    search: Optional[str] = None,
+    available_rules: Optional[List[tuple]] = None,
+    available_sub_types: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    data_version: Optional[int] = None,
+) -> str:
+    """Render the violations list page.
+
+    Convenience wrapper that joins iter_violations_list() into a single string;
+    see there for argument descriptions.
     """
+    return "".join(iter_violations_list(
+        username, role, project_key, project_name, violations, total, page, total_pages,
+        rule_id=rule_id,
+        sub_type=sub_type,
+        search=search,
+        available_rules=available_rules,
+        available_sub_types=available_sub_types,
+        start_date=start_date,
+        end_date=end_date,
+        data_version=data_version,
+    ))
 
 
 def _render_pagination(
@@ -230,17 +457,16 @@ def _render_pagination(
         return ""
 
     # 构建基础 URL
-    base_params = f"project_key={project_key}&project_name={project_name}"
-    if rule_id:
-        base_params += f"&rule_id={rule_id}"
-    if sub_type:
-        base_params += f"&sub_type={sub_type}"
-    if search:
-        base_params += f"&search={search}"
-    if start_date:
-        base_params += f"&start_date={start_date}"
-    if end_date:
-        base_params += f"&end_date={end_date}"
+    params = (
+        ("project_key", project_key),
+        ("project_name", project_name),
+        ("rule_id", rule_id),
+        ("sub_type", sub_type),
+        ("search", search),
+        ("start_date", start_date),
+        ("end_date", end_date),
+    )
+    base_params = urlencode({k: v for k, v in params if v})
 
     parts = ['<div class="pagination">']
 
@@ -252,13 +478,11 @@ def _render_pagination(
 
     # 页码
     # 显示: 1 ... (page-1) page (page+1) ... total_pages
-    pages_to_show = set()
-    pages_to_show.add(1)
-    pages_to_show.add(total_pages)
-    for p in range(max(1, page - 1), min(total_pages, page + 1) + 1):
-        pages_to_show.add(p)
-
-    sorted_pages = sorted(pages_to_show)
+    # 页码天然有序，直接按序构建（total_pages >= 2）
+    sorted_pages = [1]
+    sorted_pages.extend(range(max(2, page - 1), min(total_pages, page + 1) + 1))
+    if sorted_pages[-1] != total_pages:
+        sorted_pages.append(total_pages)
     prev_p = 0
     for p in sorted_pages:
         if prev_p and p - prev_p > 1:
@@ -288,24 +512,9 @@ def _highlight_objc_simple(code: str) -> str:
     Returns:
         Code with syntax highlighting spans
     """
-    import re
-
-    # Keywords
-    keywords = r'\b(if|else|for|while|do|switch|case|default|break|continue|return|goto|typedef|struct|enum|union|sizeof|static|extern|const|volatile|inline|void|char|short|int|long|float|double|bool|BOOL|YES|NO|nil|NULL|self|super|id|Class|SEL|IMP|instancetype)\b'
-    code = re.sub(keywords, r'<span class="hl-keyword">\1</span>', code)
-
-    # @keywords
-    at_keywords = r'(@interface|@implementation|@end|@protocol|@property|@synthesize|@dynamic|@class|@public|@private|@protected|@selector|@try|@catch|@finally|@throw|@synchronized|@autoreleasepool)'
-    code = re.sub(at_keywords, r'<span class="hl-at-keyword">\1</span>', code)
-
-    # Property keywords
-    prop_keywords = r'\b(nonatomic|atomic|strong|weak|copy|assign|retain|readonly|readwrite|nullable|nonnull)\b'
-    code = re.sub(prop_keywords, r'<span class="hl-prop">\1</span>', code)
-
-    # Numbers
-    code = re.sub(r'\b(\d+\.?\d*[fFlL]?)\b', r'<span class="hl-number">\1</span>', code)
-
-    return code
+    if not _HAS_WORD_RE.search(code):
+        return code
+    return _HL_RE.sub(_hl_repl, code)
 
 
 def render_violation_detail(
@@ -324,19 +533,19 @@ def render_violation_detail(
         project_name: Project name
         violation: Violation dictionary
     """
-    vid = violation.get("violation_id", "")
-    file_path = violation.get("file_path", "")
+    vid = violation.get("violation_id") or ""
+    file_path = violation.get("file_path") or ""
     line = violation.get("line", 0)
     column = violation.get("column", 0)
-    rule_id = violation.get("rule_id", "")
+    rule_id = violation.get("rule_id") or ""
     sub_type = violation.get("sub_type") or "-"
     severity = violation.get("severity", "warning")
-    message = violation.get("message", "")
-    code_hash = violation.get("code_hash", "")
+    message = violation.get("message") or ""
+    code_hash = violation.get("code_hash") or ""
     context = violation.get("context", "")
     related_lines = violation.get("related_lines")
-    first_seen = violation.get("first_seen", "")
-    last_seen = violation.get("last_seen", "")
+    first_seen = violation.get("first_seen") or ""
+    last_seen = violation.get("last_seen") or ""
     pod_name = violation.get("pod_name") or "-"
 
     severity_class = "error" if severity == "error" else "warning"
@@ -354,68 +563,37 @@ def render_violation_detail(
             # 如果没有 related_lines，从 line 开始
             start_line = max(1, line - len(context_lines) // 2)
 
-        code_lines_html = []
-        for i, code_line in enumerate(context_lines):
-            current_line_num = start_line + i
-            # 问题行高亮
-            highlighted = 'highlighted' if current_line_num == line else ''
-            # HTML 转义
-            escaped_line = code_line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            # 语法高亮
-            highlighted_content = _highlight_objc_simple(escaped_line)
-            code_lines_html.append(
-                f'<div class="code-line {highlighted}">'
-                f'<span class="code-line-num">{current_line_num}</span>'
-                f'<span class="code-line-content">{highlighted_content}</span>'
-                f'</div>'
+        # 问题行高亮；代码行先 HTML 转义再做语法高亮
+        context_html = '<div class="code-block">' + ''.join(
+            _CODE_LINE_TMPL.format(
+                hl='highlighted' if line_num == line else '',
+                n=line_num,
+                c=_highlight_objc_simple(escape(code_line, quote=False)),
             )
-
-        context_html = '<div class="code-block">' + ''.join(code_lines_html) + '</div>'
+            for line_num, code_line in enumerate(context_lines, start_line)
+        ) + '</div>'
 
     related_lines_html = ""
     if related_lines:
         related_lines_html = f"<p><strong>关联行范围:</strong> {related_lines[0]} - {related_lines[1]}</p>"
 
     # 从 query string 还原返回链接（保留 rule_id）
-    back_link = f"/violations?project_key={project_key}&project_name={project_name}&rule_id={rule_id}"
+    project_query = urlencode({"project_key": project_key, "project_name": project_name})
+    back_link = f"/violations?{project_query}&{urlencode({'rule_id': rule_id})}"
     # 注意: 详情页不直接接收 start_date/end_date，这里仅按 rule_id 返回
 
     return f"""
-    <html><head><title>Violation Detail</title>{STYLE}
-    <style>
-    .severity-error {{ color: #b91c1c; font-weight: 600; }}
-    .severity-warning {{ color: #d97706; }}
-    .back-link {{ color: #fb7299; text-decoration: none; margin-bottom: 16px; display: inline-block; }}
-    .back-link:hover {{ text-decoration: underline; }}
-    .detail-grid {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 16px; }}
-    .detail-item {{ padding: 12px; background: #faf6f0; border-radius: 8px; }}
-    .detail-item .label {{ color: #6b6b6b; font-size: 12px; margin-bottom: 4px; }}
-    .detail-item .value {{ color: #1e1e1e; font-size: 14px; word-break: break-all; }}
-    .message-box {{ background: #fef9f3; border-left: 4px solid #fb7299; padding: 16px; margin: 16px 0; border-radius: 0 8px 8px 0; }}
-    /* 代码块样式 - 与 Claude html_report 一致 */
-    .code-block {{ background: #1e1e1e; border-radius: 8px; overflow: hidden; margin: 12px 0; }}
-    .code-line {{ display: flex; padding: 2px 12px; }}
-    .code-line.highlighted {{ background: rgba(255, 200, 0, 0.2); }}
-    .code-line-num {{ min-width: 45px; padding-right: 12px; text-align: right; color: #858585; user-select: none; border-right: 1px solid #404040; margin-right: 12px; font-family: 'SF Mono', Monaco, monospace; font-size: 13px; }}
-    .code-line-content {{ white-space: pre; color: #d4d4d4; font-family: 'SF Mono', Monaco, monospace; font-size: 13px; }}
-    /* ObjC 语法高亮 */
-    .hl-keyword {{ color: #569cd6; }}
-    .hl-at-keyword {{ color: #c586c0; }}
-    .hl-prop {{ color: #4ec9b0; }}
-    .hl-string {{ color: #ce9178; }}
-    .hl-number {{ color: #b5cea8; }}
-    .hl-comment {{ color: #6a9955; font-style: italic; }}
-    </style>
+    <html><head><title>Violation Detail</title>{STYLE}{VIOLATION_DETAIL_STYLE}
     </head><body>
       <div class="container">
         <header>
           <div class="brand">
             <h1>Violation Detail</h1>
-            <p>{project_key} / {project_name}</p>
+            <p>{escape(project_key)} / {escape(project_name)}</p>
           </div>
           <div class="nav">
-            <span class="badge">{username} · {role}</span>
-            <a href="/dashboard?project_key={project_key}&project_name={project_name}">Dashboard</a>
+            <span class="badge">{escape(username)} · {escape(role)}</span>
+            <a href="/dashboard?{project_query}">Dashboard</a>
             <a href="/logout">退出</a>
           </div>
         </header>
@@ -424,15 +602,15 @@ def render_violation_detail(
 
         <div class="card">
           <h3>
-            <span class="severity-{severity_class}">[{severity.upper()}]</span>
-            {get_rule_display_name(rule_id, violation.get("rule_name"))}
+            <span class="severity-{severity_class}">[{escape(severity.upper())}]</span>
+            {_rule_display_html(rule_id, violation.get("rule_name"))}
           </h3>
-          <div class="message-box">{message}</div>
+          <div class="message-box">{escape(message)}</div>
 
           <div class="detail-grid">
             <div class="detail-item">
               <div class="label">文件路径</div>
-              <div class="value">{file_path}</div>
+              <div class="value">{escape(file_path)}</div>
             </div>
             <div class="detail-item">
               <div class="label">位置</div>
@@ -440,27 +618,27 @@ def render_violation_detail(
             </div>
             <div class="detail-item">
               <div class="label">规则 ID</div>
-              <div class="value">{rule_id}</div>
+              <div class="value">{escape(rule_id)}</div>
             </div>
             <div class="detail-item">
               <div class="label">子类型</div>
-              <div class="value">{sub_type}</div>
+              <div class="value">{escape(sub_type)}</div>
             </div>
             <div class="detail-item">
               <div class="label">Pod 名称</div>
-              <div class="value">{pod_name}</div>
+              <div class="value">{escape(pod_name)}</div>
             </div>
             <div class="detail-item">
               <div class="label">Code Hash</div>
-              <div class="value">{code_hash or '-'}</div>
+              <div class="value">{escape(code_hash or '-')}</div>
             </div>
             <div class="detail-item">
               <div class="label">首次发现</div>
-              <div class="value">{first_seen}</div>
+              <div class="value">{escape(first_seen)}</div>
             </div>
             <div class="detail-item">
               <div class="label">最后更新</div>
-              <div class="value">{last_seen}</div>
+              <div class="value">{escape(last_seen)}</div>
             </div>
           </div>
 
@@ -471,7 +649,7 @@ def render_violation_detail(
 
         <div class="card">
           <h3>标识信息</h3>
-          <p><strong>Violation ID:</strong> <code>{vid}</code></p>
+          <p><strong>Violation ID:</strong> <code>{escape(vid)}</code></p>
         </div>
       </div>
     </body></html>
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import os
 import socket
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple
 
@@ -14,35 +15,36 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+@lru_cache(maxsize=None)
 def default_config_path() -> Path:
     """默认配置文件路径"""
     return Path(os.path.expanduser("~/.biliobjclint/biliobjclint_server_config.json"))
 
 
+@lru_cache(maxsize=None)
 def default_pid_path() -> Path:
     """默认 PID 文件路径"""
     return Path(os.path.expanduser("~/.biliobjclint/lintserver.pid"))
 
 
+@lru_cache(maxsize=None)
 def project_root() -> Path:
     """获取项目根目录"""
     return Path(__file__).parent.parent.parent.parent
 
 
+@lru_cache(maxsize=None)
 def template_config_path() -> Path:
     """配置模板文件路径"""
     return project_root() / "config" / "biliobjclint_server_config.json"
 
 
-def get_local_ips() -> List[Tuple[str, str]]:
-    """获取本机所有网络接口的 IP 地址
+def _udp_primary_ip() -> str:
+    """通过 UDP connect 外部地址获取主要出口 IP（不发送数据）
 
     Returns:
-        List of (interface_name, ip_address) tuples
+        Primary IP address, or "" if unavailable
     """
-    ips: List[Tuple[str, str]] = []
-
-    # 方法1: 通过连接外部地址获取主要 IP
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.settimeout(0.1)
@@ -50,9 +52,78 @@ def get_local_ips() -> List[Tuple[str, str]]:
         primary_ip = s.getsockname()[0]
         s.close()
         if primary_ip and primary_ip != "127.0.0.1":
-            ips.append(("primary", primary_ip))
+            return primary_ip
     except Exception:
         pass
+    return ""
+
+
+def _list_interface_ips() -> List[Tuple[str, str]]:
+    """枚举所有网络接口的 IPv4 地址
+
+    优先使用 psutil.net_if_addrs() 一次性获取；未安装 psutil 时回退到
+    socket.if_nameindex() + SIOCGIFADDR ioctl (macOS/Linux)。
+
+    Returns:
+        List of (interface_name, ip_address) tuples
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            return [
+                (ifname, addr.address)
+                for ifname, addrs in psutil.net_if_addrs().items()
+                for addr in addrs
+                if addr.family == socket.AF_INET
+            ]
+        except Exception:
+            return []
+
+    result: List[Tuple[str, str]] = []
+    try:
+        import fcntl
+        import struct
+
+        # 所有 ioctl 调用复用同一个 socket
+        ioctl_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            for _, ifname in socket.if_nameindex():
+                try:
+                    ip = socket.inet_ntoa(fcntl.ioctl(
+                        ioctl_sock.fileno(),
+                        0x8915,  # SIOCGIFADDR
+                        struct.pack('256s', ifname[:15].encode())
+                    )[20:24])
+                    result.append((ifname, ip))
+                except OSError:
+                    # 接口未配置 IPv4 地址
+                    pass
+        finally:
+            ioctl_sock.close()
+    except Exception:
+        pass
+    return result
+
+
+@lru_cache(maxsize=1)
+def get_local_ips() -> List[Tuple[str, str]]:
+    """获取本机所有网络接口的 IP 地址
+
+    进程生命周期内网络接口基本不变，结果会被缓存；服务重启（新进程）时重新探测。
+
+    Returns:
+        List of (interface_name, ip_address) tuples
+    """
+    ips: List[Tuple[str, str]] = []
+
+    # 方法1: 通过连接外部地址获取主要 IP
+    primary_ip = _udp_primary_ip()
+    if primary_ip:
+        ips.append(("primary", primary_ip))
 
     # 方法2: 通过 hostname 获取
     try:
@@ -64,52 +135,28 @@ def get_local_ips() -> List[Tuple[str, str]]:
     except Exception:
         pass
 
-    # 方法3: 尝试获取所有网络接口 (macOS/Linux)
-    try:
-        import fcntl
-        import struct
-        import array
-
-        def get_interface_ip(ifname: str) -> str:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            return socket.inet_ntoa(fcntl.ioctl(
-                s.fileno(),
-                0x8915,  # SIOCGIFADDR
-                struct.pack('256s', ifname[:15].encode())
-            )[20:24])
-
-        # 获取所有接口名称
-        max_interfaces = 128
-        bytes_per_interface = 40
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        names = array.array('B', b'\0' * max_interfaces * bytes_per_interface)
-        outbytes = struct.unpack('iL', fcntl.ioctl(
-            s.fileno(),
-            0x8912,  # SIOCGIFCONF
-            struct.pack('iL', max_interfaces * bytes_per_interface, names.buffer_info()[0])
-        ))[0]
-
-        namestr = names.tobytes()
-        for i in range(0, outbytes, bytes_per_interface):
-            ifname = namestr[i:i+16].split(b'\0', 1)[0].decode()
-            try:
-                ip = get_interface_ip(ifname)
-                if ip != "127.0.0.1" and not any(ip == existing[1] for existing in ips):
-                    ips.append((ifname, ip))
-            except Exception:
-                pass
-    except Exception:
-        pass
+    # 方法3: 枚举所有网络接口
+    seen = {ip for _, ip in ips}
+    for ifname, ip in _list_interface_ips():
+        if ip != "127.0.0.1" and ip not in seen:
+            seen.add(ip)
+            ips.append((ifname, ip))
 
     return ips
 
 
+@lru_cache(maxsize=1)
 def get_primary_ip() -> str:
     """获取本机主要 IP 地址（用于显示）
 
+    优先只走 UDP connect 探测，失败时才回退到完整的接口枚举。
+
     Returns:
         Primary IP address or "127.0.0.1" if not found
     """
+    primary_ip = _udp_primary_ip()
+    if primary_ip:
+        return primary_ip
     ips = get_local_ips()
     if ips:
         return ips[0][1]
@@ -119,6 +166,10 @@ def get_primary_ip() -> str:
 def is_port_in_use(port: int, host: str = "0.0.0.0") -> bool:
     """检查端口是否被占用
 
+    按服务实际的绑定方式探测：设置 SO_REUSEADDR 后 bind（与 HTTPServer 一致），
+    可发现绑定在任意网卡上的监听，且不受 TIME_WAIT 连接影响；
+    bind 成功时再对本机地址做一次 connect_ex 补充确认。
+
     Args:
         port: 端口号
         host: 主机地址
@@ -127,12 +178,17 @@ def is_port_in_use(port: int, host: str = "0.0.0.0") -> bool:
         True if port is in use, False otherwise
     """
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         try:
             s.bind((host, port))
-            return False
         except OSError:
             return True
 
+    probe_host = "127.0.0.1" if host in ("", "0.0.0.0") else host
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.05)
+        return s.connect_ex((probe_host, port)) == 0
+
 
 def find_process_using_port(port: int) -> Tuple[int, str]:
     """查找占用端口的进程
@@ -143,6 +199,27 @@ def find_process_using_port(port: int) -> Tuple[int, str]:
     Returns:
         (pid, process_name) tuple, (0, "") if not found
     """
+    # 优先使用 psutil 进程内查询，避免 fork lsof/ps 子进程
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            for conn in psutil.net_connections(kind="inet"):
+                # 只认监听该端口的进程，排除以该端口为本地端口的客户端连接
+                if (conn.status == psutil.CONN_LISTEN and conn.laddr
+                        and conn.laddr.port == port and conn.pid):
+                    try:
+                        return conn.pid, psutil.Process(conn.pid).name()
+                    except psutil.Error:
+                        return conn.pid, ""
+            return 0, ""
+        except psutil.AccessDenied:
+            # macOS 非 root 用户无法枚举全部连接，回退到 lsof
+            pass
+
     import subprocess
 
     try:
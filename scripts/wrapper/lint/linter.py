@@ -337,16 +337,13 @@ class BiliObjCLint:
 
     def _filter_ignored_violations(self):
         """过滤被忽略的违规"""
-        filtered = []
-        for v in self.reporter.violations:
-            # 必须有 code_hash 才能进行忽略检查
-            if not v.code_hash:
-                filtered.append(v)
-                continue
-            if not self.ignore_cache.is_ignored(v):
-                filtered.append(v)
-            else:
-                self.logger.debug(f"Filtered ignored violation: {v.file_path}:{v.line} [{v.rule_id}]")
+        # 忽略缓存只加载、索引一次（无 code_hash 的违规不参与忽略检查）
+        filtered = self.ignore_cache.filter_ignored(self.reporter.violations)
+        if len(filtered) != len(self.reporter.violations):
+            kept = {id(v) for v in filtered}
+            for v in self.reporter.violations:
+                if id(v) not in kept:
+                    self.logger.debug(f"Filtered ignored violation: {v.file_path}:{v.line} [{v.rule_id}]")
         self.reporter.violations = filtered
 
     def _find_all_files(self) -> List[str]:
@@ -396,7 +393,8 @@ class BiliObjCLint:
             str(self.project_root),
             parallel=perf_config.parallel,
             max_workers=perf_config.max_workers,
-            file_cache_size_mb=perf_config.file_cache_size_mb
+            file_cache_size_mb=perf_config.file_cache_size_mb,
+            use_processes=perf_config.use_processes
         )
 
         # 加载内置规则
@@ -0,0 +1,71 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from core.lint.ignore_cache import IgnoreCache
+from core.lint.reporter import Severity, Violation
+
+
+def make_violation(file_path: str, rule_id: str, code_hash, line: int = 1) -> Violation:
+    return Violation(
+        file_path=file_path,
+        line=line,
+        column=1,
+        severity=Severity.WARNING,
+        message="demo",
+        rule_id=rule_id,
+        code_hash=code_hash,
+    )
+
+
+class IgnoreCacheFilterTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.project_root = Path(self.tmp.name) / "project"
+        self.cache = IgnoreCache(
+            cache_dir=str(Path(self.tmp.name) / "cache"),
+            project_root=str(self.project_root),
+        )
+        self.file_a = str(self.project_root / "A.m")
+        self.file_b = str(self.project_root / "B.m")
+
+    def test_filters_by_relative_path_rule_and_code_hash(self):
+        self.assertTrue(self.cache.add_ignore(make_violation(self.file_a, "rule_x", "h1")))
+
+        ignored = make_violation(self.file_a, "rule_x", "h1", line=20)
+        kept = [
+            make_violation(self.file_a, "rule_y", "h1"),
+            make_violation(self.file_a, "rule_x", "h2"),
+            make_violation(self.file_b, "rule_x", "h1"),
+            make_violation(self.file_a, "rule_x", None),
+        ]
+        violations = [kept[0], ignored, kept[1], kept[2], kept[3]]
+
+        result = self.cache.filter_ignored(violations)
+
+        self.assertEqual(kept, result)
+        # 与逐条 is_ignored 判断一致
+        self.assertEqual([v for v in violations if not self.cache.is_ignored(v)], result)
+
+    def test_reads_persisted_ignores_and_returns_new_list(self):
+        self.cache.add_ignore(make_violation(self.file_a, "rule_x", "h1"))
+        reloaded = IgnoreCache(cache_dir=self.cache.cache_dir, project_root=str(self.project_root))
+        self.assertEqual([], reloaded.filter_ignored([make_violation(self.file_a, "rule_x", "h1")]))
+
+        empty = IgnoreCache(
+            cache_dir=str(Path(self.tmp.name) / "empty"), project_root=str(self.project_root)
+        )
+        violations = [make_violation(self.file_a, "rule_x", "h1")]
+        result = empty.filter_ignored(violations)
+        self.assertEqual(violations, result)
+        self.assertIsNot(violations, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import logging
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from core.lint.logger import BatchedFileHandler
+
+
+def make_record(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, msg, None, None)
+
+
+class BatchedFileHandlerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "lint.log"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_handler(self, **kwargs) -> BatchedFileHandler:
+        handler = BatchedFileHandler(str(self.path), **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.addCleanup(handler.close)
+        return handler
+
+    def read(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    def test_records_are_buffered_until_flush(self):
+        handler = self.make_handler()
+        handler.handle(make_record("first"))
+        handler.handle(make_record("second"))
+        self.assertEqual("", self.read())
+
+        handler.flush()
+        self.assertEqual("first\nsecond\n", self.read())
+
+        # 缓冲已清空，重复 flush 不重复写入
+        handler.flush()
+        self.assertEqual("first\nsecond\n", self.read())
+
+    def test_batch_size_and_error_level_trigger_flush(self):
+        handler = self.make_handler(max_batch=10)
+        handler.handle(make_record("abc"))
+        self.assertEqual("", self.read())
+        handler.handle(make_record("defghij"))
+        self.assertEqual("abc\ndefghij\n", self.read())
+
+        handler = self.make_handler()
+        handler.handle(make_record("info"))
+        handler.handle(make_record("boom", logging.ERROR))
+        self.assertEqual("abc\ndefghij\ninfo\nboom\n", self.read())
+
+    def test_close_flushes_pending_records(self):
+        handler = self.make_handler()
+        handler.handle(make_record("pending"))
+        handler.close()
+        self.assertEqual("pending\n", self.read())
+        # 关闭后写入被忽略，不抛异常
+        handler.handle(make_record("late"))
+        handler.flush()
+        self.assertEqual("pending\n", self.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from core.lint import local_pods
+from core.lint.local_pods import LocalPodsAnalyzer
+
+
+class LocalPodsEnvSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.project_root = Path(self.tmp.name, "project")
+        self.srcroot = Path(self.tmp.name, "srcroot")
+        self.project_root.mkdir()
+        (self.project_root / ".git").mkdir()
+        self.srcroot.mkdir()
+        # 恢复为真实环境的快照，避免影响其他测试
+        self.addCleanup(local_pods.refresh_env)
+
+    def test_environment_is_read_from_snapshot_until_refreshed(self):
+        with mock.patch.dict(os.environ, {"SRCROOT": str(self.srcroot)}):
+            # 修改 os.environ 不影响已有快照
+            self.assertNotIn(self.srcroot.resolve(), LocalPodsAnalyzer(str(self.project_root))._search_dirs)
+
+            local_pods.refresh_env()
+            self.assertEqual(str(self.srcroot), local_pods._ENV["SRCROOT"])
+            self.assertIn(self.srcroot.resolve(), LocalPodsAnalyzer(str(self.project_root))._search_dirs)
+
+
+if __name__ == "__main__":
+    unittest.main()
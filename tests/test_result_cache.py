@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from core.lint import result_cache
+from core.lint.file_cache import FileContentCache
+from core.lint.result_cache import ResultCache
+
+
+VIOLATIONS = [{"rule_id": "demo", "line": 1}]
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = Path(self.tmp.name) / "Demo.m"
+        self.source.write_text("@implementation Demo\n@end\n")
+        self.cache = ResultCache(str(Path(self.tmp.name) / "cache"))
+        self.config_hash = ResultCache.compute_config_hash({"demo": {"enabled": True}})
+
+    def put(self, violations=VIOLATIONS, config_hash=None):
+        entry = FileContentCache().get_entry(str(self.source))
+        self.cache.put(str(self.source), config_hash or self.config_hash, violations,
+                       entry.mtime, entry.content_hash)
+
+    def set_mtime(self, offset: float):
+        st = self.source.stat()
+        os.utime(self.source, (st.st_atime, st.st_mtime + offset))
+
+    def test_touch_without_content_change_still_hits(self):
+        self.put()
+        self.set_mtime(10)
+        self.assertEqual(VIOLATIONS, self.cache.get(str(self.source), self.config_hash))
+        # 命中后刷新 mtime，再次查询走快路径
+        with mock.patch.object(result_cache, "_file_digest") as digest:
+            self.assertEqual(VIOLATIONS, self.cache.get(str(self.source), self.config_hash))
+            digest.assert_not_called()
+
+    def test_content_change_misses(self):
+        self.put()
+        self.source.write_text("@implementation Demo2\n@end\n")
+        self.set_mtime(10)
+        self.assertIsNone(self.cache.get(str(self.source), self.config_hash))
+
+    def test_tool_version_is_part_of_config_hash(self):
+        rules = {"demo": {"enabled": True}}
+        with mock.patch.object(result_cache, "_tool_version", return_value="1.0.0"):
+            old_hash = ResultCache.compute_config_hash(rules)
+        with mock.patch.object(result_cache, "_tool_version", return_value="1.0.1"):
+            new_hash = ResultCache.compute_config_hash(rules)
+        self.assertNotEqual(old_hash, new_hash)
+
+        self.put(config_hash=old_hash)
+        self.assertIsNone(self.cache.get(str(self.source), new_hash))
+        self.assertEqual(VIOLATIONS, self.cache.get(str(self.source), old_hash))
+
+    def test_put_uses_digest_of_checked_content(self):
+        # 检查之后文件被保存：结果仍与检查时读到的内容绑定，新内容不会命中旧结果
+        entry = FileContentCache().get_entry(str(self.source))
+        self.source.write_text("@implementation Changed\n@end\n")
+        self.set_mtime(10)
+        self.cache.put(str(self.source), self.config_hash, VIOLATIONS, entry.mtime, entry.content_hash)
+        self.assertIsNone(self.cache.get(str(self.source), self.config_hash))
+
+    def test_saved_entries_survive_reload(self):
+        self.put()
+        self.cache.save()
+        reloaded = ResultCache(str(self.cache.cache_dir))
+        self.assertEqual(VIOLATIONS, reloaded.get(str(self.source), self.config_hash))
+
+
+if __name__ == "__main__":
+    unittest.main()
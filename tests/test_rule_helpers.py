@@ -0,0 +1,135 @@
+import re
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from core.lint.config import RuleConfig
+from core.lint.rules.base_rule import BaseRule
+from core.lint.rules.rule_context import get_rule_context
+
+
+class _NoopRule(BaseRule):
+    identifier = "noop"
+
+    def check(self, file_path, content, lines, changed_lines):
+        return []
+
+
+SOURCE = "\n".join([
+    "@implementation Demo",
+    "- (void)a { [dict setObject:x forKey:k]; }",
+    "",
+    "// setObject in comment setObject",
+    "- (void)b {}",
+    "[m setObject:y forKey:z];",
+])
+
+
+class IterMatchLineNumbersTests(unittest.TestCase):
+    CONTENT_PATTERN = re.compile(r"setObject[^\S\n]*:")
+    LINE_PATTERN = re.compile(r"setObject\s*:")
+
+    def expected(self, lines):
+        return [i for i, line in enumerate(lines, 1) if self.LINE_PATTERN.search(line)]
+
+    def test_fast_path_matches_line_scan(self):
+        rule = _NoopRule(RuleConfig())
+        lines = SOURCE.split("\n")
+        self.assertEqual(
+            self.expected(lines),
+            list(rule.iter_match_line_numbers(SOURCE, lines, self.CONTENT_PATTERN, self.LINE_PATTERN)),
+        )
+
+    def test_falls_back_when_lines_do_not_align_with_content(self):
+        rule = _NoopRule(RuleConfig())
+        # 行数相同但内容不对应（首行不同），不能用 content 偏移换算行号
+        lines = SOURCE.split("\n")[1:] + ["[m setObject:y forKey:z];"]
+        self.assertEqual(len(lines), SOURCE.count("\n") + 1)
+        self.assertEqual(
+            self.expected(lines),
+            list(rule.iter_match_line_numbers(SOURCE, lines, self.CONTENT_PATTERN, self.LINE_PATTERN)),
+        )
+        # 末尾换行 + splitlines() 导致行数不同
+        content = SOURCE + "\n"
+        lines = content.splitlines()
+        self.assertEqual(
+            self.expected(lines),
+            list(rule.iter_match_line_numbers(content, lines, self.CONTENT_PATTERN, self.LINE_PATTERN)),
+        )
+
+
+class IterLinesContainingTests(unittest.TestCase):
+    def expected(self, lines, changed_lines=frozenset()):
+        return [
+            (i, line) for i, line in enumerate(lines, 1)
+            if "setObject" in line and (not changed_lines or i in changed_lines)
+        ]
+
+    def test_fast_path_matches_line_scan(self):
+        rule = _NoopRule(RuleConfig())
+        lines = SOURCE.split("\n")
+        self.assertEqual(
+            self.expected(lines),
+            list(rule.iter_lines_containing(SOURCE, lines, set(), "setObject")),
+        )
+
+    def test_changed_lines_and_misaligned_lines_use_line_scan(self):
+        rule = _NoopRule(RuleConfig())
+        lines = SOURCE.split("\n")
+        self.assertEqual(
+            self.expected(lines, {4, 6, 99}),
+            list(rule.iter_lines_containing(SOURCE, lines, {4, 6, 99}, "setObject")),
+        )
+        shifted = lines[1:] + ["[m setObject:y forKey:z];"]
+        self.assertEqual(
+            self.expected(shifted),
+            list(rule.iter_lines_containing(SOURCE, shifted, set(), "setObject")),
+        )
+
+
+class RuleContextTests(unittest.TestCase):
+    def test_context_is_reused_for_same_lines_object_only(self):
+        lines = SOURCE.split("\n")
+        context = get_rule_context(lines)
+        context.rule_data("demo")["value"] = 1
+
+        self.assertIs(context, get_rule_context(lines))
+        self.assertEqual({"value": 1}, get_rule_context(lines).rule_data("demo"))
+        self.assertEqual({}, context.rule_data("other"))
+
+        # 内容相同但对象不同的 lines 视为另一个文件，规则数据不串用
+        fresh = get_rule_context(list(lines))
+        self.assertIsNot(context, fresh)
+        self.assertEqual({}, fresh.rule_data("demo"))
+
+    def test_context_is_thread_local(self):
+        lines = SOURCE.split("\n")
+        get_rule_context(lines).rule_data("demo")["value"] = "main"
+        seen = []
+
+        def worker():
+            seen.append(get_rule_context(lines).rule_data("demo").get("value"))
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        self.assertEqual([None], seen)
+        self.assertEqual("main", get_rule_context(lines).rule_data("demo")["value"])
+
+    def test_derived_lines(self):
+        lines = SOURCE.split("\n")
+        context = get_rule_context(lines)
+        self.assertEqual([2, 5], context.method_start_lines)
+        self.assertEqual("", context.code_line(3))
+        self.assertEqual(len(lines), len(context.code_lines))
+        self.assertEqual(lines[1], context.code_lines[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,11 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "scripts"))
 
 from core.lint.config import RuleConfig
-from core.lint.rules.memory_rules.block_retain_cycle_rule import BlockRetainCycleRule
+from core.lint.rules.memory_rules.block_retain_cycle_rule import (
+    BlockRetainCycleRule,
+    _BlockScopeTracker,
+    _scan_block_line,
+)
 from core.lint.rules.memory_rules.collection_mutation_rule import CollectionMutationRule
 from core.lint.rules.memory_rules.wrapper_empty_pointer_rule import WrapperEmptyPointerRule
 
@@ -104,6 +108,79 @@ class BlockRetainCycleRuleRegressionTests(unittest.TestCase):
         self.assertEqual("class_method_self", violations[0].sub_type)
         self.assertEqual(9, violations[0].line)
 
+    def test_weak_declarations_are_scoped_to_their_method(self):
+        violations = run_rule(
+            BlockRetainCycleRule(RuleConfig()),
+            """
+            @implementation Demo
+            - (void)first {
+                __weak typeof(self) wS = self;
+                self.handler = ^{
+                    __strong typeof(wS) s = wS;
+                    [s reload];
+                };
+            }
+
+            - (void)second {
+                self.handler = ^{
+                    [self reload];
+                };
+            }
+            @end
+            """,
+        )
+
+        self.assertEqual(1, len(violations))
+        self.assertEqual("direct_self", violations[0].sub_type)
+        self.assertEqual(12, violations[0].line)
+
+    def test_block_scope_tracker_matches_full_rescan(self):
+        source = textwrap.dedent(
+            """
+            @implementation Demo
+            - (void)first {
+                self.handler = ^(NSString *a, void (^cb)(int)) { // { in comment
+                    NSString *s = @"^{ \\" }";
+                    [self go:^{ [self a]; }];
+                };
+                [self after];
+            }
+            - (void)second {
+                void (^b)(void) = ^ BOOL (int x)
+                {
+                    return [self ok];
+                };
+                ^{ }; [self tail];
+            }
+            @end
+            """
+        ).lstrip("\n")
+        lines = source.splitlines()
+        rule = BlockRetainCycleRule(RuleConfig())
+
+        def rescan(line_num, column, method_start):
+            brace_stack, pending, depth = [], False, 0
+            for i in range(method_start - 1, line_num - 1):
+                pending, depth = _scan_block_line(lines[i], brace_stack, pending, depth)
+            _scan_block_line(lines[line_num - 1], brace_stack, pending, depth,
+                             scan_limit=column - 1)
+            return any(brace_stack)
+
+        positions = [
+            (line_num, column)
+            for line_num, line in enumerate(lines, 1)
+            for column in range(1, len(line) + 2)
+        ]
+        tracker = _BlockScopeTracker(lines)
+        # 按行号递增查询，再回跳查询，覆盖增量推进与状态重置两种路径
+        for line_num, column in positions + positions[::7]:
+            method_start = rule._find_method_start(lines, line_num)
+            self.assertEqual(
+                rescan(line_num, column, method_start),
+                tracker.is_in_block(line_num, column, method_start),
+                (line_num, column),
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,62 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from core.server.ui import violations as violations_ui
+
+
+def render(username: str, data_version, **kwargs):
+    params = dict(
+        role="admin",
+        project_key="proj",
+        project_name="Demo",
+        violations=[],
+        total=0,
+        page=1,
+        total_pages=0,
+    )
+    params.update(kwargs)
+    return "".join(violations_ui.iter_violations_list(
+        username=username, data_version=data_version, **params
+    ))
+
+
+class ViolationsRenderCacheTests(unittest.TestCase):
+    def setUp(self):
+        violations_ui._render_cache.clear()
+
+    def tearDown(self):
+        violations_ui._render_cache.clear()
+
+    def test_cached_page_substitutes_current_user_badge(self):
+        first = render("alice", 1)
+        self.assertIn("alice · admin", first)
+
+        cached = violations_ui.get_cached_violations_list(
+            "bob<x>", "viewer", "proj", "Demo", 1, data_version=1,
+        )
+        self.assertIsNotNone(cached)
+        self.assertIn("bob&lt;x&gt; · viewer", cached)
+        self.assertNotIn("alice", cached)
+        self.assertNotIn(violations_ui._BADGE_PLACEHOLDER, cached)
+        self.assertEqual(cached, first.replace("alice · admin", "bob&lt;x&gt; · viewer"))
+
+    def test_cache_misses_on_new_data_version_or_without_version(self):
+        render("alice", 1)
+        self.assertIsNone(violations_ui.get_cached_violations_list(
+            "alice", "admin", "proj", "Demo", 1, data_version=2,
+        ))
+        self.assertIsNone(violations_ui.get_cached_violations_list(
+            "alice", "admin", "proj", "Demo", 1, data_version=None,
+        ))
+
+        render("alice", None)
+        self.assertEqual(len(violations_ui._render_cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()